@@ -0,0 +1,96 @@
+"""
+Threaded benchmark of changelist request coalescing.
+
+fires the same changelist request from many threads at once and reports the number
+of sql queries executed with and without single flight::
+
+    python -m benchmarks.single_flight --threads 32 --rows 5000 --latency 0.01
+
+``--latency`` adds a simulated round trip to every query so that concurrent requests
+overlap the way they do against a networked database.
+"""
+import argparse
+import os
+import threading
+import time
+
+
+def run(view, user, threads, latency):
+    from django.db import connection
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    factory = APIRequestFactory()
+    barrier = threading.Barrier(threads)
+    lock = threading.Lock()
+    counts = {'queries': 0, 'statuses': []}
+
+    def count_query(execute, sql, params, many, context):
+        with lock:
+            counts['queries'] += 1
+        if latency:
+            time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def worker():
+        request = factory.get('/')
+        force_authenticate(request, user)
+        try:
+            with connection.execute_wrapper(count_query):
+                barrier.wait()
+                response = view(request)
+            with lock:
+                counts['statuses'].append(response.status_code)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    counts['seconds'] = time.perf_counter() - start
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='simulated seconds of latency added to every query')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_admin.settings')
+    import django
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from test_django_api_admin.admin import site
+    from test_django_api_admin.models import Author
+
+    # an in-memory database shared by every thread of the process.
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    user = get_user_model().objects.create_superuser(username='admin')
+    Author.objects.bulk_create(
+        Author(name=f'author {i}', age=60 if i % 2 else 1, user=user)
+        for i in range(args.rows)
+    )
+
+    model_admin = site._registry[Author]
+    view = model_admin.get_changelist_view()
+    print(f'{args.threads} concurrent changelist requests over {args.rows} rows')
+    for timeout in (None, 5):
+        model_admin.single_flight_timeout = timeout
+        counts = run(view, user, args.threads, args.latency)
+        mode = 'single flight' if timeout is not None else 'no coalescing'
+        print(f'{mode:>14}: {counts["queries"]:>5} queries '
+              f'{counts["seconds"]:.3f}s statuses={set(counts["statuses"])}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Memory benchmark of the streaming json responses.
+
+requests large pages of the changelist, list and admin log endpoints with and
+without streaming and reports the peak memory traced by tracemalloc while the
+response is built and consumed::
+
+    python -m benchmarks.streaming --rows 5000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+
+def measure(view, request):
+    """
+    Return the peak traced memory and the seconds spent building and consuming
+    the response of the view, the body is read in chunks and discarded.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = view(request)
+    size = 0
+    if response.streaming:
+        for chunk in response.streaming_content:
+            size += len(chunk)
+    else:
+        response.render()
+        size = len(response.content)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, seconds, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_admin.settings')
+    import django
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from django_api_admin.models import CHANGE, LogEntry
+    from test_django_api_admin.admin import site
+    from test_django_api_admin.models import Author
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    user = get_user_model().objects.create_superuser(username='admin')
+    Author.objects.bulk_create(
+        Author(name=f'author {i}', age=60 if i % 2 else 1, user=user)
+        for i in range(args.rows)
+    )
+    content_type = ContentType.objects.get_for_model(Author)
+    LogEntry.objects.bulk_create(
+        LogEntry(user=user, content_type=content_type, object_id=str(i),
+                 object_repr=f'author {i}', action_flag=CHANGE,
+                 change_message='[{"changed": {"fields": ["title"]}}]')
+        for i in range(args.rows)
+    )
+
+    model_admin = site._registry[Author]
+    model_admin.list_max_show_all = args.rows
+    model_admin.single_flight_timeout = None
+    factory = APIRequestFactory()
+    views = [
+        ('changelist', model_admin, model_admin.get_changelist_view(), {'all': ''}),
+        ('list', model_admin, model_admin.get_list_view(), {'page_size': args.rows}),
+        ('admin log', site, site.get_admin_log_view(), {'page_size': args.rows}),
+    ]
+
+    print(f'peak traced memory of one page of {args.rows} rows')
+    for name, admin, view, params in views:
+        for threshold in (None, 500):
+            admin.stream_threshold = threshold
+            request = factory.get('/', params, HTTP_ACCEPT='application/json')
+            force_authenticate(request, user)
+            peak, seconds, size = measure(view, request)
+            mode = 'streamed' if threshold is not None else 'buffered'
+            print(f'{name:>10} {mode:>9}: {peak / 2 ** 20:8.1f} MiB peak '
+                  f'{seconds:.3f}s {size / 2 ** 20:.1f} MiB body')
+
+
+if __name__ == '__main__':
+    main()
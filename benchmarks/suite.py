@@ -0,0 +1,309 @@
+"""
+Benchmark suite of the admin hot paths on a seeded dataset.
+
+runs every scenario against the test models filled by the seed_benchmark_data
+command and writes the wall time, the number of sql queries and the peak traced
+memory of each scenario to a json file, two result files can be compared::
+
+    python -m benchmarks.suite run --authors 10000 --output base.json
+    python -m benchmarks.suite run --authors 10000 --output head.json
+    python -m benchmarks.suite compare base.json head.json
+
+``run`` seeds a fresh test database unless ``--existing`` is given, in which case
+the configured database is used as is, e.g. after seeding millions of rows once
+with ``python manage.py seed_benchmark_data --authors 10000000``. scenarios that
+write run in a transaction that is rolled back.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+SCENARIOS = {}
+
+
+def scenario(name, writes=False):
+    """
+    Register a function returning the (view, request, kwargs) of a scenario.
+    """
+    def decorator(func):
+        SCENARIOS[name] = (func, writes)
+        return func
+    return decorator
+
+
+@scenario('changelist')
+def changelist(env):
+    return env.model_admin.get_changelist_view(), env.get(), {}
+
+
+@scenario('changelist_filtered')
+def changelist_filtered(env):
+    return env.model_admin.get_changelist_view(), env.get(
+        {'is_vip__exact': 1, 'age__exact': 60, 'o': '-1'}), {}
+
+
+@scenario('changelist_search')
+def changelist_search(env):
+    return env.model_admin.get_changelist_view(), env.get({'q': 'purple'}), {}
+
+
+@scenario('autocomplete')
+def autocomplete(env):
+    from test_django_api_admin.models import Author, Book
+
+    return env.site.autocomplete_view(), env.get({
+        'term': 'purple',
+        'app_label': Book._meta.app_label,
+        'model_name': Book._meta.model_name,
+        'field_name': Author._meta.model_name,
+    }), {}
+
+
+@scenario('perform_action_select_across', writes=True)
+def perform_action_select_across(env):
+    return env.model_admin.get_handle_action_view(), env.post({
+        'action': 'make_old', 'selected_ids': [], 'select_across': True}), {}
+
+
+@scenario('add_with_inlines', writes=True)
+def add_with_inlines(env):
+    from test_django_api_admin.models import Publisher
+
+    publishers = list(Publisher.objects.order_by('pk').values_list('pk', flat=True)[:2])
+    return env.model_admin.get_add_view(), env.post({
+        'data': {'name': 'new author', 'age': 60, 'user': env.user.pk, 'is_vip': False,
+                 'publisher': publishers},
+        'create_inlines': {'books': [
+            {'title': f'new book {i}', 'credits': [env.author.pk]} for i in range(5)]},
+    }), {}
+
+
+@scenario('change_with_inlines', writes=True)
+def change_with_inlines(env):
+    from test_django_api_admin.models import Book
+
+    books = list(Book.objects.filter(author=env.author)[:5])
+    return env.model_admin.get_change_view(), env.post({
+        'data': {'name': 'changed author', 'age': 2},
+        'update_inlines': {'books': [
+            {'pk': book.pk, 'title': f'changed {book.title}'} for book in books]},
+    }, method='patch'), {'object_id': str(env.author.pk)}
+
+
+@scenario('admin_log')
+def admin_log(env):
+    return env.site.get_admin_log_view(), env.get({'page_size': 100}), {}
+
+
+@scenario('schema')
+def schema(env):
+    # generate the schema every time instead of serving the cached one.
+    env.site._schemas.clear()
+    return env.site.get_schema_view(), env.get(), {}
+
+
+class Environment:
+    """
+    The admin site, user and request factory shared by the scenarios.
+    """
+
+    def __init__(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIRequestFactory
+
+        from test_django_api_admin.admin import site
+        from test_django_api_admin.models import Author
+
+        self.site = site
+        self.model_admin = site._registry[Author]
+        self.user = get_user_model().objects.filter(is_superuser=True).order_by('pk').first()
+        self.author = Author.objects.order_by('pk').first()
+        self.factory = APIRequestFactory()
+
+    def get(self, params=None):
+        return lambda: self.authenticate(self.factory.get(
+            '/', params or {}, HTTP_ACCEPT='application/json'))
+
+    def post(self, data, method='post'):
+        return lambda: self.authenticate(getattr(self.factory, method)(
+            '/', data, format='json', HTTP_ACCEPT='application/json'))
+
+    def authenticate(self, request):
+        from rest_framework.test import force_authenticate
+
+        force_authenticate(request, self.user)
+        return request
+
+
+def call(view, request, kwargs, writes):
+    """
+    Return the status code of the view and the size of the consumed response,
+    the changes of writing scenarios are rolled back.
+    """
+    from django.db import transaction
+
+    with transaction.atomic():
+        response = view(request(), **kwargs)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            if hasattr(response, 'render'):
+                response.render()
+            size = len(response.content)
+        if writes:
+            transaction.set_rollback(True)
+    return response.status_code, size
+
+
+def measure(env, name, repeat):
+    """
+    Return the median, min and max seconds, the queries and the peak traced
+    memory of a scenario, memory is traced in a separate run.
+    """
+    from django.db import connection
+
+    func, writes = SCENARIOS[name]
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    # warm up the caches, e.g. content types and serializer classes.
+    call(*func(env), writes)
+
+    timings = []
+    for _ in range(repeat):
+        view, request, kwargs = func(env)
+        queries.clear()
+        with connection.execute_wrapper(count_query):
+            start = time.perf_counter()
+            status, size = call(view, request, kwargs, writes)
+            timings.append(time.perf_counter() - start)
+
+    view, request, kwargs = func(env)
+    tracemalloc.start()
+    call(view, request, kwargs, writes)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'status': status,
+        'seconds': statistics.median(timings),
+        'seconds_min': min(timings),
+        'seconds_max': max(timings),
+        'queries': len(queries),
+        'peak_memory': peak,
+        'response_size': size,
+    }
+
+
+def run(args):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_admin.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from test_django_api_admin.models import Author
+
+    if not args.existing:
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0)
+        call_command('seed_benchmark_data', authors=args.authors, verbosity=0)
+
+    env = Environment()
+    if env.user is None or env.author is None:
+        sys.exit('the database has no superuser or authors, run seed_benchmark_data first')
+    # don't share results between the repeated identical requests.
+    env.model_admin.single_flight_timeout = None
+
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'authors': Author.objects.count(),
+            'repeat': args.repeat,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'scenarios': {},
+    }
+    for name in names:
+        result = results['scenarios'][name] = measure(env, name, args.repeat)
+        print(f'{name:>30}: {result["seconds"] * 1000:9.1f} ms {result["queries"]:5d} queries '
+              f'{result["peak_memory"] / 2 ** 20:8.1f} MiB peak  [{result["status"]}]')
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'results written to {args.output}')
+
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    regressions = []
+    print(f'{"scenario":>30} {"ms":>21} {"queries":>15} {"peak MiB":>21}')
+    for name, new in head['scenarios'].items():
+        old = base['scenarios'].get(name)
+        if old is None:
+            print(f'{name:>30}: only in {args.head}')
+            continue
+        ratio = new['seconds'] / old['seconds'] if old['seconds'] else 1
+        memory_ratio = new['peak_memory'] / old['peak_memory'] if old['peak_memory'] else 1
+        print(f'{name:>30} {old["seconds"] * 1000:8.1f} {new["seconds"] * 1000:8.1f} {ratio:4.2f}x'
+              f' {old["queries"]:6d} {new["queries"]:6d}'
+              f'   {old["peak_memory"] / 2 ** 20:7.1f} {new["peak_memory"] / 2 ** 20:7.1f} '
+              f'{memory_ratio:4.2f}x')
+        if ratio > 1 + args.threshold:
+            regressions.append(f'{name} is {ratio:.2f}x slower')
+        if new['queries'] > old['queries']:
+            regressions.append(f'{name} runs {new["queries"] - old["queries"]} more queries')
+        if memory_ratio > 1 + args.threshold:
+            regressions.append(f'{name} uses {memory_ratio:.2f}x more memory')
+
+    for regression in regressions:
+        print(f'regression: {regression}')
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run the scenarios')
+    run_parser.add_argument('--authors', type=int, default=10000,
+                            help='authors seeded in the test database')
+    run_parser.add_argument('--existing', action='store_true',
+                            help='use the configured database without seeding it')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                            help='only run these scenarios')
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative slowdown reported as a regression')
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
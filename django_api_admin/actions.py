@@ -34,7 +34,7 @@ def delete_selected(modeladmin, request, queryset):
             modeladmin.log_deletion(request, obj, str(obj))
 
     # delete the queryset
-    queryset.delete()
+    modeladmin.delete_queryset(request, queryset)
     msg = _("Successfully deleted %s %s.") % (
         n, model_ngettext(modeladmin.opts, n))
     return Response({'detail': msg}, status=status.HTTP_200_OK)
@@ -11,6 +11,7 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 from django_api_admin.models import LogEntry
 from django_api_admin.openapi import CommonAPIResponses
 from django_api_admin.serializers import LogEntrySerializer, AdminLogRequestSerializer
+from django_api_admin.utils.stream_json import StreamingJSONResponse
 
 
 class AdminLogView(APIView):
@@ -38,7 +39,8 @@ class AdminLogView(APIView):
         tags=['admin-log']
     )
     def get(self, request):
-        queryset = LogEntry.objects.all()
+        self.admin_site.use_read_db(request)
+        queryset = LogEntry.objects.using(self.admin_site.get_read_db(request, LogEntry))
 
         # order the queryset
         try:
@@ -58,9 +60,17 @@ class AdminLogView(APIView):
         except:
             return Response({'detail': _('Bad filters.')}, status=status.HTTP_400_BAD_REQUEST)
 
-        # paginate queryset.
+        # paginate queryset, large pages are streamed.
         paginator = self.pagination_class()
-        page = paginator.paginate_queryset(queryset, request, view=self)
+        stream = self.should_stream(request, paginator)
+        page = paginator.paginate_queryset(
+            queryset, request, view=self, lazy=stream)
+
+        if stream:
+            return StreamingJSONResponse({
+                'action_list': self.iter_messages(page),
+                'config': self.get_config(page, queryset)},
+                status=status.HTTP_200_OK)
 
         # serialize queryset.
         serializer = self.serializer_class(page, many=True)
@@ -76,8 +86,28 @@ class AdminLogView(APIView):
                 item['change_message'] or '[]')
         return data
 
+    def should_stream(self, request, paginator):
+        """
+        Return True if the requested page size is larger than the stream
+        threshold of the site and plain json was negotiated.
+        """
+        threshold = self.admin_site.stream_threshold
+        if threshold is None or request.accepted_renderer.format != 'json':
+            return False
+        return (paginator.get_page_size(request) or 0) > threshold
+
+    def iter_messages(self, page):
+        """
+        Yield the serialized log entries of the page, fetched in chunks.
+        """
+        serializer = self.serializer_class()
+        for entry in page.iterator(chunk_size=self.admin_site.stream_chunk_size):
+            item = serializer.to_representation(entry)
+            item['change_message'] = json.loads(item['change_message'] or '[]')
+            yield item
+
     def get_config(self, page, queryset):
         return {
-            'result_count': len(page),
+            'result_count': len(page) if isinstance(page, list) else page.count(),
             'full_result_count': queryset.count(),
         }
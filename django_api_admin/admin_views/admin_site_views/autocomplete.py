@@ -5,13 +5,16 @@ from django.core.exceptions import FieldDoesNotExist
 from rest_framework.exceptions import PermissionDenied, ParseError
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.views import APIView
+from rest_framework import serializers, status
 
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
 
 from django_api_admin.serializers import AutoCompleteSerializer
 from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.search import SEARCH_RANK
+from django_api_admin.utils.lookup_field import lookup_field
+from django_api_admin.constants.vars import PAGE_VAR
+from django_api_admin.metrics import record_cache_lookup
 
 
 class AutoCompleteView(APIView):
@@ -66,11 +69,15 @@ class AutoCompleteView(APIView):
             self.source_field,
             to_field_name,
         ) = self.process_request(request)
+        self.admin_site.use_read_db(request)
 
         if not self.has_perm(request):
             raise PermissionDenied
 
         self.queryset = self.get_queryset()
+        if str(request.GET.get('light', '')) in serializers.BooleanField.TRUE_VALUES:
+            return Response(self.get_light_results(request, to_field_name), status=status.HTTP_200_OK)
+
         page = self.admin_site.paginate_queryset(
             self.queryset, request, view=self)
 
@@ -84,14 +91,58 @@ class AutoCompleteView(APIView):
             status=status.HTTP_200_OK
         )
 
+    def get_light_results(self, request, to_field_name):
+        """
+        Return only the id and display text of the matching objects, loading the
+        needed columns and probing for one extra row instead of counting.
+        """
+        model_admin = self.model_admin
+        display = model_admin.autocomplete_display
+        opts = model_admin.model._meta
+        limit = model_admin.autocomplete_limit
+        try:
+            page = max(int(request.GET.get(PAGE_VAR, 1)), 1)
+        except ValueError:
+            page = 1
+
+        queryset = self.queryset
+        if not queryset.query.order_by and not opts.ordering:
+            queryset = queryset.order_by('pk')
+        display_field = None
+        if isinstance(display, str):
+            try:
+                display_field = opts.get_field(display)
+            except FieldDoesNotExist:
+                pass
+        if display_field is not None and display_field.concrete:
+            queryset = queryset.only(
+                opts.pk.attname, to_field_name, display_field.name)
+            # fetch the related objects that are displayed with the results.
+            if display_field.is_relation:
+                queryset = queryset.select_related(display_field.name)
+
+        offset = (page - 1) * limit
+        objs = list(queryset[offset:offset + limit + 1])
+        results = []
+        for obj in objs[:limit]:
+            if display is None:
+                text = str(obj)
+            else:
+                f, attr, text = lookup_field(display, obj, model_admin)
+            results.append(
+                {'id': str(getattr(obj, to_field_name)), 'text': str(text)})
+        return {'results': results, 'pagination': {'more': len(objs) > limit}}
+
     def get_queryset(self):
         """Return queryset based on model_admin.get_search_results()."""
-        qs = self.model_admin.get_queryset()
+        qs = self.model_admin.get_queryset(self.request)
         qs = qs.complex_filter(self.source_field.get_limit_choices_to())
         qs, search_use_distinct = self.model_admin.get_search_results(
             qs, self.term)
         if search_use_distinct:
             qs = qs.distinct()
+        if SEARCH_RANK in qs.query.annotations:
+            qs = qs.order_by(SEARCH_RANK, *qs.query.order_by, 'pk')
         return qs
 
     def process_request(self, request):
@@ -115,6 +166,20 @@ class AutoCompleteView(APIView):
             raise ParseError(
                 {'detail': _('missing values app_label, model_name, and field_name')})
 
+        # the lookups are resolved once for every source field.
+        key = (app_label, model_name, field_name)
+        target = self.admin_site._autocomplete_targets.get(key)
+        record_cache_lookup('autocomplete_targets', target is not None)
+        if target is None:
+            target = self.resolve_target(app_label, model_name, field_name)
+            self.admin_site._autocomplete_targets[key] = target
+        return (term, *target)
+
+    def resolve_target(self, app_label, model_name, field_name):
+        """
+        Return the model admin of the remote model, the source field and the
+        to_field name of the source field.
+        """
         # Retrieve objects from parameters.
         try:
             source_model = apps.get_model(app_label, model_name)
@@ -148,7 +213,7 @@ class AutoCompleteView(APIView):
         if not model_admin.to_field_allowed(to_field_name):
             raise PermissionDenied
 
-        return term, model_admin, source_field, to_field_name
+        return model_admin, source_field, to_field_name
 
     def has_perm(self, request):
         """Check if user has permission to access the related model."""
@@ -0,0 +1,156 @@
+import json
+import time
+
+from django.core import signing
+from django.core.cache import caches
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.utils import encoders
+from rest_framework.views import APIView
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+
+from django_api_admin.events import get_model_versions
+from django_api_admin.models import LogEntry
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.renderers import EventStreamRenderer
+
+
+class EventsView(APIView):
+    """
+    Notifies clients of changes to the registered models and of new admin log
+    entries so they can refresh their pages without polling every endpoint.
+
+    every model has a version in the events cache of the site that is bumped
+    when an object is saved or deleted, by the admin or by any other code. the
+    view answers a long poll with the changed models once one of the versions
+    differs from the token sent by the client, or streams the changes as
+    server-sent events when text/event-stream is accepted.
+    """
+    renderer_classes = [*APIView.renderer_classes, EventStreamRenderer]
+    permission_classes = []
+    admin_site = None
+    salt = 'django_api_admin.events'
+    # seconds between two keepalive comments of an idle event stream.
+    keepalive_interval = 15
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('models', str, description=_(
+                'comma separated "<app_label>.<model_name>" labels of the watched models')),
+            OpenApiParameter('since', str, description=_(
+                'the token returned by the previous poll')),
+        ],
+        responses={
+            200: OpenApiResponse(description=_('The changed models and the next token')),
+            400: CommonAPIResponses.bad_request(),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        },
+        tags=['events']
+    )
+    def get(self, request):
+        labels = self.get_labels(request)
+        cache = caches[self.admin_site.events_cache_alias]
+
+        if request.accepted_renderer.format == 'event-stream':
+            since = request.headers.get('Last-Event-ID') or request.query_params.get('since')
+            seen = self.load_token(since) if since else None
+            response = StreamingHttpResponse(
+                self.iter_events(cache, labels, seen), content_type='text/event-stream')
+            response['Cache-Control'] = 'no-cache'
+            # tell nginx not to buffer the stream.
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
+        since = request.query_params.get('since')
+        versions = get_model_versions(cache, labels)
+        changed = []
+        if since:
+            seen = self.load_token(since)
+            deadline = time.monotonic() + self.admin_site.events_poll_timeout
+            changed = self.get_changed(seen, versions)
+            while not changed and time.monotonic() < deadline:
+                time.sleep(self.admin_site.events_poll_interval)
+                versions = get_model_versions(cache, labels)
+                changed = self.get_changed(seen, versions)
+
+        return Response({
+            'token': self.dump_token(versions),
+            'changed': changed,
+        }, status=status.HTTP_200_OK)
+
+    def get_labels(self, request):
+        """
+        Return the labels of the watched models, all the models the user can
+        view and the admin log by default.
+        """
+        log_label = LogEntry._meta.label_lower
+        available = {
+            model._meta.label_lower: model_admin
+            for model, model_admin in self.admin_site._registry.items()
+        }
+        models = request.query_params.get('models')
+        if not models:
+            return [label for label, model_admin in available.items()
+                    if model_admin.has_view_permission(request)] + [log_label]
+
+        labels = list(dict.fromkeys(label.strip().lower() for label in models.split(',')
+                                    if label.strip()))
+        for label in labels:
+            if label == log_label:
+                continue
+            model_admin = available.get(label)
+            if model_admin is None or not model_admin.has_view_permission(request):
+                raise ParseError({'models': _('Unknown model "%(label)s".') % {'label': label}})
+        return labels
+
+    def get_changed(self, seen, versions):
+        return [label for label, version in versions.items() if seen.get(label) != version]
+
+    def iter_events(self, cache, labels, seen):
+        """
+        Yield the server-sent events of the changed models until the stream
+        timeout of the site, the id of every event is the token to resume from.
+        """
+        interval = self.admin_site.events_poll_interval
+        deadline = time.monotonic() + self.admin_site.events_stream_timeout
+        yield 'retry: %d\n\n' % (interval * 1000)
+
+        versions = get_model_versions(cache, labels)
+        if seen is None:
+            yield self.format_event('versions', versions, [])
+        elif self.get_changed(seen, versions):
+            yield self.format_event('change', versions, self.get_changed(seen, versions))
+        seen, last_sent = versions, time.monotonic()
+
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            versions = get_model_versions(cache, labels)
+            changed = self.get_changed(seen, versions)
+            if changed:
+                yield self.format_event('change', versions, changed)
+                seen, last_sent = versions, time.monotonic()
+            elif time.monotonic() - last_sent >= self.keepalive_interval:
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+
+    def format_event(self, event, versions, changed):
+        data = json.dumps({'changed': changed}, cls=encoders.JSONEncoder)
+        return f'id: {self.dump_token(versions)}\nevent: {event}\ndata: {data}\n\n'
+
+    def dump_token(self, versions):
+        return signing.dumps(versions, salt=self.salt, compress=True)
+
+    def load_token(self, token):
+        try:
+            versions = signing.loads(token, salt=self.salt)
+        except signing.BadSignature:
+            versions = None
+        if not isinstance(versions, dict):
+            raise ParseError({'since': _('Invalid events token.')})
+        return versions
@@ -2,7 +2,6 @@
 
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 from drf_spectacular.utils import extend_schema
@@ -31,8 +30,7 @@ class IndexView(APIView):
         app_list = self.admin_site.get_app_list(request)
         # add an url to app_index in every app in app_list
         for app in app_list:
-            app['url'] = reverse(f'{self.admin_site.name}:app_list', kwargs={
-                                 'app_label': app['app_label']}, request=request)
+            app['url'] = request.build_absolute_uri(app['app_url'])
         data = {'app_list': app_list}
         request.current_app = self.admin_site.name
         return Response(data, status=status.HTTP_200_OK)
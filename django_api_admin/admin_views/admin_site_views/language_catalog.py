@@ -1,16 +1,15 @@
 
-from django.utils.translation import gettext_lazy as _
-import json
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.translation import get_language, gettext_lazy as _
 
-from django.views.i18n import JSONCatalog
-
-from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 
 from django_api_admin.serializers import LanguageCatalogSerializer
 from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.utils.language_catalog import get_language_catalog
 
 
 class LanguageCatalogView(APIView):
@@ -93,6 +92,16 @@ class LanguageCatalogView(APIView):
         }
     )
     def get(self, request):
-        response = JSONCatalog.as_view(
-            packages=['django_api_admin'], domain='django')(request)
-        return Response(json.loads(response.content), status=response.status_code)
+        catalog = get_language_catalog(
+            get_language(), self.admin_site.language_catalog_packages)
+
+        # the catalog is served pre-rendered and revalidated using its etag.
+        response = get_conditional_response(request, etag=catalog.etag)
+        if response is None:
+            response = HttpResponse(
+                catalog.content, content_type='application/json')
+        response['ETag'] = catalog.etag
+        patch_cache_control(
+            response, private=True, max_age=self.admin_site.language_catalog_max_age)
+        patch_vary_headers(response, ('Accept-Language',))
+        return response
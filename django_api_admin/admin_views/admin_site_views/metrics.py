@@ -0,0 +1,31 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.renderers import PrometheusRenderer
+
+
+class MetricsView(APIView):
+    """
+    Exposes the request, sql, response size and cache metrics of the admin
+    site in the prometheus text format, see APIAdminSite.enable_metrics.
+    """
+    renderer_classes = [PrometheusRenderer]
+    permission_classes = []
+    admin_site = None
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description=_('The metrics in the prometheus text format')),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        },
+        tags=['metrics']
+    )
+    def get(self, request):
+        return Response(self.admin_site.metrics.render(), status=status.HTTP_200_OK)
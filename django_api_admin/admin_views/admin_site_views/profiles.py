@@ -0,0 +1,66 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.renderers import CollapsedStackRenderer
+
+# the keys of a report that are only returned by its detail.
+DETAIL_KEYS = ('functions', 'queries', 'collapsed')
+
+
+class ProfilesView(APIView):
+    """
+    Lists the reports of the requests profiled by this process, newest first,
+    without their functions, sql queries and collapsed call stacks.
+    """
+    permission_classes = []
+    admin_site = None
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description=_('The profile reports')),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        },
+        tags=['profiles'],
+        operation_id='profiles_list'
+    )
+    def get(self, request):
+        return Response([
+            {**{key: value for key, value in report.items() if key not in DETAIL_KEYS},
+             'detail_url': request.build_absolute_uri(self.admin_site.get_url_path(
+                 'profile_detail', profile_id=report['id']))}
+            for report in reversed(self.admin_site.get_profiles())
+        ], status=status.HTTP_200_OK)
+
+
+class ProfileDetailView(APIView):
+    """
+    Returns one profile report with its functions, sql queries and collapsed
+    call stacks, the stacks alone are returned with ?format=collapsed.
+    """
+    renderer_classes = [*APIView.renderer_classes, CollapsedStackRenderer]
+    permission_classes = []
+    admin_site = None
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description=_('The profile report')),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+            404: CommonAPIResponses.not_found(),
+        },
+        tags=['profiles'],
+        operation_id='profiles_retrieve'
+    )
+    def get(self, request, profile_id):
+        report = self.admin_site.get_profile(profile_id)
+        if report is None:
+            raise NotFound(_('Profile not found.'))
+        return Response(report, status=status.HTTP_200_OK)
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import get_urlconf
+from django.utils.translation import get_language
+
+from rest_framework.response import Response
+
+from drf_spectacular.views import SpectacularAPIView
+
+from django_api_admin.metrics import record_cache_lookup
+
+
+class SchemaView(SpectacularAPIView):
+    """
+    OpenApi3 schema of the admin API, the generated schema is cached per version and
+    language, or served directly from the file written by generate_admin_schema.
+    schemas filtered by the permissions of the user (serve_public off) aren't cached.
+    """
+    admin_site = None
+
+    def _get_schema_response(self, request):
+        if self.admin_site.schema_path and os.path.exists(self.admin_site.schema_path):
+            return self.get_file_response(self.admin_site.schema_path)
+
+        version = self.api_version or request.version or self._get_version_parameter(
+            request)
+        if not self.serve_public:
+            # the schema only lists the endpoints the user may access.
+            schema = self.generate_schema(request, version)
+        else:
+            key = (get_urlconf() or settings.ROOT_URLCONF, version, get_language())
+            schema = self.admin_site._schemas.get(key)
+            record_cache_lookup('schema', schema is not None)
+            if schema is None:
+                schema = self.admin_site._schemas[key] = self.generate_schema(request, version)
+        return Response(
+            data=schema,
+            headers={
+                "Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"'}
+        )
+
+    def generate_schema(self, request, version):
+        generator = self.generator_class(
+            urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+        return generator.get_schema(request=request, public=self.serve_public)
+
+    def get_file_response(self, schema_path):
+        """
+        Return the pre-rendered schema file, it's read again only when it changes.
+        """
+        mtime = os.stat(schema_path).st_mtime_ns
+        cached = self.admin_site._schemas.get(schema_path)
+        record_cache_lookup('schema_file', cached is not None and cached[0] == mtime)
+        if cached is None or cached[0] != mtime:
+            with open(schema_path, 'rb') as f:
+                cached = self.admin_site._schemas[schema_path] = (
+                    mtime, f.read())
+
+        if schema_path.endswith('.json'):
+            content_type = 'application/vnd.oai.openapi+json'
+        else:
+            content_type = 'application/vnd.oai.openapi'
+        response = HttpResponse(cached[1], content_type=content_type)
+        response['Content-Disposition'] = f'inline; filename="{os.path.basename(schema_path)}"'
+        return response
@@ -80,6 +80,7 @@ class AddView(APIView):
                     'name': str(new_object._meta.verbose_name),
                     'object': str(new_object),
                 }}])
+                self.model_admin.admin_site.record_write(request)
 
                 # process bulk additions
                 created_inlines = []
@@ -0,0 +1,245 @@
+import copy
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, router, transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import ParseError
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from django_api_admin.models import ADDITION, CHANGE, DELETION
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.serializers import BatchOperationSerializer, BatchSerializer
+from django_api_admin.utils.bulk_create import bulk_create, can_bulk_create
+from django_api_admin.utils.bulk_update import bulk_update, can_bulk_update
+from django_api_admin.utils.diff_helper import ModelDiffHelper
+
+
+class BatchView(APIView):
+    """
+    Run a list of create, update, partial_update and delete operations on objects
+    of this model. permissions are checked once, the updated and deleted objects
+    are fetched with one query and the changes are saved with bulk operations.
+
+    atomic batches are saved all or nothing, otherwise every valid operation is
+    saved and the result of every operation is returned.
+    """
+    serializer_class = None
+    permission_classes = []
+    model_admin = None
+
+    @extend_schema(
+        request=BatchSerializer,
+        responses={
+            200: OpenApiResponse(description=_("The result of every operation")),
+            400: OpenApiResponse(description=_("An atomic batch failed")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def post(self, request):
+        batch = BatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        atomic = batch.validated_data['atomic']
+        operations = batch.validated_data['operations']
+        if len(operations) > self.model_admin.batch_max_operations:
+            raise ParseError({'detail': _('a batch can have at most %(count)s operations') % {
+                'count': self.model_admin.batch_max_operations}})
+
+        results = [None] * len(operations)
+        creates, updates, deletes = self.validate_operations(
+            request, operations, results)
+
+        failed = any(result is not None for result in results)
+        if atomic and failed:
+            return self.failed_response(results)
+
+        using = router.db_for_write(self.model_admin.model)
+        # the saves that failed changed the updated objects, they are retried
+        # from copies to log the right changed fields.
+        originals = [(index, copy.copy(obj), serializer)
+                     for index, obj, serializer in updates] if not atomic else []
+        try:
+            with transaction.atomic(using=using):
+                self.save(request, creates, updates, deletes, results, using)
+        except IntegrityError as e:
+            if atomic:
+                return self.failed_response(results, str(e))
+            # save the operations one by one to find the ones that failed.
+            for operation in [*((index, 'create', data) for index, data in creates),
+                              *((index, 'update', item) for index, *item in originals),
+                              *((index, 'delete', obj) for index, obj in deletes)]:
+                index, action, item = operation
+                try:
+                    with transaction.atomic(using=using):
+                        self.save(request,
+                                  [(index, item)] if action == 'create' else [],
+                                  [(index, *item)] if action == 'update' else [],
+                                  [(index, item)] if action == 'delete' else [],
+                                  results, using)
+                except IntegrityError as e:
+                    results[index] = self.get_result(
+                        index, operations[index]['action'], status.HTTP_400_BAD_REQUEST,
+                        errors={'non_field_errors': [str(e)]})
+
+        return Response({'atomic': atomic, 'results': results}, status=status.HTTP_200_OK)
+
+    def validate_operations(self, request, operations, results):
+        """
+        Validate the operations and return the validated creates, updates and
+        deletes, the errors of invalid operations are written to results.
+        """
+        model_admin = self.model_admin
+        opts = model_admin.model._meta
+        permissions = {
+            'create': model_admin.has_add_permission(request),
+            'update': model_admin.has_change_permission(request),
+            'partial_update': model_admin.has_change_permission(request),
+            'delete': model_admin.has_delete_permission(request),
+        }
+        operation_serializer = BatchOperationSerializer()
+
+        # first pass: validate the operations and collect the targeted objects.
+        validated, pks = [], {}
+        for index, operation in enumerate(operations):
+            try:
+                operation = operation_serializer.run_validation(operation)
+            except serializers.ValidationError as exc:
+                results[index] = self.get_result(
+                    index, operation.get('action'), status.HTTP_400_BAD_REQUEST,
+                    errors=serializers.as_serializer_error(exc))
+                continue
+            action = operation['action']
+            if not permissions[action]:
+                results[index] = self.get_result(
+                    index, action, status.HTTP_403_FORBIDDEN,
+                    detail=_('You do not have permission to perform this action.'))
+                continue
+            if action != 'create':
+                try:
+                    pk = opts.pk.to_python(operation.get('id'))
+                except ValidationError as e:
+                    pk, message = None, e.messages[0]
+                else:
+                    message = _('This field is required.')
+                if pk is None or pk in pks:
+                    results[index] = self.get_result(
+                        index, action, status.HTTP_400_BAD_REQUEST,
+                        errors={'id': [message if pk is None else _('Each object can only be targeted once.')]})
+                    continue
+                operation['pk'] = pk
+                pks[pk] = index
+            validated.append((index, operation))
+
+        objs = model_admin.get_queryset(request).in_bulk(list(pks)) if pks else {}
+
+        # second pass: validate the data of the operations.
+        serializer = self.serializer_class(context={'request': request})
+        creates, updates, deletes = [], [], []
+        for index, operation in validated:
+            action = operation['action']
+            data = operation.get('data', {})
+            if action == 'create':
+                try:
+                    creates.append((index, serializer.run_validation(data)))
+                except serializers.ValidationError as exc:
+                    results[index] = self.get_result(
+                        index, action, status.HTTP_400_BAD_REQUEST,
+                        errors=serializers.as_serializer_error(exc))
+                continue
+
+            obj = objs.get(operation['pk'])
+            if obj is None:
+                results[index] = self.get_result(
+                    index, action, status.HTTP_404_NOT_FOUND, id=operation['pk'],
+                    detail=_("%(name)s with ID “%(key)s” doesn't exist. Perhaps it was deleted?") % {
+                        'name': opts.verbose_name, 'key': operation['pk']})
+            elif action == 'delete':
+                deletes.append((index, obj))
+            else:
+                object_serializer = self.serializer_class(
+                    instance=obj, data=data, partial=action == 'partial_update',
+                    context={'request': request})
+                if object_serializer.is_valid():
+                    updates.append((index, obj, object_serializer))
+                else:
+                    results[index] = self.get_result(
+                        index, action, status.HTTP_400_BAD_REQUEST, id=obj.pk,
+                        errors=object_serializer.errors)
+        return creates, updates, deletes
+
+    def save(self, request, creates, updates, deletes, results, using):
+        """
+        Save the validated operations, write their results and log them.
+        """
+        model = self.model_admin.model
+        opts = model._meta
+        log_entries = []
+
+        if creates:
+            serializer = self.serializer_class(context={'request': request})
+            rows = [data for index, data in creates]
+            if can_bulk_create(serializer):
+                objs = bulk_create(model, rows, using,
+                                   search_backend=self.model_admin.get_search_backend())
+            else:
+                objs = [serializer.create(data) for data in rows]
+            for (index, data), obj in zip(creates, objs):
+                results[index] = self.get_result(
+                    index, 'create', status.HTTP_201_CREATED, id=obj.pk)
+                log_entries.append((obj, ADDITION, [{'added': {
+                    'name': str(opts.verbose_name), 'object': str(obj)}}]))
+
+        if updates:
+            helpers = {index: ModelDiffHelper(obj) for index, obj, serializer in updates}
+            bulk_update(model, [(obj, serializer.validated_data)
+                                for index, obj, serializer in updates
+                                if can_bulk_update(serializer)], using,
+                        search_backend=self.model_admin.get_search_backend())
+            for index, obj, serializer in updates:
+                if not can_bulk_update(serializer):
+                    serializer.update(obj, serializer.validated_data)
+                results[index] = self.get_result(
+                    index, serializer.partial and 'partial_update' or 'update',
+                    status.HTTP_200_OK, id=obj.pk)
+                log_entries.append((obj, CHANGE, [{'changed': {
+                    'name': str(opts.verbose_name),
+                    'object': str(obj),
+                    'fields': helpers[index].set_changed_model(obj).changed_fields,
+                }}]))
+
+        if deletes:
+            for index, obj in deletes:
+                results[index] = self.get_result(
+                    index, 'delete', status.HTTP_204_NO_CONTENT, id=obj.pk)
+                log_entries.append((obj, DELETION, str(obj)))
+            # log the deletions before the objects are deleted.
+            self.model_admin.log_actions(request, log_entries)
+            log_entries = []
+            self.model_admin.delete_queryset(request, model._base_manager.using(using).filter(
+                pk__in=[obj.pk for _, obj in deletes]))
+
+        if log_entries:
+            self.model_admin.log_actions(request, log_entries)
+        self.model_admin.admin_site.record_write(request)
+
+    def get_result(self, index, action, status_code, **kwargs):
+        return {'index': index, 'action': action, 'status': status_code, **kwargs}
+
+    def failed_response(self, results, detail=None):
+        """
+        Return the response of an atomic batch that wasn't saved.
+        """
+        results = [result if result is not None and result['status'] >= 400 else {
+            'index': index,
+            'action': result['action'] if result else None,
+            'status': status.HTTP_424_FAILED_DEPENDENCY,
+        } for index, result in enumerate(results)]
+        data = {'atomic': True, 'results': results}
+        if detail is not None:
+            data['detail'] = detail
+        return Response(data, status=status.HTTP_400_BAD_REQUEST)
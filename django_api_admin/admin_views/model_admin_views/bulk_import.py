@@ -0,0 +1,196 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.db import IntegrityError, router, transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.utils.bulk_create import bulk_create, can_bulk_create
+
+
+class ImportView(APIView):
+    """
+    Create objects from the rows of an uploaded csv or ndjson file. the rows are
+    validated with the admin serializer and saved in chunks, each chunk in its own
+    transaction, and the errors of invalid rows are reported by line number.
+    """
+    serializer_class = None
+    permission_classes = []
+    model_admin = None
+
+    @extend_schema(
+        parameters=[OpenApiParameter(
+            'dry_run', bool, description=_('validate the rows without saving them'))],
+        responses={
+            200: OpenApiResponse(description=_("The import summary")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def post(self, request, import_format):
+        if import_format not in self.model_admin.import_formats:
+            raise NotFound(_('unsupported import format %(format)s') % {
+                'format': import_format})
+        if not self.model_admin.has_import_permission(request):
+            raise PermissionDenied
+
+        dry_run = str(request.query_params.get('dry_run', '')
+                      ) in serializers.BooleanField.TRUE_VALUES
+        serializer = self.serializer_class(context={'request': request})
+        using = router.db_for_write(self.model_admin.model)
+        # the upload is read until its first line that isn't utf-8, the rows
+        # before it are imported and the line is reported as an error.
+        decode_errors = []
+        lines = self.decode_lines(self.get_lines(request), decode_errors)
+        rows = self.read_csv(
+            lines, serializer) if import_format == 'csv' else self.read_ndjson(lines)
+
+        created, total, errors, error_count = 0, 0, [], 0
+        while True:
+            chunk = list(islice(rows, self.model_admin.import_chunk_size))
+            if not chunk:
+                break
+            valid, chunk_errors = [], []
+            for line, data in chunk:
+                try:
+                    if isinstance(data, serializers.ValidationError):
+                        raise data
+                    valid.append((line, serializer.run_validation(data)))
+                except serializers.ValidationError as exc:
+                    chunk_errors.append(
+                        {'line': line, 'errors': serializers.as_serializer_error(exc)})
+            if valid and not dry_run:
+                chunk_created, save_errors = self.save_chunk(
+                    serializer, valid, using)
+                created += chunk_created
+                chunk_errors = sorted(
+                    chunk_errors + save_errors, key=lambda error: error['line'])
+
+            total += len(chunk)
+            error_count += len(chunk_errors)
+            errors.extend(
+                chunk_errors[:self.model_admin.import_max_errors - len(errors)])
+
+        error_count += len(decode_errors)
+        errors.extend(decode_errors[:self.model_admin.import_max_errors - len(errors)])
+        if not dry_run:
+            self.model_admin.log_import(request, [{'imported': {
+                'format': import_format,
+                'rows': total,
+                'created': created,
+            }}])
+            self.model_admin.admin_site.record_write(request)
+        return Response({
+            'dry_run': dry_run,
+            'rows': total,
+            'created': created,
+            'error_count': error_count,
+            'errors': errors,
+        }, status=status.HTTP_200_OK)
+
+    def get_lines(self, request):
+        """
+        Return an iterator of the lines of the upload, either the file field of a
+        multipart request or the request body.
+        """
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            return iter(upload) if upload is not None else iter(())
+        stream = request.stream
+        return iter(stream.readline, b'') if stream is not None else iter(())
+
+    def decode_lines(self, lines, errors):
+        """
+        Yield the decoded lines of the upload, stopping at the first line that
+        isn't valid utf-8 and appending its error to ``errors``.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        line_number = 0
+        try:
+            for line_number, line in enumerate(lines, start=1):
+                yield decoder.decode(line)
+            # a multibyte character cut at the end of the upload.
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            errors.append({'line': line_number, 'errors': {
+                'non_field_errors': [_('The line is not utf-8 encoded.')]}})
+
+    def read_csv(self, lines, serializer):
+        """
+        Yield the (line number, data) of every csv row, empty values of nullable
+        fields are read as null and values of many fields as comma separated lists.
+        """
+        reader = csv.DictReader(lines)
+        nullable = {name for name, field in serializer.fields.items()
+                    if getattr(field, 'allow_null', False)}
+        many = {name for name, field in serializer.fields.items()
+                if isinstance(field, (serializers.ManyRelatedField, serializers.ListField))}
+        for row in reader:
+            data = {}
+            for key, value in row.items():
+                if key is None:
+                    continue
+                if key in many:
+                    value = [item.strip()
+                             for item in value.split(',') if item.strip()]
+                elif value == '' and key in nullable:
+                    value = None
+                data[key] = value
+            yield reader.line_num, data
+
+    def read_ndjson(self, lines):
+        """
+        Yield the (line number, data) of every ndjson line, or a validation error
+        for lines that aren't json objects.
+        """
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                data = serializers.ValidationError(
+                    {'non_field_errors': [_('Invalid json object.')]})
+            yield line_number, data
+
+    def save_chunk(self, serializer, rows, using):
+        """
+        Save the validated (line, data) rows of a chunk in one transaction, with
+        bulk_create unless the serializer customizes how objects are created.
+        return the number of created objects and the errors of the rows that
+        violate database constraints.
+        """
+        try:
+            with transaction.atomic(using=using):
+                return len(self.create(serializer, [data for _, data in rows], using)), []
+        except IntegrityError:
+            pass
+
+        # save the rows one by one to find the ones that failed.
+        created, errors = 0, []
+        for line, data in rows:
+            try:
+                with transaction.atomic(using=using):
+                    self.create(serializer, [data], using)
+                created += 1
+            except IntegrityError as e:
+                errors.append(
+                    {'line': line, 'errors': {'non_field_errors': [str(e)]}})
+        return created, errors
+
+    def create(self, serializer, rows, using):
+        if can_bulk_create(serializer):
+            return bulk_create(self.model_admin.model, rows, using,
+                               search_backend=self.model_admin.get_search_backend())
+        return [serializer.create(data) for data in rows]
@@ -79,6 +79,7 @@ class ChangeView(APIView):
                     'object': str(updated_object),
                     'fields': helper.set_changed_model(updated_object).changed_fields
                 }}])
+                self.model_admin.admin_site.record_write(request)
 
                 # process bulk additions
                 created_inlines = []
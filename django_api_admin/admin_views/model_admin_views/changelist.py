@@ -4,19 +4,32 @@ from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 
 from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework.reverse import reverse
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
-from rest_framework.views import APIView
 
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
 
+from django_api_admin.changelist import ChangeList as BaseChangeList
+from django_api_admin.constants.vars import ALL_VAR
 from django_api_admin.utils.get_form_fields import get_form_fields
 from django_api_admin.utils.label_for_field import label_for_field
 from django_api_admin.utils.lookup_field import lookup_field
-from django_api_admin.exceptions import IncorrectLookupParameters
+from django_api_admin.exceptions import IncorrectLookupParameters, QueryBudgetExceeded
 from django_api_admin.serializers import ChangeListSerializer, ChangelistResponseSerializer
 from django_api_admin.openapi import CommonAPIResponses, ChangeList
+from django_api_admin.renderers import ColumnarJSONRenderer
+from django_api_admin.utils.stream_json import StreamingJSONResponse
+from django_api_admin.utils.url_template import URL_PLACEHOLDER, format_url, get_url_template
+
+
+class StreamingChangeList(BaseChangeList):
+    """
+    A changelist iterating the objects of the page in chunks instead of
+    fetching them all at once.
+    """
+
+    def coalesce_page(self, queryset):
+        return queryset.iterator(chunk_size=self.model_admin.stream_chunk_size)
 
 
 class ChangeListView(APIView):
@@ -25,6 +38,7 @@ class ChangeListView(APIView):
     supports querystring filtering, pagination and search also changes based on list display.
     """
     permission_classes = []
+    renderer_classes = [*APIView.renderer_classes, ColumnarJSONRenderer]
     serializer_class = ChangelistResponseSerializer
     model_admin = None
 
@@ -49,16 +63,47 @@ class ChangeListView(APIView):
         }
     )
     def get(self, request):
+        self.model_admin.admin_site.use_read_db(request)
+        stream = self.should_stream(request)
         try:
-            cl = self.model_admin.get_changelist_instance(request)
+            cl = self.model_admin.get_changelist_instance(
+                request, changelist_class=StreamingChangeList if stream else None)
         except IncorrectLookupParameters as e:
             raise NotFound(str(e))
         columns = self.get_columns(request, cl)
+        if isinstance(request.accepted_renderer, ColumnarJSONRenderer):
+            rows = self.get_columnar_rows(request, cl)
+            config = self.get_config(request, cl)
+            return Response({
+                'config': config,
+                'columns': columns,
+                'rows': rows,
+                'url_templates': {
+                    'change_url': self.get_change_url_template(request, cl) % URL_PLACEHOLDER},
+                'url_placeholder': URL_PLACEHOLDER,
+            }, status=status.HTTP_200_OK)
+        if stream:
+            config = self.get_config(request, cl)
+            return StreamingJSONResponse({'config': config, 'columns': columns,
+                                          'rows': self.iter_rows(request, cl)},
+                                         status=status.HTTP_200_OK)
         rows = self.get_rows(request, cl)
         config = self.get_config(request, cl)
         return Response({'config': config, 'columns': columns, 'rows': rows},
                         status=status.HTTP_200_OK)
 
+    def should_stream(self, request):
+        """
+        Return True if the page may hold more rows than the stream threshold and
+        plain json was negotiated.
+        """
+        threshold = self.model_admin.stream_threshold
+        if threshold is None or request.accepted_renderer.format != 'json':
+            return False
+        page_size = self.model_admin.list_max_show_all if ALL_VAR in request.GET \
+            else self.model_admin.list_per_page
+        return page_size > threshold
+
     def get_columns(self, request, cl):
         """
         return changelist columns or headers.
@@ -74,20 +119,43 @@ class ChangeListView(APIView):
         """
         Return changelist rows actual list of data.
         """
-        rows = []
-        # generate changelist attributes (e.g result_list, paginator, result_count)
-        cl.get_results()
-        empty_value_display = cl.model_admin.get_empty_value_display()
-        for result in cl.result_list:
-            model_info = (cl.model_admin.admin_site.name, type(
-                result)._meta.app_label, type(result)._meta.model_name)
-            row = {
-                'change_url': reverse('%s:%s_%s_change' % model_info, kwargs={'object_id': result.pk}, request=request),
+        return list(self.iter_rows(request, cl))
+
+    def iter_rows(self, request, cl):
+        """
+        Yield the changelist rows one by one.
+        """
+        fields_list = self.get_fields_list(request, cl)
+        template = self.get_change_url_template(request, cl)
+        for result, cells in self.get_cells(request, cl):
+            yield {
+                'change_url': format_url(template, result.pk),
                 'id': result.pk,
-                'cells': {}
+                'cells': dict(zip(fields_list, cells)),
             }
 
-            for field_name in self.get_fields_list(request, cl):
+    def get_columnar_rows(self, request, cl):
+        """
+        Return changelist rows as lists of the id followed by the cells.
+        """
+        return [[result.pk, *cells] for result, cells in self.get_cells(request, cl)]
+
+    def get_change_url_template(self, request, cl):
+        info = (cl.model_admin.admin_site.name,
+                cl.opts.app_label, cl.opts.model_name)
+        return get_url_template('%s:%s_%s_change' % info, request)
+
+    def get_cells(self, request, cl):
+        """
+        Yield every result of the page with the list of its cell values.
+        """
+        # the changelist fetched its results (e.g result_list, paginator,
+        # result_count) when it was created.
+        empty_value_display = cl.model_admin.get_empty_value_display()
+        fields_list = self.get_fields_list(request, cl)
+        for result in cl.result_list:
+            cells = []
+            for field_name in fields_list:
                 try:
                     _, _, value = lookup_field(
                         field_name, result, cl.model_admin)
@@ -117,9 +185,8 @@ class ChangeListView(APIView):
                 except ObjectDoesNotExist:
                     result_repr = empty_value_display
 
-                row['cells'][field_name] = result_repr
-            rows.append(row)
-        return rows
+                cells.append(result_repr)
+            yield result, cells
 
     def get_config(self, request, cl):
         config = {}
@@ -131,18 +198,23 @@ class ChangeListView(APIView):
         # changelist pagination attributes
         config['full_count'] = cl.full_result_count
         config['result_count'] = cl.result_count
+        # whether there are other pages, known even when the count ran out of time.
+        config['multi_page'] = cl.multi_page
 
         # a list of action names and choices
         config['action_choices'] = cl.model_admin.get_action_choices(
             request, [])
 
-        # a list of filters titles and choices
-        filters_spec, _, _, _, _ = cl.get_filters(request)
-        if filters_spec:
-            config['filters'] = [
-                {"title": filter.title, "choices": filter.choices(cl)} for filter in filters_spec]
-        else:
+        # a list of filters titles and choices, omitted if they take too long.
+        try:
+            with cl.time_budget('filter_choices'):
+                filters_spec, _, _, _, _ = cl.get_filters(request)
+                config['filters'] = [
+                    {"title": filter.title, "choices": list(filter.choices(cl))}
+                    for filter in filters_spec]
+        except QueryBudgetExceeded:
             config['filters'] = []
+            cl.degraded.append('filter_choices')
 
         # a list of fields that you can sort with
         list_display_fields = []
@@ -166,11 +238,15 @@ class ChangeListView(APIView):
 
         config['editing_fields'] = editing_fields
 
+        # the phases that ran out of time budget.
+        config['degraded'] = cl.degraded
+        config['refine_search'] = cl.refine_search
+
         return config
 
     def get_fields_list(self, request, cl):
-        list_display = cl.model_admin.list_display
+        list_display = cl.list_display
         exclude = cl.model_admin.exclude or tuple()
         fields_list = tuple(
-            filter(lambda item: item not in exclude, list_display))
+            filter(lambda item: item not in exclude and item != 'action_checkbox', list_display))
         return fields_list
@@ -0,0 +1,124 @@
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import ParseError, PermissionDenied
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from django_api_admin.models import CHANGE
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.utils.bulk_update import bulk_update, can_bulk_update
+
+
+class ChangeListEditView(APIView):
+    """
+    Save the list_editable fields of many changelist rows at once, the body maps
+    the primary key of every edited row to its edited fields.
+    rows are validated together and nothing is saved if any of them is invalid.
+    """
+    serializer_class = None
+    permission_classes = []
+    model_admin = None
+
+    @extend_schema(
+        request=dict,
+        responses={
+            200: OpenApiResponse(description=_("The primary keys of the changed rows")),
+            400: OpenApiResponse(description=_("The errors of the invalid rows")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def post(self, request):
+        if not self.model_admin.has_change_permission(request):
+            raise PermissionDenied
+        if not isinstance(request.data, dict) or not request.data:
+            raise ParseError(
+                {'detail': _('expected an object mapping primary keys to the edited fields')})
+
+        model_admin = self.model_admin
+        opts = model_admin.model._meta
+        editable = set(model_admin.list_editable)
+
+        errors, edits = {}, {}
+        for key, data in request.data.items():
+            try:
+                pk = opts.pk.to_python(key)
+            except ValidationError as e:
+                errors[key] = {'id': e.messages}
+                continue
+            if not isinstance(data, dict):
+                errors[key] = {'non_field_errors': [_('expected an object of fields')]}
+                continue
+            not_editable = [name for name in data if name not in editable]
+            if not_editable:
+                errors[key] = {name: [_('This field is not editable.')]
+                               for name in not_editable}
+                continue
+            edits[pk] = (key, data)
+
+        objs = model_admin.get_queryset(request).in_bulk(list(edits)) if edits else {}
+        serializers = []
+        for pk, (key, data) in edits.items():
+            obj = objs.get(pk)
+            if obj is None:
+                errors[key] = {'id': [_("%(name)s with ID “%(key)s” doesn't exist. Perhaps it was deleted?") % {
+                    'name': opts.verbose_name, 'key': key}]}
+                continue
+            serializer = self.serializer_class(
+                instance=obj, data=data, partial=True, context={'request': request})
+            if serializer.is_valid():
+                serializers.append(serializer)
+            else:
+                errors[key] = serializer.errors
+
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = self.get_changes(serializers)
+        using = router.db_for_write(model_admin.model)
+        with transaction.atomic(using=using):
+            bulk_update(model_admin.model, [
+                (serializer.instance, data) for serializer, data in changes
+                if can_bulk_update(serializer)], using,
+                search_backend=model_admin.get_search_backend())
+            for serializer, data in changes:
+                if not can_bulk_update(serializer):
+                    serializer.update(serializer.instance, data)
+            model_admin.log_actions(request, [
+                (serializer.instance, CHANGE, [{'changed': {'fields': list(data)}}])
+                for serializer, data in changes])
+            model_admin.admin_site.record_write(request)
+
+        return Response({'changed': [serializer.instance.pk for serializer, data in changes]},
+                        status=status.HTTP_200_OK)
+
+    def get_changes(self, serializers):
+        """
+        Return the (serializer, changed data) of the rows that changed, the
+        validated data is compared to the loaded objects without querying.
+        """
+        opts = self.model_admin.opts
+        m2m_fields = {field.name for field in opts.many_to_many}
+        # the related objects aren't loaded, their keys are compared.
+        foreign_keys = {field.name: field for field in opts.concrete_fields
+                        if field.many_to_one or field.one_to_one}
+        changes = []
+        for serializer in serializers:
+            obj = serializer.instance
+            data = {attr: value for attr, value in serializer.validated_data.items()
+                    if attr in m2m_fields or self.has_changed(obj, foreign_keys.get(attr), attr, value)}
+            if data:
+                changes.append((serializer, data))
+        return changes
+
+    def has_changed(self, obj, foreign_key, attr, value):
+        if foreign_key is None:
+            return getattr(obj, attr) != value
+        if value is not None:
+            value = getattr(value, foreign_key.target_field.attname)
+        return getattr(obj, foreign_key.attname) != value
@@ -0,0 +1,222 @@
+from datetime import datetime
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Max
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+
+from django_api_admin.admin_views.model_admin_views.changelist import ChangeListView
+from django_api_admin.changelist import ChangeList
+from django_api_admin.constants.vars import SYNC_TOKEN_VAR
+from django_api_admin.exceptions import IncorrectLookupParameters
+from django_api_admin.models import ADDITION, CHANGE, DELETION, LogEntry
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.serializers import ChangeListSerializer
+from django_api_admin.utils.get_content_type_for_model import get_content_type_for_model
+
+
+class SyncChangeList(ChangeList):
+    """
+    A changelist that only builds the filtered and searched queryset, the rows
+    are the changed objects set by the sync view.
+    """
+
+    def get_results(self):
+        pass
+
+
+class ChangeListSyncView(ChangeListView):
+    """
+    Return the changelist rows created or updated since a sync token within the
+    filters and search of the query string, the ids of deleted objects and of
+    objects that no longer match the filters, and the token of the next sync.
+
+    changes are found with the sync_field of the model admin, a timestamp
+    updated on every save, or with the admin log if there is none. deletions
+    are read from the admin log. a request without a token returns the token
+    of the current state.
+
+    the token holds the high-water marks of the sync_field and the admin log
+    and the changes seen within the overlap windows below them, see
+    sync_overlap and sync_log_overlap.
+    """
+    salt = 'django_api_admin.changelist_sync'
+
+    @extend_schema(
+        parameters=[
+            ChangeListSerializer,
+            OpenApiParameter(SYNC_TOKEN_VAR, str, description=_(
+                'the token returned by the previous sync')),
+        ],
+        responses={
+            200: OpenApiResponse(description=_("The changed rows and the next sync token")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def get(self, request):
+        self.model_admin.admin_site.use_read_db(request)
+        if not self.model_admin.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            cl = self.model_admin.get_changelist_instance(
+                request, changelist_class=SyncChangeList)
+        except IncorrectLookupParameters as e:
+            raise NotFound(str(e))
+
+        token = request.query_params.get(SYNC_TOKEN_VAR)
+        if not token:
+            return Response(self.get_reset(request, cl), status=status.HTTP_200_OK)
+        cursor = self.load_token(token)
+
+        log_overlap = self.model_admin.sync_log_overlap
+        seen_entries = set(cursor['e'])
+        entries = [entry for entry in LogEntry.objects.using(
+            self.model_admin.admin_site.get_read_db(request, LogEntry)).filter(
+            content_type=get_content_type_for_model(cl.model),
+            pk__gt=cursor['l'] - log_overlap,
+        ).values_list('pk', 'object_id', 'action_flag') if entry[0] not in seen_entries]
+        deleted = self.to_pks(cl, (object_id for pk, object_id, action_flag in entries
+                                   if action_flag == DELETION))
+        sync_field = self.model_admin.sync_field
+        if sync_field:
+            changed, removed, cursor = self.get_field_changes(cl, sync_field, cursor)
+        else:
+            changed, removed = self.get_log_changes(cl, entries)
+        removed = [pk for pk in removed if pk not in deleted]
+        if entries:
+            last = max(cursor['l'], *(pk for pk, object_id, action_flag in entries))
+            cursor = {**cursor, 'l': last, 'e': sorted(
+                pk for pk in seen_entries.union(pk for pk, _, _ in entries)
+                if pk > last - log_overlap)}
+
+        if len(changed) + len(removed) > self.model_admin.list_max_show_all:
+            # too many changes, the client should reload the changelist.
+            return Response(self.get_reset(request, cl), status=status.HTTP_200_OK)
+
+        cl.result_list = changed
+        return Response({
+            'reset': False,
+            'token': self.dump_token(cursor),
+            'rows': self.get_rows(request, cl),
+            'removed': removed,
+            'deleted': deleted,
+        }, status=status.HTTP_200_OK)
+
+    def get_field_changes(self, cl, sync_field, cursor):
+        """
+        Return the changed objects in scope, the pks of the changed objects out
+        of scope and the cursor after them using the sync_field timestamps.
+        """
+        since, overlap = cursor['t'], self.model_admin.sync_overlap
+        # more changes than this reset the changelist.
+        limit = self.model_admin.list_max_show_all + 1
+        seen = set(cursor['o'])
+        queryset, root_queryset = cl.queryset, cl.root_queryset
+        if since is not None:
+            window = {f'{sync_field}__gt': since - overlap}
+            queryset, root_queryset = queryset.filter(**window), root_queryset.filter(**window)
+
+        changed, changes = [], []
+        for obj in queryset[:limit + len(seen)]:
+            change = self.get_change(obj.pk, getattr(obj, sync_field))
+            if change not in seen:
+                changed.append(obj)
+                changes.append(change)
+        removed = []
+        if cl.has_active_filters or cl.query:
+            for pk, timestamp in root_queryset.exclude(pk__in=cl.queryset.values('pk')).values_list(
+                    'pk', sync_field)[:limit + len(seen)]:
+                change = self.get_change(pk, timestamp)
+                if change not in seen:
+                    removed.append(pk)
+                    changes.append(change)
+
+        timestamps = [datetime.fromisoformat(timestamp) for _, timestamp in changes if timestamp]
+        if timestamps:
+            latest = max(since, *timestamps) if since is not None else max(timestamps)
+            cursor = {**cursor, 't': latest, 'o': sorted(
+                change for change in seen.union(changes)
+                if change[1] and datetime.fromisoformat(change[1]) > latest - overlap)}
+        return changed, removed, cursor
+
+    def get_change(self, pk, timestamp):
+        """
+        Return the (pk, timestamp) identifying a change in the sync tokens.
+        """
+        return str(pk), timestamp.isoformat() if timestamp is not None else None
+
+    def get_log_changes(self, cl, entries):
+        """
+        Return the changed objects in scope and the pks of the changed objects
+        out of scope using the admin log entries.
+        """
+        pks = self.to_pks(cl, (object_id for pk, object_id, action_flag in entries
+                               if action_flag in (ADDITION, CHANGE)))
+        changed = list(cl.queryset.filter(pk__in=pks)) if pks else []
+        in_scope = {obj.pk for obj in changed}
+        return changed, [pk for pk in pks if pk not in in_scope]
+
+    def to_pks(self, cl, object_ids):
+        """
+        Return the unique primary keys of the logged object ids.
+        """
+        pks = []
+        for object_id in object_ids:
+            try:
+                pks.append(cl.opts.pk.to_python(object_id))
+            except ValidationError:
+                continue
+        return list(dict.fromkeys(pks))
+
+    def get_reset(self, request, cl):
+        """
+        Return the response telling the client to load the changelist again
+        with the token of the current state.
+        """
+        model_admin = self.model_admin
+        sync_field = model_admin.sync_field
+        log_entries = LogEntry.objects.using(
+            model_admin.admin_site.get_read_db(request, LogEntry))
+        cursor = {
+            't': cl.root_queryset.aggregate(latest=Max(sync_field))['latest']
+            if sync_field else None,
+            'l': log_entries.aggregate(last=Max('pk'))['last'] or 0,
+        }
+        # the changes within the overlap windows are already in the changelist.
+        cursor['e'] = list(log_entries.filter(
+            content_type=get_content_type_for_model(cl.model),
+            pk__gt=cursor['l'] - model_admin.sync_log_overlap,
+        ).order_by('pk').values_list('pk', flat=True))
+        cursor['o'] = sorted(
+            self.get_change(pk, timestamp) for pk, timestamp in cl.root_queryset.filter(**{
+                f'{sync_field}__gt': cursor['t'] - model_admin.sync_overlap,
+            }).values_list('pk', sync_field)) if cursor['t'] is not None else []
+        return {'reset': True, 'token': self.dump_token(cursor),
+                'rows': [], 'removed': [], 'deleted': []}
+
+    def dump_token(self, cursor):
+        return signing.dumps({
+            't': cursor['t'].isoformat() if cursor['t'] is not None else None,
+            'l': cursor['l'],
+            'e': cursor['e'],
+            'o': cursor['o'],
+        }, salt=self.salt, compress=True)
+
+    def load_token(self, token):
+        try:
+            cursor = signing.loads(token, salt=self.salt)
+            return {
+                't': datetime.fromisoformat(cursor['t']) if cursor['t'] is not None else None,
+                'l': int(cursor['l']),
+                'e': [int(pk) for pk in cursor['e']],
+                'o': [(str(pk), timestamp) for pk, timestamp in cursor['o']],
+            }
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise ParseError({SYNC_TOKEN_VAR: _('Invalid sync token.')})
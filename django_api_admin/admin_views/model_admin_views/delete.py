@@ -71,7 +71,8 @@ class DeleteView(APIView):
             self.model_admin.log_deletion(request, obj, str(obj))
 
             # delete the object
-            obj.delete()
+            self.model_admin.delete_model(request, obj)
+            self.model_admin.admin_site.record_write(request)
 
             return Response({'detail': _('The %(name)s “%(obj)s” was deleted successfully.') % {
                 'name': opts.verbose_name,
@@ -19,13 +19,15 @@ class DetailView(APIView):
     model_admin = None
 
     def get(self, request, object_id):
+        self.model_admin.admin_site.use_read_db(request)
         # validate the reverse to field reference
         to_field = request.query_params.get(TO_FIELD_VAR)
         if to_field and not self.model_admin.to_field_allowed(to_field):
             return Response({'detail': _('The field %s cannot be referenced.') % to_field},
                             status=status.HTTP_400_BAD_REQUEST)
+        fields = self.model_admin.get_sparse_fields(request)
         obj = self.model_admin.get_object(
-            request, unquote(object_id), to_field)
+            request, unquote(object_id), to_field, fields=fields)
 
         # if the object doesn't exist respond with not found
         if obj is None:
@@ -35,7 +37,9 @@ class DetailView(APIView):
             }
             return Response({'detail': msg}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.serializer_class(obj)
+        serializer_class = self.model_admin.get_sparse_serializer_class(
+            fields) if fields is not None else self.serializer_class
+        serializer = serializer_class(obj)
         data = serializer.data
 
         # add admin urls.
@@ -0,0 +1,171 @@
+import csv
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from django_api_admin.changelist import ChangeList
+from django_api_admin.exceptions import IncorrectLookupParameters
+from django_api_admin.serializers import ChangeListSerializer
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.utils.lookup_field import lookup_field
+
+# spreadsheets run the csv cells starting with these characters as formulas.
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportChangeList(ChangeList):
+    """
+    A changelist that only builds the filtered, searched and ordered queryset,
+    without counting or fetching a page.
+    """
+
+    def get_results(self):
+        pass
+
+
+class Echo:
+    """
+    A file-like object returning what is written to it, used to stream csv rows.
+    """
+
+    def write(self, value):
+        return value
+
+
+class ExportView(APIView):
+    """
+    Stream the changelist objects matching the filters, search and ordering of
+    the query string as csv or ndjson rows of the list_display columns.
+    """
+    permission_classes = []
+    model_admin = None
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+
+    @extend_schema(
+        parameters=[ChangeListSerializer],
+        responses={
+            200: OpenApiResponse(description=_("The exported rows")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def get(self, request, export_format):
+        self.model_admin.admin_site.use_read_db(request)
+        if export_format not in self.model_admin.export_formats:
+            raise NotFound(_('unsupported export format %(format)s') % {
+                'format': export_format})
+        if not self.model_admin.has_export_permission(request):
+            raise PermissionDenied
+
+        try:
+            cl = self.model_admin.get_changelist_instance(
+                request, changelist_class=ExportChangeList)
+        except IncorrectLookupParameters as e:
+            raise NotFound(str(e))
+
+        columns = self.get_columns(request, cl)
+        self.model_admin.log_export(request, [{'exported': {
+            'format': export_format,
+            'fields': list(columns),
+            'query': request.GET.urlencode(),
+        }}])
+
+        rows = self.get_rows(cl.queryset, columns)
+        stream = self.stream_csv(
+            columns, rows) if export_format == 'csv' else self.stream_ndjson(columns, rows)
+        response = StreamingHttpResponse(
+            stream, content_type=self.content_types[export_format])
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            cl.opts.model_name, export_format)
+        return response
+
+    def get_columns(self, request, cl):
+        """
+        Return the exported list_display columns mapped to their model field, or
+        to None if they aren't concrete fields.
+        """
+        exclude = self.model_admin.exclude or ()
+        columns = {}
+        for field_name in cl.list_display:
+            if field_name in exclude or field_name == 'action_checkbox' or not isinstance(field_name, str):
+                continue
+            try:
+                field = cl.opts.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            columns[field_name] = field if field is not None and field.concrete else None
+        return columns
+
+    def get_rows(self, queryset, columns):
+        """
+        Yield the values of the columns for every object, model fields give their
+        database value and only those are loaded when every column is a field.
+        """
+        chunk_size = self.model_admin.export_chunk_size
+        fields = list(columns.values())
+        if all(fields):
+            queryset = queryset.values_list(
+                *(field.attname for field in fields))
+            yield from queryset.iterator(chunk_size=chunk_size)
+            return
+
+        empty_value_display = self.model_admin.get_empty_value_display()
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            row = []
+            for field_name, field in columns.items():
+                if field is not None:
+                    row.append(getattr(obj, field.attname))
+                    continue
+                try:
+                    f, attr, value = lookup_field(
+                        field_name, obj, self.model_admin)
+                except ObjectDoesNotExist:
+                    value = empty_value_display
+                row.append(str(value) if isinstance(value, Model) else value)
+            yield row
+
+    def stream_csv(self, columns, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        yield from self.batch(
+            writer.writerow([self.format_csv_value(value) for value in row]) for row in rows)
+
+    def format_csv_value(self, value):
+        """
+        Return the csv cell of a value, text that a spreadsheet would run as a
+        formula is prefixed with a quote.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    def stream_ndjson(self, columns, rows):
+        yield from self.batch(
+            json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n' for row in rows)
+
+    def batch(self, lines):
+        """
+        Join the lines of every chunk of rows into one write.
+        """
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= self.model_admin.export_chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
@@ -7,6 +7,7 @@ from rest_framework.exceptions import NotFound
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 
+from django_api_admin.events import notify_model_changed
 from django_api_admin.utils.get_form_fields import get_form_fields
 from django_api_admin.openapi import CommonAPIResponses, APIResponseExamples
 from django_api_admin.serializers import FormFieldsSerializer
@@ -92,6 +93,9 @@ class HandleActionView(APIView):
 
             # if the action returns a response
             response = func(self.model_admin, request, queryset)
+            # actions may change the objects without sending model signals.
+            notify_model_changed(self.model_admin.model, using=queryset.db)
+            self.model_admin.admin_site.record_write(request)
 
             if response:
                 return response
@@ -20,6 +20,7 @@ class HistoryView(APIView):
     model_admin = None
 
     def get(self, request, object_id):
+        self.model_admin.admin_site.use_read_db(request)
         model = self.model_admin.model
         opts = model._meta
         obj = self.model_admin.get_object(request, unquote(object_id))
@@ -37,7 +38,8 @@ class HistoryView(APIView):
             raise PermissionDenied
 
         # Then get the history for this object.
-        action_list = LogEntry.objects.filter(
+        action_list = LogEntry.objects.using(
+            self.model_admin.admin_site.get_read_db(request, LogEntry)).filter(
             object_id=unquote(object_id),
             content_type=get_content_type_for_model(model)
         ).select_related().order_by('action_time')
@@ -2,10 +2,12 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework.reverse import reverse
 from rest_framework.response import Response
 
-from rest_framework.views import APIView
+from django_api_admin.renderers import ColumnarJSONRenderer
+from django_api_admin.utils.serialize_rows import serialize_rows
+from django_api_admin.utils.stream_json import StreamingJSONResponse
+from django_api_admin.utils.url_template import URL_PLACEHOLDER, format_url, get_url_template
 
 
 class ListView(APIView):
@@ -15,22 +17,63 @@ class ListView(APIView):
 
     serializer_class = None
     permission_classes = []
+    renderer_classes = [*APIView.renderer_classes, ColumnarJSONRenderer]
     model_admin = None
 
     def get(self, request):
-        queryset = self.model_admin.get_queryset()
+        self.model_admin.admin_site.use_read_db(request)
+        # only serialize and load the requested fields.
+        fields = self.model_admin.get_sparse_fields(request)
+        queryset = self.model_admin.get_sparse_queryset(
+            self.model_admin.get_queryset(request), fields)
+        stream = self.should_stream(request)
         page = self.model_admin.admin_site.paginate_queryset(
-            queryset, request, view=self)
-        serializer = self.serializer_class(page, many=True)
-        data = serializer.data
+            queryset, request, view=self, lazy=stream)
+        serializer_class = self.model_admin.get_sparse_serializer_class(
+            fields) if fields is not None else self.serializer_class
         info = (
             self.model_admin.admin_site.name,
             self.model_admin.model._meta.app_label,
             self.model_admin.model._meta.model_name
         )
-        pattern = '%s:%s_%s_detail'
+        template = get_url_template('%s:%s_%s_detail' % info, request)
+
+        if stream:
+            return StreamingJSONResponse(
+                self.iter_items(serializer_class(), page, template), status=status.HTTP_200_OK)
+
+        serializer = serializer_class(page, many=True)
 
+        if isinstance(request.accepted_renderer, ColumnarJSONRenderer):
+            columns, rows = serialize_rows(serializer.child, page)
+            return Response({
+                'columns': columns,
+                'rows': rows,
+                'url_templates': {'detail_url': template % URL_PLACEHOLDER},
+                'url_placeholder': URL_PLACEHOLDER,
+            }, status=status.HTTP_200_OK)
+
+        data = serializer.data
         for item in data:
-            item['detail_url'] = reverse(pattern % info, kwargs={
-                'object_id': item['pk']}, request=request)
+            item['detail_url'] = format_url(template, item['pk'])
         return Response(data, status=status.HTTP_200_OK)
+
+    def should_stream(self, request):
+        """
+        Return True if the requested page size is larger than the stream
+        threshold and plain json was negotiated.
+        """
+        threshold = self.model_admin.stream_threshold
+        if threshold is None or request.accepted_renderer.format != 'json':
+            return False
+        paginator = self.model_admin.admin_site.default_pagination_class()
+        return (paginator.get_page_size(request) or 0) > threshold
+
+    def iter_items(self, serializer, page, template):
+        """
+        Yield the serialized objects of the page, fetched in chunks.
+        """
+        for obj in page.iterator(chunk_size=self.model_admin.stream_chunk_size):
+            item = serializer.to_representation(obj)
+            item['detail_url'] = format_url(template, item['pk'])
+            yield item
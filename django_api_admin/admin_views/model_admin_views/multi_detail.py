@@ -0,0 +1,115 @@
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ParseError
+
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+
+from django_api_admin.constants.vars import FIELDS_VAR, TO_FIELD_VAR
+from django_api_admin.openapi import CommonAPIResponses
+from django_api_admin.utils.get_content_type_for_model import get_content_type_for_model
+from django_api_admin.utils.quote import unquote
+from django_api_admin.utils.url_template import format_url, get_url_template
+
+IDS_VAR = 'ids'
+
+
+class MultiDetailSchema(AutoSchema):
+    """
+    The path of the multi detail view is the path of the detail view without
+    the object id, its operation is a list to keep the operation ids apart.
+    """
+
+    def get_operation_id(self):
+        return '%s_list' % super().get_operation_id().removesuffix('_retrieve')
+
+
+class MultiDetailView(APIView):
+    """
+    GET many instances of this model at once using a comma separated list of
+    pks or to_field values, the instances are fetched with one query.
+    """
+    permission_classes = []
+    model_admin = None
+    schema = MultiDetailSchema()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(IDS_VAR, str, required=True,
+                             description=_('a comma separated list of object ids')),
+            OpenApiParameter(FIELDS_VAR, str,
+                             description=_('a comma separated list of the serialized fields')),
+            OpenApiParameter(TO_FIELD_VAR, str,
+                             description=_('the field the ids refer to')),
+        ],
+        responses={
+            200: OpenApiResponse(description=_("The found objects and the missing ids")),
+            403: CommonAPIResponses.permission_denied(),
+            401: CommonAPIResponses.unauthorized(),
+        }
+    )
+    def get(self, request):
+        self.model_admin.admin_site.use_read_db(request)
+        model_admin = self.model_admin
+        opts = model_admin.model._meta
+
+        # validate the reverse to field reference
+        to_field = request.query_params.get(TO_FIELD_VAR)
+        if to_field and not model_admin.to_field_allowed(to_field):
+            raise ParseError({'detail': _('The field %s cannot be referenced.') % to_field})
+        field = opts.get_field(to_field) if to_field else opts.pk
+
+        ids = self.get_ids(request, field)
+        fields = model_admin.get_sparse_fields(request)
+        serializer_class = model_admin.get_sparse_serializer_class(fields)
+        # in_bulk reads the referenced field of every object.
+        queryset = model_admin.get_sparse_queryset(
+            model_admin.get_queryset(request), fields, extra_fields=[field.name])
+        objs = queryset.in_bulk(ids, field_name=field.name) if ids else {}
+
+        found = [objs[object_id] for object_id in ids if object_id in objs]
+        results = serializer_class(found, many=True).data
+        urls = self.get_url_templates(request)
+        for item, obj in zip(results, found):
+            for name, template in urls.items():
+                item[name] = format_url(template, obj.pk)
+
+        return Response({
+            'results': results,
+            'missing': [object_id for object_id in ids if object_id not in objs],
+        }, status=status.HTTP_200_OK)
+
+    def get_ids(self, request, field):
+        """
+        Return the unique ids of the query string converted to python values of
+        the referenced field.
+        """
+        value = request.query_params.get(IDS_VAR, '')
+        ids = list(dict.fromkeys(
+            unquote(object_id.strip()) for object_id in value.split(',') if object_id.strip()))
+        if len(ids) > self.model_admin.list_max_show_all:
+            raise ParseError({'detail': _('at most %(count)s objects can be fetched at once') % {
+                'count': self.model_admin.list_max_show_all}})
+        try:
+            return list(dict.fromkeys(field.to_python(object_id) for object_id in ids))
+        except ValidationError as e:
+            raise ParseError({IDS_VAR: e.messages})
+
+    def get_url_templates(self, request):
+        """
+        Return the url templates of the admin urls added to every object.
+        """
+        admin_site = self.model_admin.admin_site
+        info = (admin_site.name, self.model_admin.opts.app_label,
+                self.model_admin.opts.model_name)
+        pattern = '%s:%s_%s_'
+        urls = {name + '_url': get_url_template((pattern + name) % info, request)
+                for name in ('detail', 'change', 'delete', 'history')}
+        if self.model_admin.view_on_site:
+            urls['view_on_site'] = get_url_template('%s:view_on_site' % admin_site.name, request, kwargs={
+                'content_type_id': get_content_type_for_model(self.model_admin.model).pk})
+        return urls
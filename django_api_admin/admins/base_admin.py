@@ -1,11 +1,16 @@
 import copy
 
 from django.contrib.auth import get_permission_codename
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
+from rest_framework.exceptions import ParseError
 from rest_framework.serializers import ModelSerializer
 
 from django_api_admin.checks import APIBaseModelAdminChecks
+from django_api_admin.constants.vars import FIELDS_VAR
+from django_api_admin.utils.trim_serializer import trim_serializer_class
 
 
 class BaseAPIModelAdmin:
@@ -38,8 +43,15 @@ class BaseAPIModelAdmin:
     sortable_by = None
     view_on_site = True
     show_full_result_count = True
+    # changelist and list pages that can hold more rows than this are streamed
+    # and their objects fetched in chunks, None disables streaming.
+    stream_threshold = 500
+    stream_chunk_size = 1000
     checks_class = APIBaseModelAdminChecks
 
+    def __init__(self):
+        self._sparse_serializer_classes = {}
+
     def check(self, **kwargs):
         return self.checks_class().check(self, **kwargs)
 
@@ -181,43 +193,121 @@ class BaseAPIModelAdmin:
     def get_queryset(self, request=None):
         """
         Return a QuerySet of all model instances that can be edited by the
-        admin site. This is used by get_changelist_view.
+        admin site. This is used by get_changelist_view. the queries of read
+        only views go to the read database of the admin site.
         """
         qs = self.model._default_manager.get_queryset()
+        using = self.admin_site.get_read_db(request, self.model)
+        if using is not None:
+            qs = qs.using(using)
         ordering = self.ordering or ()
         if ordering:
             qs = qs.order_by(*ordering)
         return qs
 
+    def get_sparse_fields(self, request):
+        """
+        Return the serializer fields requested with the fields query parameter,
+        or None if all of them are requested. raise ParseError for unknown fields.
+        """
+        value = request.query_params.get(FIELDS_VAR)
+        if not value:
+            return None
+        fields = tuple(dict.fromkeys(
+            field.strip() for field in value.split(',') if field.strip()))
+        allowed = self.get_serializer_class()().fields
+        unknown = [field for field in fields if field not in allowed]
+        if unknown:
+            raise ParseError({'detail': _('unknown fields %(fields)s') % {
+                'fields': ', '.join(unknown)}})
+        return fields
+
+    def get_sparse_queryset(self, queryset, fields, extra_fields=()):
+        """
+        Restrict the columns loaded by the queryset to the ones read by the
+        serializer of the fields and the ``extra_fields`` model fields read by
+        the view, unless some field reads more than a model field.
+        """
+        if fields is None:
+            return queryset
+        only = set(extra_fields)
+        for field in self.get_sparse_serializer_class(fields)().fields.values():
+            if field.source == 'pk':
+                continue
+            try:
+                model_field = self.opts.get_field(field.source)
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.concrete and not model_field.many_to_many:
+                only.add(model_field.name)
+            elif not (model_field.many_to_many or model_field.one_to_many or model_field.one_to_one):
+                # e.g. generic foreign keys read other columns.
+                return queryset
+        return queryset.only(self.opts.pk.name, *only)
+
+    def get_sparse_serializer_class(self, fields):
+        """
+        Return the admin serializer class restricted to the fields, the primary
+        key is always serialized. the classes are cached per set of fields.
+        """
+        if fields is None:
+            return self.get_serializer_class()
+        fields = ('pk', *(field for field in fields if field != 'pk'))
+        key = frozenset(fields)
+        if key not in self._sparse_serializer_classes:
+            self._sparse_serializer_classes[key] = trim_serializer_class(
+                self.get_serializer_class(), fields,
+                f'{self.model.__name__}SparseSerializer')
+        return self._sparse_serializer_classes[key]
+
+    def delete_model(self, request, obj):
+        """
+        Given a model instance delete it from the database.
+        """
+        obj.delete()
+
+    def delete_queryset(self, request, queryset):
+        """
+        Given a queryset, delete it from the database.
+        """
+        queryset.delete()
+
+    @cached_property
+    def permission_names(self):
+        """
+        Return a dict mapping add, change, delete and view to the full
+        "<app_label>.<codename>" permission names of this model.
+        """
+        return {
+            action: "%s.%s" % (self.opts.app_label, get_permission_codename(action, self.opts))
+            for action in ('add', 'change', 'delete', 'view')
+        }
+
     def has_add_permission(self, request):
-        opts = self.opts
-        codename = get_permission_codename('add', opts)
-        return request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        perms = self.admin_site.get_permission_snapshot(request)
+        return perms.has_perm(self.permission_names['add'])
 
     def has_change_permission(self, request):
-        opts = self.opts
-        codename = get_permission_codename('change', opts)
-        return request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        perms = self.admin_site.get_permission_snapshot(request)
+        return perms.has_perm(self.permission_names['change'])
 
     def has_delete_permission(self, request):
-        opts = self.opts
-        codename = get_permission_codename('delete', opts)
-        return request.user.has_perm("%s.%s" % (opts.app_label, codename))
+        perms = self.admin_site.get_permission_snapshot(request)
+        return perms.has_perm(self.permission_names['delete'])
 
     def has_view_permission(self, request):
-        opts = self.opts
-        codename_view = get_permission_codename('view', opts)
-        codename_change = get_permission_codename('change', opts)
+        perms = self.admin_site.get_permission_snapshot(request)
         return (
-            request.user.has_perm('%s.%s' % (opts.app_label, codename_view)) or
-            request.user.has_perm('%s.%s' % (opts.app_label, codename_change))
+            perms.has_perm(self.permission_names['view']) or
+            perms.has_perm(self.permission_names['change'])
         )
 
     def has_view_or_change_permission(self, request, obj=None):
         return self.has_view_permission(request) or self.has_change_permission(request)
 
     def has_module_permission(self, request):
-        return request.user.has_module_perms(self.opts.app_label)
+        perms = self.admin_site.get_permission_snapshot(request)
+        return perms.has_module_perms(self.opts.app_label)
 
     @property
     def is_inline(self):
@@ -36,13 +36,14 @@ class InlineAPIModelAdmin(BaseAPIModelAdmin):
         if self.verbose_name is None:
             self.verbose_name = self.opts.verbose_name
 
-    def get_object(self, request, object_id, from_field=None):
+    def get_object(self, request, object_id, from_field=None, fields=None):
         """
         Return an instance matching the field and value provided, the primary
         key is used if no field is provided. Return ``None`` if no match is
-        found or the object_id fails validation.
+        found or the object_id fails validation. only the columns of the
+        serializer fields are loaded if fields are provided.
         """
-        queryset = self.get_queryset(request)
+        queryset = self.get_sparse_queryset(self.get_queryset(request), fields)
         model = queryset.model
         field = (
             model._meta.pk if from_field is None else model._meta.get_field(
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import Paginator
 from django.db import models
@@ -5,17 +7,20 @@ from django.urls import include, path
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils.text import capfirst, smart_split, unescape_string_literal
+from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework.exceptions import ParseError
 
 from django_api_admin.filters import SimpleListFilter
 from django_api_admin.admins.base_admin import BaseAPIModelAdmin
 from django_api_admin.utils.get_content_type_for_model import get_content_type_for_model
 from django_api_admin.utils.lookup_spawns_duplicates import lookup_spawns_duplicates
 from django_api_admin.utils.model_format_dict import model_format_dict
+from django_api_admin.utils.trim_serializer import trim_serializer_class
 from django_api_admin.utils.url_params_from_lookup_dict import url_params_from_lookup_dict
 from django_api_admin.checks import APIModelAdminChecks
-from django_api_admin.constants.vars import LOOKUP_SEP
+from django_api_admin.constants.vars import COLUMNS_VAR, LOOKUP_SEP
 
 
 class APIModelAdmin(BaseAPIModelAdmin):
@@ -39,6 +44,7 @@ class APIModelAdmin(BaseAPIModelAdmin):
     save_on_top = False
     paginator = Paginator
     action_serializer = None
+    changelist_serializer_class = None
     preserve_filters = True
     inlines = ()
     actions = ()
@@ -46,6 +52,41 @@ class APIModelAdmin(BaseAPIModelAdmin):
     actions_on_bottom = False
     actions_selection_counter = True
     checks_class = APIModelAdminChecks
+    # seconds a changelist request waits on an identical in-flight count or page
+    # query before running its own, None disables request coalescing.
+    single_flight_timeout = 5
+    # seconds the changelist count, page and filter choices queries may run before
+    # they are interrupted and degraded, the counts are dropped, an empty page is
+    # returned with a refine_search flag and the filters are omitted. None runs
+    # them unbounded.
+    count_time_budget = None
+    page_time_budget = None
+    filter_choices_time_budget = None
+    # the field or admin method shown as the text of light autocomplete results,
+    # None uses str(obj), and the page size of those results.
+    autocomplete_display = None
+    autocomplete_limit = 20
+    # a django_api_admin.search.SearchBackend subclass replacing the default
+    # icontains search, e.g. SQLiteFTSSearchBackend.
+    search_backend = None
+    # formats of the changelist export and the rows fetched per database round trip.
+    export_formats = ('csv', 'ndjson')
+    export_chunk_size = 2000
+    # formats of the bulk import, the rows validated and saved per transaction and
+    # the number of row errors reported.
+    import_formats = ('csv', 'ndjson')
+    import_chunk_size = 500
+    import_max_errors = 1000
+    # the number of operations a batch request may contain.
+    batch_max_operations = 1000
+    # a timestamp field updated on every save (e.g. auto_now) used to find the
+    # changes returned by the changelist sync, None reads them from the admin log.
+    sync_field = None
+    # the sync reads again the changes this far behind its cursor, as sync_field
+    # time and as admin log ids, to catch the transactions that committed after
+    # later ones were synced. the changes already returned are skipped.
+    sync_overlap = timedelta(seconds=10)
+    sync_log_overlap = 100
 
     # these are the admin options used to customize the change list page interface
     # server-side customizations like list_select_related and actions are not included
@@ -67,6 +108,27 @@ class APIModelAdmin(BaseAPIModelAdmin):
         self.opts = model._meta
         self.admin_site = admin_site
         self.view_on_site = False if not self.admin_site.include_view_on_site_view else self.view_on_site
+        self._search_backend = self.search_backend(
+            self) if self.search_backend is not None else None
+        super().__init__()
+
+    def get_search_backend(self):
+        """
+        Return the search backend instance of this model admin or None.
+        """
+        return self._search_backend
+
+    def has_export_permission(self, request):
+        """
+        Return True if the user may export the changelist of this model.
+        """
+        return self.has_view_permission(request)
+
+    def has_import_permission(self, request):
+        """
+        Return True if the user may bulk import objects of this model.
+        """
+        return self.has_add_permission(request)
 
     def get_model_perms(self, request):
         """
@@ -120,14 +182,54 @@ class APIModelAdmin(BaseAPIModelAdmin):
 
         return inline_instances
 
-    def get_changelist_instance(self, request):
+    def get_changelist(self, request, **kwargs):
+        """
+        Return the ChangeList class for use on the changelist page.
+        """
+        from django_api_admin.changelist import ChangeList
+
+        return ChangeList
+
+    def get_changelist_serializer_class(self):
+        """
+        Return the serializer class validating the list_editable fields edited
+        on the changelist, the admin serializer restricted to those fields.
+        """
+        if self.changelist_serializer_class:
+            return self.changelist_serializer_class
+
+        self.changelist_serializer_class = trim_serializer_class(
+            self.get_serializer_class(), self.list_editable,
+            f'{self.model.__name__}ChangeListSerializer')
+        return self.changelist_serializer_class
+
+    def get_changelist_columns(self, request):
+        """
+        Return the list_display columns requested with the columns query
+        parameter, or None if all of them are requested. raise ParseError for
+        columns that aren't displayed.
+        """
+        value = request.query_params.get(COLUMNS_VAR)
+        if not value:
+            return None
+        columns = list(dict.fromkeys(
+            column.strip() for column in value.split(',') if column.strip()))
+        exclude = self.exclude or ()
+        allowed = [name for name in self.list_display if name not in exclude]
+        unknown = [column for column in columns if column not in allowed]
+        if unknown:
+            raise ParseError({'detail': _('unknown columns %(columns)s') % {
+                'columns': ', '.join(unknown)}})
+        return columns
+
+    def get_changelist_instance(self, request, changelist_class=None):
         """
         Return a `ChangeList` instance based on `request`. May raise
         `IncorrectLookupParameters`.
         """
-        from django_api_admin.changelist import ChangeList
+        ChangeList = changelist_class or self.get_changelist(request)
 
-        list_display = self.list_display
+        list_display = self.get_changelist_columns(request) or self.list_display
         list_display_links = self.get_list_display_links(list_display)
         # Add the action checkboxes if any actions are available.
         if self.get_actions(request):
@@ -150,13 +252,14 @@ class APIModelAdmin(BaseAPIModelAdmin):
             self.search_help_text
         )
 
-    def get_object(self, request, object_id, from_field=None):
+    def get_object(self, request, object_id, from_field=None, fields=None):
         """
         Return an instance matching the field and value provided, the primary
         key is used if no field is provided. Return ``None`` if no match is
-        found or the object_id fails validation.
+        found or the object_id fails validation. only the columns of the
+        serializer fields are loaded if fields are provided.
         """
-        queryset = self.get_queryset(request)
+        queryset = self.get_sparse_queryset(self.get_queryset(request), fields)
         model = queryset.model
         field = (
             model._meta.pk if from_field is None else model._meta.get_field(
@@ -305,8 +408,20 @@ class APIModelAdmin(BaseAPIModelAdmin):
                  name='%s_%s_list' % info),
             path(f'{prefix}/changelist/', self.get_changelist_view(),
                  name='%s_%s_changelist' % info),
+            path(f'{prefix}/changelist/edit/', self.get_changelist_edit_view(),
+                 name='%s_%s_changelist_edit' % info),
+            path(f'{prefix}/changelist/sync/', self.get_changelist_sync_view(),
+                 name='%s_%s_changelist_sync' % info),
             path(f'{prefix}/perform_action/', self.get_handle_action_view(),
                  name='%s_%s_perform_action' % info),
+            path(f'{prefix}/export/<str:export_format>/', self.get_export_view(),
+                 name='%s_%s_export' % info),
+            path(f'{prefix}/import/<str:import_format>/', self.get_import_view(),
+                 name='%s_%s_import' % info),
+            path(f'{prefix}/batch/', self.get_batch_view(),
+                 name='%s_%s_batch' % info),
+            path(f'{prefix}/detail/', self.get_multi_detail_view(),
+                 name='%s_%s_multi_detail' % info),
             path(f'{prefix}/add/', self.get_add_view(),
                  name='%s_%s_add' % info),
             path(f'{prefix}/<path:object_id>/detail/', self.get_detail_view(),
@@ -444,6 +559,69 @@ class APIModelAdmin(BaseAPIModelAdmin):
         }
         return ChangeListView.as_view(**defaults)
 
+    def get_changelist_edit_view(self):
+        from django_api_admin.admin_views.model_admin_views.changelist_edit import ChangeListEditView
+
+        defaults = {
+            'serializer_class': self.get_changelist_serializer_class(),
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return ChangeListEditView.as_view(**defaults)
+
+    def get_changelist_sync_view(self):
+        from django_api_admin.admin_views.model_admin_views.changelist_sync import ChangeListSyncView
+
+        defaults = {
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return ChangeListSyncView.as_view(**defaults)
+
+    def get_export_view(self):
+        from django_api_admin.admin_views.model_admin_views.export import ExportView
+
+        defaults = {
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return ExportView.as_view(**defaults)
+
+    def get_import_view(self):
+        from django_api_admin.admin_views.model_admin_views.bulk_import import ImportView
+
+        defaults = {
+            'serializer_class': self.get_serializer_class(),
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return ImportView.as_view(**defaults)
+
+    def get_batch_view(self):
+        from django_api_admin.admin_views.model_admin_views.batch import BatchView
+
+        defaults = {
+            'serializer_class': self.get_serializer_class(),
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return BatchView.as_view(**defaults)
+
+    def get_multi_detail_view(self):
+        from django_api_admin.admin_views.model_admin_views.multi_detail import MultiDetailView
+
+        defaults = {
+            'permission_classes': self.admin_site.default_permission_classes,
+            'authentication_classes': self.admin_site.authentication_classes,
+            'model_admin': self
+        }
+        return MultiDetailView.as_view(**defaults)
+
     def get_handle_action_view(self):
         from django_api_admin.admin_views.model_admin_views.handle_action import HandleActionView
 
@@ -470,6 +648,12 @@ class APIModelAdmin(BaseAPIModelAdmin):
         Return a tuple containing a queryset to implement the search
         and a boolean indicating if the results may contain duplicates.
         """
+        search_backend = self.get_search_backend()
+        if search_backend is not None and search_term and search_backend.supports(queryset.db):
+            results = search_backend.search(queryset, search_term)
+            if results is not None:
+                return results
+
         # Apply keyword searches.
         def construct_search(field_name):
             if field_name.startswith("^"):
@@ -575,6 +759,58 @@ class APIModelAdmin(BaseAPIModelAdmin):
             change_message=message,
         )
 
+    def log_export(self, request, message):
+        """
+        Log that the changelist objects were exported.
+
+        The default implementation creates an admin LogEntry object.
+        """
+        from django_api_admin.models import EXPORT, LogEntry
+
+        return LogEntry.objects.log_action(
+            user_id=request.user.pk,
+            content_type_id=get_content_type_for_model(self.model).pk,
+            object_id=None,
+            object_repr=str(self.opts.verbose_name_plural),
+            action_flag=EXPORT,
+            change_message=message,
+        )
+
+    def log_import(self, request, message):
+        """
+        Log that objects were bulk imported, with one entry per import.
+
+        The default implementation creates an admin LogEntry object.
+        """
+        from django_api_admin.models import ADDITION, LogEntry
+
+        return LogEntry.objects.log_action(
+            user_id=request.user.pk,
+            content_type_id=get_content_type_for_model(self.model).pk,
+            object_id=None,
+            object_repr=str(self.opts.verbose_name_plural),
+            action_flag=ADDITION,
+            change_message=message,
+        )
+
+    def log_actions(self, request, entries):
+        """
+        Log the changes of many objects at once, entries are
+        (obj, action_flag, message) tuples, the message of deletions is the
+        object_repr. Note that deletions must be logged before the deletion.
+
+        The default implementation creates admin LogEntry objects with one query.
+        """
+        from django_api_admin.models import DELETION, LogEntry
+
+        return LogEntry.objects.log_actions(
+            user_id=request.user.pk,
+            content_type_id=get_content_type_for_model(self.model).pk,
+            entries=[(obj.pk, message if action_flag == DELETION else str(obj),
+                      action_flag, '' if action_flag == DELETION else message)
+                     for obj, action_flag, message in entries],
+        )
+
     def log_deletion(self, request, obj, object_repr):
         """
         Log that an object will be deleted. Note that this method must be
@@ -16,6 +16,12 @@ class DjangoApiAdminConfig(AppConfig):
         checks.register(check_dependencies, checks.Tags.admin)
         checks.register(check_admin_app, checks.Tags.admin)
 
+        from django_api_admin.permissions import connect_permission_signals
+        connect_permission_signals()
+
+        from django_api_admin.events import connect_event_signals
+        connect_event_signals(self.get_model('LogEntry'))
+
 
 class DjangoApiAdminConfig(DjangoApiAdminConfig):
     """The default AppConfig for admin which does autodiscovery."""
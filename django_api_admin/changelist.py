@@ -1,19 +1,26 @@
+import copy
 from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, SuspiciousOperation
 from django.core.paginator import InvalidPage
-from django.db.models import Exists, F, Field, ManyToOneRel, OrderBy, OuterRef
+from django.db.models import Exists, F, Field, ManyToOneRel, OrderBy, OuterRef, QuerySet
 from django.utils.timezone import make_aware
 from django.utils.http import urlencode
 
-from django_api_admin.exceptions import DisallowedModelAdminLookup, IncorrectLookupParameters
+from rest_framework.settings import api_settings
+
+from django_api_admin.exceptions import (DisallowedModelAdminLookup, IncorrectLookupParameters,
+                                         QueryBudgetExceeded)
 from django_api_admin.filters import FieldListFilter
+from django_api_admin.search import SEARCH_RANK
 from django_api_admin.serializers import ChangeListSerializer
 from django_api_admin.utils.get_fields_from_path import get_fields_from_path
 from django_api_admin.utils.lookup_spawns_duplicates import lookup_spawns_duplicates
 from django_api_admin.utils.prepare_lookup_value import prepare_lookup_value
-from django_api_admin.constants.vars import TO_FIELD_VAR, IS_POPUP_VAR, ALL_VAR, ORDER_VAR, SEARCH_VAR, PAGE_VAR, ERROR_FLAG
+from django_api_admin.utils.query_budget import query_budget
+from django_api_admin.utils.single_flight import changelist_flights, queryset_flight_key
+from django_api_admin.constants.vars import TO_FIELD_VAR, IS_POPUP_VAR, ALL_VAR, ORDER_VAR, SEARCH_VAR, PAGE_VAR, ERROR_FLAG, COLUMNS_VAR, SYNC_TOKEN_VAR, PROFILE_VAR
 
 
 class ChangeList:
@@ -56,6 +63,10 @@ class ChangeList:
         self.preserved_filters = model_admin.get_preserved_filters(request)
         self.sortable_by = sortable_by
         self.search_help_text = search_help_text
+        # the changelist phases that ran out of time budget and were degraded, and
+        # whether the page was dropped so the search or filters should be narrowed.
+        self.degraded = []
+        self.refine_search = False
 
         search_serializer = self.serializer_class(data=request.GET)
         if not search_serializer.is_valid():
@@ -77,6 +88,9 @@ class ChangeList:
             del self.params[PAGE_VAR]
         if ERROR_FLAG in self.params:
             del self.params[ERROR_FLAG]
+        # don't profile the requests of the links of the changelist.
+        if PROFILE_VAR in self.params:
+            del self.params[PROFILE_VAR]
 
         self.root_queryset = model_admin.get_queryset(request)
         self.queryset = self.get_queryset(request)
@@ -97,7 +111,8 @@ class ChangeList:
         lookup_params = params.copy()  # a dictionary of the query string
         # Remove all the parameters that are globally and systematically
         # ignored.
-        for ignored in (ALL_VAR, ORDER_VAR, SEARCH_VAR, IS_POPUP_VAR, TO_FIELD_VAR):
+        for ignored in (ALL_VAR, ORDER_VAR, SEARCH_VAR, IS_POPUP_VAR, TO_FIELD_VAR, COLUMNS_VAR,
+                        SYNC_TOKEN_VAR, api_settings.URL_FORMAT_OVERRIDE):
             if ignored in lookup_params:
                 del lookup_params[ignored]
         return lookup_params
@@ -228,42 +243,109 @@ class ChangeList:
         return "?%s" % urlencode(sorted(p.items()))
 
     def get_results(self):
+        self.degraded = []
+        self.refine_search = False
         paginator = self.model_admin.get_paginator(
             self.queryset, self.list_per_page
         )
-        # Get the number of objects, with admin filters applied.
-        result_count = paginator.count
+        # Get the number of objects, with admin filters applied. the count is shared
+        # with concurrent identical requests and seeded into the paginator.
+        try:
+            with self.time_budget('count'):
+                result_count = self.coalesce(
+                    'count', self.queryset, lambda: paginator.count)
+            vars(paginator).setdefault('count', result_count)
+        except QueryBudgetExceeded:
+            result_count = None
+            self.degraded.append('count')
 
         # Get the total number of objects, with no admin filters applied.
+        full_result_count = None
         if self.model_admin.show_full_result_count:
-            full_result_count = self.root_queryset.count()
-        else:
-            full_result_count = None
-        can_show_all = result_count <= self.list_max_show_all
-        multi_page = result_count > self.list_per_page
+            try:
+                with self.time_budget('count'):
+                    full_result_count = self.coalesce(
+                        'count', self.root_queryset, self.root_queryset.count)
+            except QueryBudgetExceeded:
+                self.degraded.append('full_count')
 
         # Get the list of objects to display on this page.
-        if (self.show_all and can_show_all) or not multi_page:
-            result_list = self.queryset._clone()
+        if result_count is None:
+            # without a count the page is sliced, one more object tells whether
+            # there is a next page.
+            can_show_all = False
+            offset = (max(self.page_num, 1) - 1) * self.list_per_page
+            result_list = self.queryset[offset:offset + self.list_per_page + 1]
         else:
-            try:
-                result_list = paginator.page(self.page_num).object_list
-            except InvalidPage:
-                raise IncorrectLookupParameters
+            can_show_all = result_count <= self.list_max_show_all
+            multi_page = result_count > self.list_per_page
+            if (self.show_all and can_show_all) or not multi_page:
+                result_list = self.queryset._clone()
+            else:
+                try:
+                    result_list = paginator.page(self.page_num).object_list
+                except InvalidPage:
+                    raise IncorrectLookupParameters
+        try:
+            with self.time_budget('page'):
+                if result_count is None:
+                    result_list = list(result_list)
+                else:
+                    result_list = self.coalesce_page(result_list)
+                    # fetch the page within the budget.
+                    if self.model_admin.page_time_budget and isinstance(result_list, QuerySet):
+                        result_list = list(result_list)
+        except QueryBudgetExceeded:
+            result_list = []
+            self.degraded.append('page')
+            self.refine_search = True
+        if result_count is None:
+            multi_page = self.page_num > 1 or len(result_list) > self.list_per_page
+            result_list = result_list[:self.list_per_page]
 
         self.result_count = result_count
         self.show_full_result_count = self.model_admin.show_full_result_count
         # Admin actions are shown if there is at least one entry
         # or if entries are not counted because show_full_result_count is disabled
+        # or the count ran out of time.
         self.show_admin_actions = not self.show_full_result_count or bool(
             full_result_count
-        )
+        ) or 'full_count' in self.degraded
         self.full_result_count = full_result_count
         self.result_list = result_list
         self.can_show_all = can_show_all
         self.multi_page = multi_page
         self.paginator = paginator
 
+    def time_budget(self, phase):
+        """
+        Return a context manager interrupting the queries of the changelist
+        ``phase`` that run longer than its time budget on the model admin.
+        """
+        return query_budget(self.queryset.db, getattr(self.model_admin, '%s_time_budget' % phase))
+
+    def coalesce(self, kind, queryset, fn):
+        """
+        Return ``fn()`` sharing the result with concurrent requests running the same
+        ``kind`` of query on an identical queryset, see ``single_flight_timeout``.
+        """
+        timeout = self.model_admin.single_flight_timeout
+        key = queryset_flight_key(
+            kind, queryset) if timeout is not None else None
+        if key is None:
+            return fn()
+        return changelist_flights.do(key, fn, timeout)
+
+    def coalesce_page(self, queryset):
+        """
+        Fetch the objects of the current page once for all concurrent identical
+        requests, every request gets its own copies of the shared instances so
+        that changes made while serializing them don't leak to the others.
+        """
+        if self.model_admin.single_flight_timeout is None:
+            return queryset
+        return [copy.copy(obj) for obj in self.coalesce('page', queryset, lambda: list(queryset))]
+
     def get_ordering(self, queryset):
         """
         Return the list of ordering fields for the change list.
@@ -304,6 +386,10 @@ class ChangeList:
                 except (IndexError, ValueError):
                     continue  # Invalid ordering specified, skip it.
 
+        # Rank search results first unless an ordering was requested.
+        elif SEARCH_RANK in queryset.query.annotations:
+            ordering.insert(0, SEARCH_RANK)
+
         # Add the given query's ordering fields, if any.
         ordering.extend(queryset.query.order_by)
 
@@ -462,8 +548,38 @@ class ChangeList:
         if not qs.query.select_related:
             qs = self.apply_select_related(qs)
 
+        # only load the requested columns.
+        if COLUMNS_VAR in self.params:
+            qs = self.apply_only(qs)
+
         return qs
 
+    def apply_only(self, qs):
+        """
+        Restrict the loaded columns to the list_display fields, unless some
+        column isn't a model field and may read any attribute.
+        """
+        fields = set()
+        for field_name in self.list_display:
+            if field_name == 'action_checkbox':
+                continue
+            try:
+                field = self.opts.get_field(field_name)
+            except FieldDoesNotExist:
+                return qs
+            if not field.concrete or field.many_to_many:
+                return qs
+            fields.add(field.name)
+
+        # relations followed by select_related can't be deferred.
+        select_related = qs.query.select_related
+        if select_related is True:
+            fields.update(field.name for field in self.opts.concrete_fields
+                          if field.is_relation and not field.null)
+        elif select_related:
+            fields.update(select_related)
+        return qs.only(self.opts.pk.name, *fields)
+
     def apply_select_related(self, qs):
         if self.list_select_related is True:
             return qs.select_related()
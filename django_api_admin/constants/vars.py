@@ -1,5 +1,6 @@
 IS_POPUP_VAR = "_popup"
 TO_FIELD_VAR = "_to_field"
+FIELDS_VAR = "fields"
 LOOKUP_SEP = "__"
 
 HORIZONTAL, VERTICAL = 1, 2
@@ -10,3 +11,8 @@ ORDER_VAR = "o"
 PAGE_VAR = "p"
 SEARCH_VAR = "q"
 ERROR_FLAG = "e"
+COLUMNS_VAR = "columns"
+SYNC_TOKEN_VAR = "since"
+
+# profile a request, see APIAdminSite.enable_profiling
+PROFILE_VAR = "_profile"
@@ -0,0 +1,88 @@
+import time
+
+from django.core.cache import caches
+from django.db import router, transaction
+
+MODEL_VERSION_KEY = 'django_api_admin:model_version:%s'
+
+
+def get_model_versions(cache, labels):
+    """
+    Return a dict of the current versions stored in ``cache`` of the models with
+    the given "<app_label>.<model_name>" labels.
+    """
+    keys = {label: MODEL_VERSION_KEY % label for label in labels}
+    values = cache.get_many(keys.values())
+    versions = {}
+    for label, key in keys.items():
+        version = values.get(key)
+        if version is None:
+            # start from the current time so that an evicted version never
+            # goes back to a value a client has already seen.
+            version = cache.get_or_set(key, time.time_ns(), None)
+        versions[label] = version
+    return versions
+
+
+def bump_model_version(cache, label):
+    """
+    Mark the model with the label as changed in ``cache``.
+    """
+    key = MODEL_VERSION_KEY % label
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.get_or_set(key, time.time_ns(), None)
+
+
+def notify_model_changed(*models, using=None):
+    """
+    Bump the versions of the models in the caches used by the admin sites, for
+    changes that don't send model signals like bulk updates.
+
+    the versions are bumped once the transaction of the database ``using``
+    commits, so the waiting clients don't read the rows before the change and
+    rolled back changes aren't notified.
+    """
+    from django_api_admin.sites import all_sites
+
+    aliases = {getattr(site, 'events_cache_alias', None) for site in all_sites}
+    labels = {model._meta.label_lower for model in models}
+
+    def bump():
+        for alias in aliases - {None}:
+            for label in labels:
+                bump_model_version(caches[alias], label)
+
+    if using is None:
+        using = router.db_for_write(models[0])
+    transaction.on_commit(bump, using=using)
+
+
+def model_changed(sender=None, **kwargs):
+    """
+    Signal receiver bumping the version of saved, deleted and m2m changed models.
+    """
+    action = kwargs.get('action')
+    if action is not None:
+        if not action.startswith('post_'):
+            return
+        # m2m changes are sent by the through model, bump both sides.
+        models = [type(kwargs['instance']), kwargs['model']]
+    else:
+        models = [sender]
+    notify_model_changed(*models, using=kwargs.get('using'))
+
+
+def connect_event_signals(model):
+    """
+    Connect the receivers bumping the version of the model.
+    """
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    dispatch_uid = f'django_api_admin_model_changed_{model._meta.label_lower}'
+    post_save.connect(model_changed, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(model_changed, sender=model, dispatch_uid=dispatch_uid)
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(model_changed, sender=field.remote_field.through,
+                            dispatch_uid=f'{dispatch_uid}_{field.name}')
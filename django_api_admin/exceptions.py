@@ -29,3 +29,8 @@ class AlreadyRegistered(Exception):
 
 class NotRegistered(Exception):
     pass
+
+
+class QueryBudgetExceeded(Exception):
+    """A query ran longer than its time budget and was interrupted."""
+    pass
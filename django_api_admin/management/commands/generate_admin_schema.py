@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import get_resolver
+from django.utils import translation
+
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenApi3 schema of the admin API to a file that the admin site "
+        "schema view serves directly instead of generating it on each request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--site', dest='site', default=None,
+            help='Name of the admin site whose schema_path is written (default: every site with a schema_path).',
+        )
+        parser.add_argument(
+            '--file', dest='file', default=None,
+            help='Write the schema to this path instead of the schema_path of the site.',
+        )
+        parser.add_argument(
+            '--format', dest='format', choices=['openapi', 'openapi-json'], default=None,
+            help='Output format, defaults to json for .json files and yaml otherwise.',
+        )
+        parser.add_argument(
+            '--lang', dest='lang', default=None,
+            help='Language code used to translate the schema.',
+        )
+
+    def handle(self, *args, **options):
+        from django_api_admin.sites import all_sites
+
+        # load the url configuration so that the admin sites build their urls.
+        get_resolver().url_patterns
+
+        sites = [site for site in all_sites
+                 if options['site'] in (None, site.name)]
+        if options['site'] and not sites:
+            raise CommandError(f"no admin site named {options['site']}")
+
+        paths = [options['file']] if options['file'] else [
+            site.schema_path for site in sites if site.schema_path]
+        if not paths:
+            raise CommandError(
+                'pass --file or set schema_path on the admin site')
+
+        generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+        if options['lang']:
+            with translation.override(options['lang']):
+                schema = generator.get_schema(request=None, public=True)
+        else:
+            schema = generator.get_schema(request=None, public=True)
+
+        for path in dict.fromkeys(paths):
+            output_format = options['format'] or (
+                'openapi-json' if str(path).endswith('.json') else 'openapi')
+            renderer = OpenApiJsonRenderer() if output_format == 'openapi-json' else OpenApiYamlRenderer()
+            with open(path, 'wb') as f:
+                f.write(renderer.render(schema, renderer_context={}))
+            self.stdout.write(f'wrote the admin schema to {path}')
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the indexes of the model admins that use a search backend, e.g. "
+        "after bulk updates that don't send model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='Only rebuild the indexes of these models.',
+        )
+        parser.add_argument(
+            '--site', dest='site', default=None,
+            help='Name of the admin site whose model admins are indexed (default: every site).',
+        )
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Nominates the database to index. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args, **options):
+        from django_api_admin.sites import all_sites
+
+        sites = [site for site in all_sites
+                 if options['site'] in (None, site.name)]
+        if options['site'] and not sites:
+            raise CommandError(f"no admin site named {options['site']}")
+
+        labels = {label.lower() for label in options['models']}
+        rebuilt = set()
+        for site in sites:
+            for model, model_admin in site._registry.items():
+                search_backend = model_admin.get_search_backend()
+                if search_backend is None or (labels and model._meta.label_lower not in labels):
+                    continue
+                count = search_backend.rebuild(options['database'])
+                rebuilt.add(model._meta.label_lower)
+                self.stdout.write(
+                    f'indexed {count} {model._meta.verbose_name_plural} of {site.name}')
+
+        if labels - rebuilt:
+            raise CommandError('no search backend is configured for %s' % ', '.join(
+                sorted(labels - rebuilt)))
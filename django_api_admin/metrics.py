@@ -0,0 +1,297 @@
+import glob
+import json
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.db import connections
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+REQUESTS = 'django_api_admin_requests_total'
+REQUEST_DURATION = 'django_api_admin_request_duration_seconds'
+REQUEST_QUERIES = 'django_api_admin_request_queries'
+REQUEST_SQL_DURATION = 'django_api_admin_request_sql_duration_seconds'
+RESPONSE_SIZE = 'django_api_admin_response_size_bytes'
+CACHE_LOOKUPS = 'django_api_admin_cache_lookups_total'
+
+# name -> (type, help, buckets) of the metrics in the order they are exposed.
+METRICS = {
+    REQUESTS: ('counter', 'Requests handled by the admin views.', None),
+    REQUEST_DURATION: ('histogram', 'Time spent in the admin views.', DURATION_BUCKETS),
+    REQUEST_QUERIES: ('histogram', 'SQL queries run by a request.', QUERY_BUCKETS),
+    REQUEST_SQL_DURATION: ('histogram', 'Time spent running the SQL queries of a request.',
+                           DURATION_BUCKETS),
+    RESPONSE_SIZE: ('histogram', 'Size of the response bodies.', SIZE_BUCKETS),
+    CACHE_LOOKUPS: ('counter', 'Lookups in the caches of the admin by result.', None),
+}
+
+# the registry and labels of the request being tracked, used by record_cache_lookup.
+_current_request = ContextVar('django_api_admin_metrics_request', default=None)
+
+# the registries of the process, reset in forked children.
+_registries = weakref.WeakSet()
+
+
+def _reset_registries():
+    # don't count the metrics of the parent process twice.
+    for registry in list(_registries):
+        registry.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_registries)
+
+
+class _ShardOwner:
+    """
+    Held by the thread local of a registry to find when its thread exits.
+    """
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms recorded in process without locks, every thread
+    updates its own shard and the shards are summed when the metrics are
+    collected. the shard of a thread is folded into the totals when it exits.
+
+    with a ``directory`` every process writes its metrics to a file there at
+    most every ``flush_interval`` seconds and the metrics of all the files are
+    collected, so a scrape of any worker returns the totals of the server. the
+    directory should be emptied when the server starts.
+    """
+
+    def __init__(self, name, directory=None, flush_interval=10):
+        self.name = name
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.reset()
+        _registries.add(self)
+
+    def reset(self):
+        self._local = threading.local()
+        # the shards of the running threads by id, the shards of the threads
+        # that exited are folded into the totals.
+        self._shards = {}
+        self._totals = {}
+        # only taken when a thread creates or retires its shard and when collecting.
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._next_flush = 0
+
+    def get_shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # the thread local values are released when the thread exits.
+            self._local.owner = _ShardOwner()
+            weakref.finalize(self._local.owner, self.retire_shard, shard).atexit = False
+            with self._lock:
+                self._shards[id(shard)] = shard
+        return shard
+
+    def retire_shard(self, shard):
+        """
+        Fold the shard of an exited thread into the totals, keeping the number
+        of shards to the number of running threads.
+        """
+        with self._lock:
+            # the shards created before a reset are dropped.
+            if self._shards.get(id(shard)) is shard:
+                del self._shards[id(shard)]
+                merge(self._totals, shard.items())
+
+    def inc(self, name, labels, value=1):
+        shard = self.get_shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        """
+        Add the value to the histogram, the buckets aren't cumulative until
+        the metrics are exposed and the last item is the sum of the values.
+        """
+        shard = self.get_shard()
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        data = shard.get(key)
+        if data is None:
+            data = shard[key] = [0] * (len(buckets) + 2)
+        data[bisect_left(buckets, value)] += 1
+        data[-1] += value
+
+    def snapshot(self):
+        """
+        Return the sum of the shards of this process.
+        """
+        totals = {}
+        with self._lock:
+            shards = list(self._shards.values())
+            merge(totals, self._totals.items())
+        for shard in shards:
+            merge(totals, dict(shard).items())
+        return totals
+
+    def get_path(self):
+        return os.path.join(self.directory, f'django_api_admin-{self.name}-{os.getpid()}.json')
+
+    def maybe_flush(self):
+        if self.directory is None or time.monotonic() < self._next_flush:
+            return
+        if self._flush_lock.acquire(blocking=False):
+            try:
+                self.flush()
+            finally:
+                self._flush_lock.release()
+
+    def flush(self):
+        """
+        Write the metrics of this process to its file in the directory.
+        """
+        self._next_flush = time.monotonic() + self.flush_interval
+        path = self.get_path()
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump([[name, [list(label) for label in labels], value]
+                       for (name, labels), value in self.snapshot().items()], f)
+        os.replace(temp_path, path)
+
+    def collect(self):
+        """
+        Return the metrics of this process, or of all the processes writing
+        to the directory.
+        """
+        if self.directory is None:
+            return self.snapshot()
+        self.flush()
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory, f'django_api_admin-{self.name}-*.json')):
+            try:
+                with open(path) as f:
+                    items = json.load(f)
+            except (OSError, ValueError):
+                # e.g. removed since it was listed.
+                continue
+            merge(totals, (((name, tuple(tuple(label) for label in labels)), value)
+                           for name, labels, value in items))
+        return totals
+
+    def render(self):
+        """
+        Return the metrics in the prometheus text exposition format.
+        """
+        metrics = {}
+        for (name, labels), value in self.collect().items():
+            metrics.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(metrics.get(name, [])):
+                if kind == 'counter':
+                    lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                    continue
+                count = 0
+                for bound, bucket in zip((*buckets, '+Inf'), value[:-1]):
+                    count += bucket
+                    lines.append(f'{name}_bucket{format_labels((*labels, ("le", bound)))} {count}')
+                lines.append(f'{name}_sum{format_labels(labels)} {format_value(value[-1])}')
+                lines.append(f'{name}_count{format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def merge(totals, items):
+    for key, value in items:
+        if isinstance(value, list):
+            total = totals.get(key)
+            totals[key] = list(value) if total is None else [
+                a + b for a, b in zip(total, value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n')) for name, value in labels)
+
+
+def format_value(value):
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def track_view(admin_site, model, view, request, *args, **kwargs):
+    """
+    Call the view and record the request count, duration, sql queries and
+    response size in the metrics of the site labeled by url name and model.
+    """
+    registry = admin_site.metrics
+    resolver_match = getattr(request, 'resolver_match', None)
+    labels = (('site', admin_site.name),
+              ('url_name', (resolver_match.url_name or '') if resolver_match else ''),
+              ('model', model))
+    sql = [0, 0]
+
+    def record_query(execute, query, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(query, params, many, context)
+        finally:
+            sql[0] += 1
+            sql[1] += time.perf_counter() - start
+
+    token = _current_request.set((registry, labels))
+    start = time.perf_counter()
+    status = 500
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            response = view(request, *args, **kwargs)
+            # count the rendering of the response.
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+        status = response.status_code
+    finally:
+        _current_request.reset(token)
+        registry.inc(REQUESTS, (*labels, ('method', request.method), ('status', str(status))))
+        registry.observe(REQUEST_DURATION, labels, time.perf_counter() - start)
+        registry.observe(REQUEST_QUERIES, labels, sql[0])
+        registry.observe(REQUEST_SQL_DURATION, labels, sql[1])
+
+    if response.streaming:
+        response.streaming_content = iter_counted(
+            response.streaming_content, lambda size: registry.observe(RESPONSE_SIZE, labels, size))
+    else:
+        registry.observe(RESPONSE_SIZE, labels, len(response.content))
+    registry.maybe_flush()
+    return response
+
+
+def iter_counted(content, done):
+    size = 0
+    try:
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+def record_cache_lookup(cache, hit):
+    """
+    Count a hit or a miss of the named cache in the metrics of the request
+    being handled, if any.
+    """
+    current = _current_request.get()
+    if current is not None:
+        registry, labels = current
+        registry.inc(CACHE_LOOKUPS, (*labels, ('cache', cache), ('result', 'hit' if hit else 'miss')))
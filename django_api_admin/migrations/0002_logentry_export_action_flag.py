@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_api_admin', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='logentry',
+            name='action_flag',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Addition'), (2, 'Change'), (3, 'Deletion'), (4, 'Export')], verbose_name='action flag'),
+        ),
+    ]
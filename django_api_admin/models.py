@@ -14,11 +14,13 @@ from django_api_admin.utils.quote import quote
 ADDITION = 1
 CHANGE = 2
 DELETION = 3
+EXPORT = 4
 
 ACTION_FLAG_CHOICES = [
     (ADDITION, _("Addition")),
     (CHANGE, _("Change")),
     (DELETION, _("Deletion")),
+    (EXPORT, _("Export")),
 ]
 
 
@@ -45,6 +47,31 @@ class LogEntryManager(models.Manager):
             change_message=change_message,
         )
 
+    def log_actions(self, user_id, content_type_id, entries):
+        """
+        Create the entries of many objects with one query, entries are
+        (object_id, object_repr, action_flag, change_message) tuples.
+        """
+        return self.model.objects.bulk_create([
+            self.model(
+                user_id=user_id,
+                content_type_id=content_type_id,
+                object_id=str(object_id),
+                object_repr=object_repr[:200],
+                action_flag=action_flag,
+                change_message=json.dumps(change_message) if isinstance(
+                    change_message, list) else change_message,
+            )
+            for object_id, object_repr, action_flag, change_message in entries
+        ])
+
+    def bulk_create(self, *args, **kwargs):
+        from django_api_admin.events import notify_model_changed
+
+        objs = super().bulk_create(*args, **kwargs)
+        notify_model_changed(self.model, using=self.db)
+        return objs
+
 
 class LogEntry(models.Model):
     action_time = models.DateTimeField(
@@ -97,6 +124,8 @@ class LogEntry(models.Model):
             }
         elif self.is_deletion():
             return gettext("Deleted “%(object)s.”") % {"object": self.object_repr}
+        elif self.is_export():
+            return gettext("Exported “%(object)s”.") % {"object": self.object_repr}
 
         return gettext("LogEntry Object")
 
@@ -109,6 +138,9 @@ class LogEntry(models.Model):
     def is_deletion(self):
         return self.action_flag == DELETION
 
+    def is_export(self):
+        return self.action_flag == EXPORT
+
     def get_change_message(self):
         """
         If self.change_message is a JSON structure, interpret it as a change
@@ -168,6 +200,20 @@ class LogEntry(models.Model):
                         )
                     )
 
+                elif "imported" in sub_message:
+                    messages.append(
+                        gettext("Imported {created} of {rows} rows from {format}.").format(
+                            **sub_message["imported"]
+                        )
+                    )
+
+                elif "exported" in sub_message:
+                    messages.append(
+                        gettext("Exported as {format}.").format(
+                            **sub_message["exported"]
+                        )
+                    )
+
             change_message = " ".join(
                 msg[0].upper() + msg[1:] for msg in messages)
             return change_message or gettext("No fields changed.")
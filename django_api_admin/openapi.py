@@ -39,6 +39,7 @@ ChangeList = {
         'preserve_filters': True,
         'full_count': 1,
         'result_count': 1,
+        'multi_page': False,
         'action_choices': [
             ['delete_selected', 'Delete selected authors'],
             ['make_old', 'make all authors old'],
@@ -89,7 +90,9 @@ ChangeList = {
                     'trim_whitespace': True
                 }
             }
-        }
+        },
+        'degraded': [],
+        'refine_search': False
     },
     'columns': [
         {'field': 'name', 'headerName': 'name'},
@@ -1,9 +1,36 @@
+from django.core.paginator import InvalidPage
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from math import ceil
 from django_api_admin.constants.vars import PAGE_VAR
 
 
-class AdminResultsListPagination(PageNumberPagination):
+class LazyPaginationMixin:
+    """
+    Adds a lazy mode to paginate_queryset, returning the queryset of the page
+    instead of a list of its objects so that they can be streamed.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None, lazy=False):
+        if not lazy:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)))
+        return self.page.object_list
+
+
+class AdminResultsListPagination(LazyPaginationMixin, PageNumberPagination):
     page_size_query_param = 'page_size'
     page_query_param = PAGE_VAR
 
@@ -18,7 +45,7 @@ class AdminResultsListPagination(PageNumberPagination):
         return len(list_of_items)
 
 
-class AdminLogPagination(PageNumberPagination):
+class AdminLogPagination(LazyPaginationMixin, PageNumberPagination):
     page_size = 8
     page_size_query_param = 'page_size'
     page_query_param = PAGE_VAR
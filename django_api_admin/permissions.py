@@ -1,10 +1,154 @@
+import time
+
+from django.core.cache import caches
+
 from rest_framework import permissions
 
+from django_api_admin.metrics import record_cache_lookup
+
+PERMISSIONS_VERSION_KEY = 'django_api_admin:permissions_version'
+USER_FLAGS = frozenset(('is_active', 'is_staff', 'is_superuser'))
+
 
 class IsAdminUser(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        return self.is_superuser(request)
+        return self.is_superuser(request, view)
+
+    def is_superuser(self, request, view=None):
+        admin_site = getattr(view, 'admin_site', None) or getattr(
+            getattr(view, 'model_admin', None), 'admin_site', None)
+        if admin_site is None:
+            return bool(request.user and request.user.is_authenticated and request.user.is_staff and request.user.is_active)
+
+        # build the snapshot the model admin permission checks of this request use.
+        perms = admin_site.get_permission_snapshot(request)
+        return bool(request.user and request.user.is_authenticated and perms.is_staff and perms.is_active)
+
+
+class PermissionSnapshot:
+    """
+    The permissions of a user computed once and answered with set lookups, so
+    checking every registered model admin doesn't rebuild permission names and
+    walk the authentication backends on each call.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.is_active = bool(user and user.is_active)
+        self.is_staff = self.is_active and user.is_staff
+        self.is_superuser = self.is_active and user.is_superuser
+        if self.is_active and not self.is_superuser:
+            self.perms = frozenset(self.get_all_permissions(user))
+        else:
+            self.perms = frozenset()
+        self.app_labels = frozenset(perm[:perm.index('.')]
+                                    for perm in self.perms)
+
+    def get_all_permissions(self, user):
+        """
+        Return the "<app_label>.<codename>" names of all the user permissions.
+        """
+        return user.get_all_permissions()
+
+    def has_perm(self, perm):
+        return self.is_superuser or perm in self.perms
+
+    def has_perms(self, perm_list):
+        return all(self.has_perm(perm) for perm in perm_list)
+
+    def has_module_perms(self, app_label):
+        return self.is_superuser or app_label in self.app_labels
+
+
+class CachedPermissionSnapshot(PermissionSnapshot):
+    """
+    A PermissionSnapshot sharing the user permission set across requests and workers
+    through the cache framework. entries are keyed by the user id and a permissions
+    version that is bumped whenever user, group or permission assignments change.
+    """
+    cache_alias = 'default'
+    timeout = 300
+    key_prefix = 'django_api_admin:permissions'
+
+    def get_all_permissions(self, user):
+        if user.pk is None:
+            return super().get_all_permissions(user)
+
+        cache = caches[self.cache_alias]
+        key = '%s:%s:%s' % (self.key_prefix, user.pk,
+                            get_permissions_version(cache))
+        perms = cache.get(key)
+        record_cache_lookup('permissions', perms is not None)
+        if perms is None:
+            perms = frozenset(super().get_all_permissions(user))
+            cache.set(key, perms, self.timeout)
+        return perms
+
+
+def get_permissions_version(cache):
+    """
+    Return the current permissions version stored in ``cache``.
+    """
+    # start from the current time so that an evicted version never resurrects
+    # entries cached under an older one.
+    return cache.get_or_set(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+
+
+def bump_permissions_version(cache):
+    """
+    Invalidate every user permission set cached in ``cache``.
+    """
+    try:
+        cache.incr(PERMISSIONS_VERSION_KEY)
+    except ValueError:
+        get_permissions_version(cache)
+
+
+def invalidate_permission_caches(sender=None, **kwargs):
+    """
+    Signal receiver bumping the permissions version of the caches used by the
+    admin sites when user, group or permission assignments change.
+    """
+    from django_api_admin.sites import all_sites
+
+    action = kwargs.get('action')
+    if action is not None and not action.startswith('post_'):
+        return
+    # new users have nothing cached yet, and saves that don't touch the user
+    # flags (e.g. last_login updates) don't change permissions.
+    update_fields = kwargs.get('update_fields')
+    if kwargs.get('created') or (update_fields and USER_FLAGS.isdisjoint(update_fields)):
+        return
+
+    aliases = {
+        getattr(site.permission_snapshot_class, 'cache_alias', None) for site in all_sites
+    }
+    for alias in aliases - {None}:
+        bump_permissions_version(caches[alias])
+
+
+def connect_permission_signals():
+    """
+    Connect the receivers invalidating the cached permission sets.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group, Permission
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    UserModel = get_user_model()
+    dispatch_uid = 'django_api_admin_invalidate_permissions'
 
-    def is_superuser(self, request):
-        return bool(request.user and request.user.is_authenticated and request.user.is_staff and request.user.is_active)
+    for field_name in ('user_permissions', 'groups'):
+        field = getattr(UserModel, field_name, None)
+        if field is not None:
+            m2m_changed.connect(invalidate_permission_caches, sender=field.through,
+                                dispatch_uid=f'{dispatch_uid}_{field_name}')
+    m2m_changed.connect(invalidate_permission_caches, sender=Group.permissions.through,
+                        dispatch_uid=f'{dispatch_uid}_group_permissions')
+    post_save.connect(invalidate_permission_caches, sender=UserModel,
+                      dispatch_uid=f'{dispatch_uid}_user')
+    post_delete.connect(invalidate_permission_caches, sender=Group,
+                        dispatch_uid=f'{dispatch_uid}_group')
+    post_delete.connect(invalidate_permission_caches, sender=Permission,
+                        dispatch_uid=f'{dispatch_uid}_permission')
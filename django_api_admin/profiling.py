@@ -0,0 +1,185 @@
+import cProfile
+import pstats
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.http import HttpResponse
+from django.utils import timezone
+
+PROFILE_MODES = ('cprofile', 'collapsed')
+PROFILE_HEADER = 'X-Admin-Profile'
+PROFILE_ID_HEADER = 'X-Admin-Profile-Id'
+
+# stacks under this many seconds are left out of the collapsed output.
+COLLAPSED_MIN_TIME = 1e-6
+
+
+class RequestProfiler:
+    """
+    Profiles the code run by a request with cProfile and records the sql queries
+    run on every database connection with their durations.
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.profile = cProfile.Profile()
+        self.queries = []
+        self.duration = 0
+
+    @contextmanager
+    def run(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.record_query))
+            start = time.perf_counter()
+            try:
+                self.profile.enable()
+                enabled = True
+            except ValueError:
+                # another profiler is active, python 3.12+ only allows one at a
+                # time, the queries are still recorded.
+                enabled = False
+            try:
+                yield
+            finally:
+                if enabled:
+                    self.profile.disable()
+                self.duration += time.perf_counter() - start
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'database': context['connection'].alias,
+                'sql': sql,
+                'many': many,
+                'duration': time.perf_counter() - start,
+            })
+
+    def get_report(self, request, response, function_limit):
+        """
+        Return the report of the profiled request, the functions with the most
+        cumulative time, the sql queries and the collapsed call stacks.
+        """
+        stats = pstats.Stats(self.profile).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        resolver_match = getattr(request, 'resolver_match', None)
+        user = getattr(request, 'user', None)
+        return {
+            'id': self.id,
+            'created': timezone.now(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'url_name': resolver_match.url_name if resolver_match else None,
+            'user': user.get_username() if user is not None and user.is_authenticated else None,
+            'status': response.status_code,
+            'duration': self.duration,
+            'query_count': len(self.queries),
+            'query_time': sum(query['duration'] for query in self.queries),
+            'functions': [{
+                'function': format_function(func),
+                'calls': calls,
+                'primitive_calls': primitive_calls,
+                'total_time': total_time,
+                'cumulative_time': cumulative_time,
+            } for func, (primitive_calls, calls, total_time, cumulative_time, callers)
+                in functions[:function_limit]],
+            'queries': self.queries,
+            'collapsed': collapse_stats(stats),
+        }
+
+
+def format_function(func):
+    filename, lineno, name = func
+    # built-in functions have no file.
+    if filename != '~':
+        name = '%s:%d(%s)' % (filename, lineno, name)
+    # the frames of a collapsed stack are separated by semicolons.
+    return name.replace(';', ',')
+
+
+def collapse_stats(stats):
+    """
+    Return the profiled call stacks in the collapsed format read by flamegraph
+    tools, a "frame;frame;frame microseconds" line per stack.
+
+    cProfile only records the callers of every function, so the time of a
+    function is split between its callers in proportion to the time it spent
+    under each of them. recursive calls are cut at the first repeated frame.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, caller_stats in callers.items():
+            # the cumulative time of the function when called by the caller.
+            callees[caller][func] = caller_stats[3]
+
+    lines = Counter()
+
+    def walk(func, stack, share):
+        _, _, total_time, _, _ = stats[func]
+        stack = (*stack, func)
+        if total_time * share >= COLLAPSED_MIN_TIME:
+            lines[';'.join(format_function(frame) for frame in stack)] += total_time * share
+        for callee, callee_time in callees[func].items():
+            cumulative_time = stats[callee][3]
+            if callee in stack or not cumulative_time or \
+                    callee_time * share < COLLAPSED_MIN_TIME:
+                continue
+            walk(callee, stack, min(share * callee_time / cumulative_time, 1))
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not any(caller in stats for caller in callers):
+            walk(func, (), 1)
+
+    return ''.join('%s %d\n' % (stack, round(seconds * 1e6))
+                   for stack, seconds in lines.items() if round(seconds * 1e6))
+
+
+def profile_view(admin_site, mode, view, request, *args, **kwargs):
+    """
+    Call the view under a RequestProfiler and add the report to the profiles of
+    the site, the report id is sent in a header. the collapsed call stacks
+    replace the response in the collapsed mode, otherwise streamed responses
+    are profiled until they are closed.
+    """
+    profiler = RequestProfiler()
+    with profiler.run():
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        if response.streaming and mode == 'collapsed':
+            for chunk in response.streaming_content:
+                pass
+
+    def finish():
+        report = profiler.get_report(request, response, admin_site.profile_function_limit)
+        admin_site.add_profile(report)
+        return report
+
+    if response.streaming and mode != 'collapsed':
+        response.streaming_content = iter_profiled(profiler, response.streaming_content, finish)
+    else:
+        report = finish()
+        if mode == 'collapsed':
+            response = HttpResponse(report['collapsed'], content_type='text/plain; charset=utf-8')
+    response[PROFILE_ID_HEADER] = profiler.id
+    return response
+
+
+def iter_profiled(profiler, content, finish):
+    iterator = iter(content)
+    try:
+        while True:
+            with profiler.run():
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+            yield chunk
+    finally:
+        finish()
@@ -0,0 +1,66 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renders the compact columnar responses of the changelist and list views,
+    selected with ?format=columnar or the media type in the Accept header.
+    the column names are sent once and every row is an array of values in the
+    order of the columns, object urls are sent once as url templates.
+    """
+    media_type = 'application/vnd.django-api-admin.columnar+json'
+    format = 'columnar'
+    compact = True
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets clients ask for the server-sent events of the events view with the
+    text/event-stream media type, the events are written by the view itself.
+    errors are rendered as a single error event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ('event: error\ndata: %s\n\n' % json.dumps(data, cls=encoders.JSONEncoder)).encode()
+
+
+class CollapsedStackRenderer(BaseRenderer):
+    """
+    Renders the call stacks of a profile report in the collapsed format read by
+    flamegraph tools, selected with ?format=collapsed.
+    """
+    media_type = 'text/plain'
+    format = 'collapsed'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict) and 'collapsed' in data:
+            return data['collapsed'].encode()
+        return json.dumps(data, cls=encoders.JSONEncoder).encode()
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Renders the metrics of the metrics view in the prometheus text exposition
+    format, errors are rendered as a comment.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, str):
+            return data.encode()
+        return ('# %s\n' % json.dumps(data, cls=encoders.JSONEncoder)).encode()
@@ -0,0 +1,582 @@
+"""
+search backends of APIModelAdmin.get_search_results.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import connections, models, router, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate,
+                                      post_save, pre_delete)
+from django.utils.text import smart_split, unescape_string_literal
+
+from django_api_admin.constants.vars import LOOKUP_SEP
+from django_api_admin.utils.lookup_spawns_duplicates import lookup_spawns_duplicates
+
+# name of the annotation holding the relevance of the searched objects, lower
+# values rank first.
+SEARCH_RANK = '_search_rank'
+
+
+def get_search_terms(search_term):
+    """
+    Return the words of a search term the way the default search splits them.
+    """
+    terms = []
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit.strip():
+            terms.append(bit)
+    return terms
+
+
+class SearchBackend:
+    """
+    Base class of the model admin search backends, set the search_backend of a
+    model admin to a subclass to replace the default icontains search.
+    """
+
+    def __init__(self, model_admin):
+        self.model_admin = model_admin
+        self.model = model_admin.model
+
+    def supports(self, using):
+        """
+        Return True if the backend can search the database ``using``, otherwise
+        the model admin falls back to the default search.
+        """
+        return True
+
+    def search(self, queryset, search_term):
+        """
+        Return the queryset filtered by the search term and whether it may have
+        duplicates, or None to fall back to the default search.
+        """
+        raise NotImplementedError(
+            'subclasses of SearchBackend must provide a search() method')
+
+    def rebuild(self, using=None):
+        """
+        Rebuild the index of the backend and return the number of indexed objects.
+        """
+        return 0
+
+
+class IndexedSearchBackend(SearchBackend):
+    """
+    Base class of the backends indexing the values of the search fields, the
+    index is kept in sync through the model signals of the model and of the
+    models its search fields span, the bulk writes of the admin views are
+    reindexed with update_search_index. other writes that bypass the signals,
+    e.g. queryset.update(), need the rebuild_search_index command.
+    """
+    chunk_size = 500
+
+    def __init__(self, model_admin):
+        super().__init__(model_admin)
+        if not model_admin.search_fields:
+            raise ImproperlyConfigured(
+                '%s must have search_fields to use %s.' % (
+                    type(model_admin).__qualname__, type(self).__name__))
+
+        self.search_paths = [self.get_search_path(str(search_field))
+                             for search_field in model_admin.search_fields]
+        self.dependencies, self.through_models = self.get_dependencies()
+        self.connect()
+
+    def get_search_path(self, search_field):
+        """
+        Return the field path of a search field without its lookup.
+        """
+        opts = self.model._meta
+        parts = []
+        for part in search_field.lstrip('^=@').split(LOOKUP_SEP):
+            if part == 'pk':
+                part = opts.pk.name
+            try:
+                field = opts.get_field(part)
+            except FieldDoesNotExist:
+                break
+            parts.append(part)
+            if hasattr(field, 'path_infos'):
+                opts = field.path_infos[-1].to_opts
+        return LOOKUP_SEP.join(parts)
+
+    def get_dependencies(self):
+        """
+        Return the (lookup prefix, model) pairs of the related models spanned by
+        the search paths and the through models of the many to many relations.
+        """
+        dependencies, through_models = {}, set()
+        for search_path in self.search_paths:
+            model, prefix = self.model, []
+            for part in search_path.split(LOOKUP_SEP):
+                field = model._meta.get_field(part)
+                if not field.is_relation:
+                    break
+                prefix.append(part)
+                if field.many_to_many:
+                    remote_field = field.remote_field if field.concrete else field
+                    through_models.add(remote_field.through)
+                model = field.related_model
+                dependencies[LOOKUP_SEP.join(prefix)] = model
+        return list(dependencies.items()), through_models
+
+    def connect(self):
+        """
+        Connect the receivers keeping the index in sync.
+        """
+        dispatch_uid = 'django_api_admin_search_%s' % id(self)
+        for model in {self.model, *(model for _, model in self.dependencies)}:
+            pre_delete.connect(self.handle_pre_change,
+                               sender=model, dispatch_uid=dispatch_uid)
+            post_save.connect(self.handle_change, sender=model,
+                              dispatch_uid=dispatch_uid)
+            post_delete.connect(self.handle_change,
+                                sender=model, dispatch_uid=dispatch_uid)
+        for through in self.through_models:
+            m2m_changed.connect(self.handle_m2m_change,
+                                sender=through, dispatch_uid=dispatch_uid)
+
+    def get_affected(self, instance, using, model=None, pk_set=None):
+        """
+        Return the primary keys of the objects whose search text depends on
+        ``instance``.
+        """
+        if isinstance(instance, self.model):
+            return {instance.pk}
+        if model is self.model:
+            return set(pk_set or ())
+
+        affected = set()
+        manager = self.model._base_manager.using(using)
+        for prefix, related_model in self.dependencies:
+            if isinstance(instance, related_model):
+                affected.update(manager.filter(
+                    **{prefix: instance.pk}).values_list('pk', flat=True))
+        return affected
+
+    def stash(self, instance, affected):
+        pending = instance.__dict__.setdefault('_search_pending', {})
+        pending.setdefault(id(self), set()).update(affected)
+
+    def pop_stash(self, instance):
+        return instance.__dict__.get('_search_pending', {}).pop(id(self), set())
+
+    def is_indexed(self, using):
+        """
+        Return True if changes made to the database ``using`` must be indexed.
+        """
+        return self.supports(using)
+
+    def handle_pre_change(self, sender, instance, using, **kwargs):
+        # the relations of deleted objects are gone once post_delete is sent.
+        if self.is_indexed(using):
+            self.stash(instance, self.get_affected(instance, using))
+
+    def handle_change(self, sender, instance, using, **kwargs):
+        if self.is_indexed(using):
+            self.update(self.get_affected(instance, using) |
+                        self.pop_stash(instance), using)
+
+    def handle_m2m_change(self, sender, instance, action, model, pk_set, using, **kwargs):
+        if not self.is_indexed(using):
+            return
+        affected = self.get_affected(instance, using, model, pk_set)
+        if action.startswith('pre_'):
+            self.stash(instance, affected)
+        else:
+            self.update(affected | self.pop_stash(instance), using)
+
+    def get_values(self, queryset):
+        """
+        Return a dict mapping the primary keys of the objects in queryset to the
+        list of values of every search path.
+        """
+        opts = self.model._meta
+        single = [search_path for search_path in self.search_paths
+                  if not lookup_spawns_duplicates(opts, search_path)]
+        values = {}
+        for row in queryset.values_list('pk', *single).iterator(chunk_size=self.chunk_size):
+            values[row[0]] = {search_path: [value] for search_path, value in zip(
+                single, row[1:])}
+        # multi valued paths are loaded separately to keep the rows from multiplying.
+        for search_path in self.search_paths:
+            if search_path in single:
+                continue
+            for pk, value in queryset.values_list('pk', search_path).iterator(chunk_size=self.chunk_size):
+                if pk in values:
+                    values[pk].setdefault(search_path, []).append(value)
+
+        return {
+            pk: [[str(value) for value in row.get(search_path, ()) if value is not None]
+                 for search_path in self.search_paths]
+            for pk, row in values.items()
+        }
+
+    def update(self, pks, using):
+        """
+        Reindex the objects with the given primary keys.
+        """
+        raise NotImplementedError(
+            'subclasses of IndexedSearchBackend must provide an update() method')
+
+
+def update_search_index(search_backend, pks, using):
+    """
+    Reindex the objects saved without sending the model signals, e.g. by
+    bulk_create, if the search backend of their model admin indexes them.
+    """
+    if isinstance(search_backend, IndexedSearchBackend) and search_backend.is_indexed(using):
+        search_backend.update(set(pks), using)
+
+
+class SQLiteFTSSearchBackend(IndexedSearchBackend):
+    """
+    Search an sqlite fts5 shadow table holding the text of the search fields of
+    every object, keyed by the primary key of the object. results are ranked by
+    bm25 and the queryset is filtered with a primary key subquery.
+
+    the table is created by migrate, run rebuild_search_index to index the
+    objects that existed before the backend was turned on. the default search
+    is used until the table exists and holds documents.
+    """
+    tokenize = 'unicode61 remove_diacritics 2'
+    prefix = '2 3'
+
+    def __init__(self, model_admin):
+        opts = model_admin.model._meta
+        pk = getattr(opts.pk, 'target_field', opts.pk)
+        if not isinstance(pk, models.IntegerField):
+            raise ImproperlyConfigured(
+                '%s requires an integer primary key on %s.' % (
+                    type(self).__name__, opts.label))
+        self.table = 'api_admin_search_%s' % opts.db_table
+        # the databases known to have the table, and to have documents in it.
+        self.tables = set()
+        self.populated = set()
+        super().__init__(model_admin)
+
+    def supports(self, using):
+        return connections[using].vendor == 'sqlite'
+
+    def connect(self):
+        super().connect()
+        # sqlite breaks the connection when a savepoint that created an fts5
+        # table is rolled back, create the table before any transaction starts.
+        post_migrate.connect(self.handle_migrate,
+                             dispatch_uid='django_api_admin_search_%s' % id(self))
+
+    def handle_migrate(self, sender, using, **kwargs):
+        if sender.label == self.model._meta.app_label and self.supports(using):
+            self.create_table(connections[using])
+            self.tables.add(using)
+
+    def is_indexed(self, using):
+        return super().is_indexed(using) and self.has_table(using)
+
+    def has_table(self, using):
+        """
+        Return True if the fts5 table of the model exists in the database ``using``.
+        """
+        if using not in self.tables:
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self.table])
+                if cursor.fetchone() is None:
+                    return False
+            self.tables.add(using)
+        return True
+
+    def is_populated(self, using):
+        """
+        Return True if the fts5 table of the database ``using`` has documents.
+        """
+        if using not in self.populated:
+            if not self.has_table(using):
+                return False
+            with connections[using].cursor() as cursor:
+                cursor.execute('SELECT 1 FROM %s LIMIT 1' %
+                               connections[using].ops.quote_name(self.table))
+                if cursor.fetchone() is None:
+                    return False
+            self.populated.add(using)
+        return True
+
+    def create_table(self, connection):
+        """
+        Create the fts5 table of the model if it doesn't exist.
+        """
+        columns = ', '.join('c%d' % i for i in range(len(self.search_paths)))
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(%s, tokenize='%s', prefix='%s')" % (
+                connection.ops.quote_name(self.table), columns, self.tokenize, self.prefix))
+
+    def index(self, pks, using, replace=True):
+        """
+        Write the documents of the objects with the given primary keys, objects
+        that no longer exist are removed from the index.
+        """
+        connection = connections[using]
+        table = connection.ops.quote_name(self.table)
+        columns = ', '.join('c%d' % i for i in range(len(self.search_paths)))
+        insert = 'INSERT INTO %s (rowid, %s) VALUES (%s)' % (
+            table, columns, ', '.join(['%s'] * (len(self.search_paths) + 1)))
+        manager = self.model._base_manager.using(using)
+        count = 0
+        for start in range(0, len(pks), self.chunk_size):
+            chunk = pks[start:start + self.chunk_size]
+            values = self.get_values(manager.filter(pk__in=chunk))
+            with connection.cursor() as cursor:
+                if replace:
+                    cursor.execute('DELETE FROM %s WHERE rowid IN (%s)' % (
+                        table, ', '.join(['%s'] * len(chunk))), chunk)
+                cursor.executemany(insert, [
+                    (pk, *(' '.join(column) for column in columns))
+                    for pk, columns in values.items()
+                ])
+            count += len(values)
+        return count
+
+    def update(self, pks, using):
+        if pks:
+            self.index(sorted(pks), using)
+
+    def rebuild(self, using=None):
+        using = using or router.db_for_write(self.model)
+        if not self.supports(using):
+            return 0
+        connection = connections[using]
+        # created outside of the transaction, see connect().
+        self.create_table(connection)
+        self.tables.add(using)
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM %s' %
+                               connection.ops.quote_name(self.table))
+            pks = list(self.model._base_manager.using(
+                using).order_by('pk').values_list('pk', flat=True))
+            return self.index(pks, using, replace=False)
+
+    def get_match_query(self, search_term):
+        """
+        Return the fts5 query matching every word of the search term as a prefix.
+        """
+        return ' AND '.join('"%s"*' % term.replace('"', '""')
+                            for term in get_search_terms(search_term))
+
+    def search(self, queryset, search_term):
+        if not self.is_populated(queryset.db):
+            return None
+        match_query = self.get_match_query(search_term)
+        if not match_query:
+            return queryset, False
+
+        connection = connections[queryset.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        table = qn(self.table)
+        queryset = queryset.filter(pk__in=RawSQL(
+            'SELECT rowid FROM %s WHERE %s MATCH %%s' % (table, table), (match_query,)))
+        rank = RawSQL('SELECT rank FROM %s WHERE %s MATCH %%s AND rowid = %s.%s' % (
+            table, table, qn(opts.db_table), qn(opts.pk.column)), (match_query,))
+        return queryset.annotate(**{SEARCH_RANK: rank}), False
+
+
+class TrigramIndex:
+    """
+    The in-memory index of one database: the casefolded search values of every
+    object, the objects containing every trigram and the recent term results.
+    """
+
+    def __init__(self, documents=None, too_large=False):
+        self.documents = {}  # pk -> tuple of the values of every search path
+        self.trigrams = {}  # trigram -> set of pks
+        self.results = OrderedDict()  # term -> set of pks, least recent first
+        self.cached_pks = 0
+        self.too_large = too_large
+        self.built_at = time.monotonic()
+        for pk, values in (documents or {}).items():
+            self.add(pk, values)
+
+    def add(self, pk, values):
+        values = tuple(tuple(value.casefold() for value in column)
+                       for column in values)
+        self.documents[pk] = values
+        for trigram in self.get_trigrams(values):
+            self.trigrams.setdefault(trigram, set()).add(pk)
+
+    def remove(self, pk):
+        values = self.documents.pop(pk, None)
+        if values is None:
+            return
+        for trigram in self.get_trigrams(values):
+            pks = self.trigrams.get(trigram)
+            if pks is not None:
+                pks.discard(pk)
+                if not pks:
+                    del self.trigrams[trigram]
+
+    @staticmethod
+    def get_trigrams(values):
+        return {value[i:i + 3] for column in values for value in column
+                for i in range(len(value) - 2)}
+
+
+class TrigramSearchBackend(IndexedSearchBackend):
+    """
+    Search an in-process trigram index of the search field values, for models
+    small enough to be held in memory. the index of every database is loaded on
+    the first search and updated from model signals, writes made by other
+    processes are picked up when the index is reloaded every refresh_interval
+    seconds.
+
+    the results of recent terms are cached, so the next keystroke of a term
+    only rechecks the objects matching the previous one. searches on models
+    with more than max_objects rows, or matching more than max_results objects,
+    fall back to the default search.
+    """
+    max_objects = 100000
+    max_results = 1000
+    # least recently used terms are evicted past either limit.
+    max_cached_terms = 256
+    max_cached_pks = 100000
+    refresh_interval = 300
+
+    def __init__(self, model_admin):
+        super().__init__(model_admin)
+        self.lookups = [str(search_field)[0] if str(search_field)[0] in '^=@' else ''
+                        for search_field in model_admin.search_fields]
+        # an exact match of a term doesn't imply one of its prefix.
+        self.narrowable = '=' not in self.lookups
+        self.lock = threading.RLock()
+        self._indexes = {}  # database alias -> TrigramIndex
+
+    def is_indexed(self, using):
+        return using in self._indexes
+
+    def get_index(self, using):
+        """
+        Return the index of the database ``using``, or None if it has too many
+        objects to be indexed.
+        """
+        with self.lock:
+            index = self._indexes.get(using)
+            if index is None or time.monotonic() - index.built_at > self.refresh_interval:
+                index = self._indexes[using] = self.build(using)
+            return None if index.too_large else index
+
+    def build(self, using):
+        manager = self.model._base_manager.using(using)
+        if manager.count() > self.max_objects:
+            return TrigramIndex(too_large=True)
+        return TrigramIndex(self.get_values(manager.all()))
+
+    def rebuild(self, using=None):
+        using = using or router.db_for_read(self.model)
+        with self.lock:
+            index = self._indexes[using] = self.build(using)
+        return len(index.documents)
+
+    def update(self, pks, using):
+        if not pks:
+            return
+        pks = list(pks)
+        manager = self.model._base_manager.using(using)
+        values = {}
+        for start in range(0, len(pks), self.chunk_size):
+            values.update(self.get_values(
+                manager.filter(pk__in=pks[start:start + self.chunk_size])))
+
+        with self.lock:
+            index = self._indexes.get(using)
+            if index is None or index.too_large:
+                return
+            for pk in pks:
+                index.remove(pk)
+                if pk in values:
+                    index.add(pk, values[pk])
+            if len(index.documents) > self.max_objects:
+                self._indexes[using] = TrigramIndex(too_large=True)
+                return
+            # keep the cached results of the changed objects up to date.
+            for term, result in index.results.items():
+                index.cached_pks -= len(result)
+                for pk in pks:
+                    if pk in index.documents and self.matches(index.documents[pk], term):
+                        result.add(pk)
+                    else:
+                        result.discard(pk)
+                index.cached_pks += len(result)
+
+    def matches(self, document, term):
+        """
+        Return True if a value of the document matches the casefolded term
+        using the lookup of its search field.
+        """
+        for lookup, column in zip(self.lookups, document):
+            for value in column:
+                if lookup == '^':
+                    if value.startswith(term):
+                        return True
+                elif lookup == '=':
+                    if value == term:
+                        return True
+                elif term in value:
+                    return True
+        return False
+
+    def get_candidates(self, index, term):
+        """
+        Return the pks of the objects that may match the term.
+        """
+        if self.narrowable:
+            # the result of the longest cached prefix of the term.
+            prefix = max((cached for cached in index.results if term.startswith(cached)),
+                         key=len, default=None)
+            if prefix is not None:
+                return index.results[prefix]
+        if len(term) < 3:
+            return index.documents.keys()
+
+        postings = sorted((index.trigrams.get(term[i:i + 3], set())
+                           for i in range(len(term) - 2)), key=len)
+        return set.intersection(*postings)
+
+    def lookup(self, index, term):
+        """
+        Return the pks of the objects matching the term, from the cache when the
+        term was searched recently.
+        """
+        result = index.results.get(term)
+        if result is not None:
+            index.results.move_to_end(term)
+            return result
+
+        result = {pk for pk in self.get_candidates(index, term)
+                  if self.matches(index.documents[pk], term)}
+        index.results[term] = result
+        index.cached_pks += len(result)
+        while index.results and (len(index.results) > self.max_cached_terms or
+                                 index.cached_pks > self.max_cached_pks):
+            index.cached_pks -= len(index.results.popitem(last=False)[1])
+        return result
+
+    def search(self, queryset, search_term):
+        index = self.get_index(queryset.db)
+        if index is None:
+            return None
+
+        pks = None
+        with self.lock:
+            for term in get_search_terms(search_term):
+                result = self.lookup(index, term.casefold())
+                pks = set(result) if pks is None else pks & result
+        if pks is None:
+            return queryset, False
+        if len(pks) > self.max_results:
+            return None
+        return queryset.filter(pk__in=pks), False
@@ -173,6 +173,25 @@ class ChangeListSerializer(serializers.Serializer):
     _to_field = serializers.CharField(required=False)
 
 
+class BatchOperationSerializer(serializers.Serializer):
+    """
+    one operation of a batch request
+    """
+    action = serializers.ChoiceField(
+        choices=['create', 'update', 'partial_update', 'delete'])
+    id = serializers.CharField(required=False)
+    data = serializers.DictField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    validates the batch request body, operations are validated one by one
+    """
+    atomic = serializers.BooleanField(required=False, default=True)
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False)
+
+
 class AppIndexSerializer(serializers.Serializer):
     app_label = serializers.CharField()
 
@@ -218,6 +237,7 @@ class AutoCompleteSerializer(serializers.Serializer):
     model_name = serializers.CharField(required=True)
     field_name = serializers.CharField(required=True)
     term = serializers.CharField(required=False, default="")
+    light = serializers.BooleanField(required=False, default=False)
 
 
 class FormatsSerializer(serializers.Serializer):
@@ -356,12 +376,16 @@ class ConfigSerializer(serializers.Serializer):
         child=serializers.CharField(), allow_null=True)
     search_fields = serializers.ListField(child=serializers.CharField())
     preserve_filters = serializers.BooleanField()
-    full_count = serializers.IntegerField()
-    result_count = serializers.IntegerField()
+    full_count = serializers.IntegerField(allow_null=True)
+    result_count = serializers.IntegerField(allow_null=True)
+    multi_page = serializers.BooleanField()
     action_choices = ActionChoiceSerializer(many=True)
     filters = FilterSerializer(many=True)
     list_display_fields = serializers.ListField(child=serializers.CharField())
     editing_fields = serializers.DictField(child=EditingFieldSerializer())
+    degraded = serializers.ListField(child=serializers.ChoiceField(
+        choices=['count', 'full_count', 'page', 'filter_choices']))
+    refine_search = serializers.BooleanField()
 
 
 class ColumnSerializer(serializers.Serializer):
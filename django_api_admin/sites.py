@@ -1,29 +1,44 @@
 """
 API admin site.
 """
+from collections import deque
+from functools import partial, wraps
 from weakref import WeakSet
 
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.db import router
 from django.db.models.base import ModelBase
-from django.urls import (NoReverseMatch, URLPattern, include, path, re_path,
-                         reverse)
+from django.urls import (NoReverseMatch, URLPattern, URLResolver, get_script_prefix,
+                         get_urlconf, include, path, re_path, reverse)
+from django.urls.resolvers import RoutePattern
 from django.utils.text import capfirst
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 from django.utils.functional import LazyObject
 from django.utils.module_loading import import_string
 
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
 from django_api_admin import actions
 from django_api_admin.admins.model_admin import APIModelAdmin
+from django_api_admin.constants.vars import PROFILE_VAR
+from django_api_admin.events import connect_event_signals
+from django_api_admin.metrics import MetricsRegistry, track_view
 from django_api_admin.pagination import AdminLogPagination, AdminResultsListPagination
-from django_api_admin.permissions import IsAdminUser
+from django_api_admin.permissions import IsAdminUser, PermissionSnapshot
+from django_api_admin.profiling import PROFILE_HEADER, PROFILE_MODES, profile_view
 from django_api_admin.exceptions import AlreadyRegistered, NotRegistered
 
 
 all_sites = WeakSet()
 
+READ_AFTER_WRITE_KEY = 'django_api_admin:read_after_write:%s'
+
 
 class APIAdminSite():
     """
@@ -39,6 +54,7 @@ class APIAdminSite():
 
     # default permissions
     default_permission_classes = [IsAdminUser, ]
+    permission_snapshot_class = PermissionSnapshot
 
     # default serializers
     token_serializer = None
@@ -49,6 +65,49 @@ class APIAdminSite():
     # default result pagination style
     default_pagination_class = AdminResultsListPagination
     default_log_pagination_class = AdminLogPagination
+    # admin log pages larger than this are streamed, None disables streaming.
+    stream_threshold = 500
+    stream_chunk_size = 1000
+
+    # the cache holding the model versions of the change events, the seconds
+    # between two version checks, the seconds a long poll waits for a change and
+    # the seconds an event stream stays open before the client reconnects.
+    # a waiting client holds a worker for the whole timeout, so polls answer and
+    # streams close at once unless the timeouts are raised on a server that can
+    # hold many requests open, e.g. an asgi server or threaded wsgi workers.
+    events_cache_alias = 'default'
+    events_poll_interval = 1
+    events_poll_timeout = 0
+    events_stream_timeout = 0
+
+    # the database alias queried by the read only views, e.g. a replica, None
+    # leaves the choice to the database routers. a user's reads go to the primary
+    # for read_after_write_timeout seconds after they write, the cache holds the
+    # time of their last write.
+    read_db_alias = None
+    read_after_write_timeout = 5
+    read_after_write_cache_alias = 'default'
+
+    # let staff users profile the requests of the site views with
+    # ?_profile=cprofile or the X-Admin-Profile header, ?_profile=collapsed
+    # returns the call stacks instead of the response. the last profile_history
+    # reports of the process are listed by the profiles view with the
+    # profile_function_limit functions with the most cumulative time.
+    enable_profiling = False
+    profile_history = 20
+    profile_function_limit = 50
+
+    # when enabled, record the requests, latencies, sql queries, response
+    # sizes and cache hit rates of the views per url name and model, exposed by
+    # the metrics view in the prometheus text format. with a metrics_directory
+    # every process writes its metrics there every metrics_flush_interval
+    # seconds and the view serves the totals of all of them. the metrics view
+    # uses the default permission classes unless metrics_permission_classes is
+    # set, e.g. to [] for scrapers.
+    enable_metrics = False
+    metrics_directory = None
+    metrics_flush_interval = 10
+    metrics_permission_classes = None
 
     # Text to put at the end of each page's <title>.
     site_title = gettext_lazy("Django site admin")
@@ -62,6 +121,10 @@ class APIAdminSite():
     # URL for the "View site" link at the top of each admin page.
     site_url = "/"
 
+    # packages translated by the language catalog and how long clients may cache it
+    language_catalog_packages = ['django_api_admin']
+    language_catalog_max_age = 60 * 60 * 24
+
     # the authentication class used by the admin views
     authentication_classes = None
 
@@ -77,6 +140,9 @@ class APIAdminSite():
     swagger_url_name = "swagger-ui"
     url_prefix = None
 
+    # a schema file written by the generate_admin_schema command served by the schema view
+    schema_path = None
+
     def __init__(self, include_auth=True, name="api_admin"):
         from django.contrib.auth.models import Group
         from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -95,6 +161,15 @@ class APIAdminSite():
         self.user_serializer = api_serializers.UserSerializer
 
         self._registry = {}  # model_class class -> admin_class instance
+        self._url_routes = {}  # url name -> route relative to the site root
+        self._app_names = {}  # app_label -> app verbose name
+        self._root_paths = {}  # (urlconf, script prefix) -> site root path
+        self._schema_tags = None  # openapi path -> tag
+        self._schemas = {}  # (urlconf, version, language) -> generated schema
+        # (app_label, model_name, field_name) -> resolved autocomplete target
+        self._autocomplete_targets = {}
+        self._profiles = deque(maxlen=self.profile_history)  # the last profile reports
+        self.metrics = MetricsRegistry(name, self.metrics_directory, self.metrics_flush_interval)
         self.name = name
         all_sites.add(self)
 
@@ -160,6 +235,8 @@ class APIAdminSite():
 
                 # Instantiate the admin class to save in the registry
                 self._registry[model] = admin_class(model, self)
+                self._autocomplete_targets.clear()
+                connect_event_signals(model)
 
     def unregister(self, model_or_iterable):
         """
@@ -174,6 +251,7 @@ class APIAdminSite():
                 raise NotRegistered(
                     "The model %s is not registered" % model.__name__)
             del self._registry[model]
+            self._autocomplete_targets.clear()
 
     def is_registered(self, model):
         """
@@ -181,6 +259,123 @@ class APIAdminSite():
         """
         return model in self._registry
 
+    def get_permission_snapshot(self, request):
+        """
+        Return the permissions of the requesting user, they are computed once per
+        request and shared by every model admin permission check.
+        """
+        snapshot = getattr(request, '_permission_snapshot', None)
+        if snapshot is None or snapshot.user is not request.user:
+            snapshot = self.permission_snapshot_class(request.user)
+            request._permission_snapshot = snapshot
+        return snapshot
+
+    def use_read_db(self, request):
+        """
+        Send the queries of the model admins made for the request to the read
+        database, called by the read only views.
+        """
+        request._use_read_db = True
+
+    def get_read_db(self, request, model):
+        """
+        Return the database alias the model is read from for the request, the
+        write database of the model if the user wrote recently and None if the
+        request isn't read only or no read database is set.
+        """
+        if self.read_db_alias is None or not getattr(request, '_use_read_db', False):
+            return None
+        # the recent writes of the user are looked up once per request.
+        pinned = getattr(request, '_read_after_write', None)
+        if pinned is None:
+            user = getattr(request, 'user', None)
+            pinned = request._read_after_write = bool(
+                user is not None and user.pk is not None and caches[
+                    self.read_after_write_cache_alias].get(READ_AFTER_WRITE_KEY % user.pk))
+        if pinned:
+            return router.db_for_write(model)
+        return self.read_db_alias
+
+    def record_write(self, request):
+        """
+        Pin the reads of the requesting user to the primary database for
+        read_after_write_timeout seconds, called by the views that write.
+        """
+        user = getattr(request, 'user', None)
+        if self.read_db_alias is None or not self.read_after_write_timeout or \
+                user is None or user.pk is None:
+            return
+        caches[self.read_after_write_cache_alias].set(
+            READ_AFTER_WRITE_KEY % user.pk, True, self.read_after_write_timeout)
+        request._read_after_write = True
+
+    def admin_view(self, view):
+        """
+        Wrap a view of the site or of its model admins to record its metrics,
+        see ``enable_metrics``, and to profile the requests of staff users when
+        asked to, see ``enable_profiling``.
+        """
+        model_admin = (getattr(view, 'view_initkwargs', None) or {}).get('model_admin')
+        model = model_admin.model._meta.label_lower if model_admin is not None else ''
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            mode = self.get_profile_mode(request)
+            get_response = view if mode is None else partial(profile_view, self, mode, view)
+            if not self.enable_metrics:
+                return get_response(request, *args, **kwargs)
+            return track_view(self, model, get_response, request, *args, **kwargs)
+        return inner
+
+    def get_profile_mode(self, request):
+        """
+        Return the profiling mode asked for by the request or None if it
+        shouldn't be profiled.
+        """
+        if not self.enable_profiling:
+            return None
+        mode = request.GET.get(PROFILE_VAR) or request.headers.get(PROFILE_HEADER)
+        if mode not in PROFILE_MODES or not self.has_profile_permission(request):
+            return None
+        return mode
+
+    def has_profile_permission(self, request):
+        """
+        Return True if the user of the request may profile it, the user is
+        authenticated with the authentication classes of the site before the
+        view runs so other users never pay for the profiler.
+        """
+        drf_request = Request(request, authenticators=[
+            authentication() for authentication in self.authentication_classes])
+        try:
+            user = drf_request.user
+        except APIException:
+            return False
+        return bool(user and user.is_authenticated and user.is_active and user.is_staff)
+
+    def add_profile(self, report):
+        self._profiles.append(report)
+
+    def get_profiles(self):
+        """
+        Return the profile reports kept by this process, oldest first.
+        """
+        return list(self._profiles)
+
+    def get_profile(self, profile_id):
+        return next((report for report in self.get_profiles()
+                     if report['id'] == profile_id), None)
+
+    def wrap_views(self, urlpatterns):
+        """
+        Wrap the views of the url patterns with admin_view.
+        """
+        for pattern in urlpatterns:
+            if isinstance(pattern, URLResolver):
+                self.wrap_views(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern):
+                pattern.callback = self.admin_view(pattern.callback)
+
     def get_urls(self):
         urlpatterns = [
             path('index/', self.get_index_view(), name='index'),
@@ -198,6 +393,11 @@ class APIAdminSite():
                  name='site_context'),
             path('admin_log/', self.get_admin_log_view(),
                  name='admin_log'),
+            path('events/', self.get_events_view(), name='events'),
+            path('metrics/', self.get_metrics_view(), name='metrics'),
+            path('profiles/', self.get_profiles_view(), name='profiles'),
+            path('profiles/<str:profile_id>/', self.get_profile_detail_view(),
+                 name='profile_detail'),
             path('schema/', self.get_schema_view(), name='schema')
         ]
 
@@ -242,8 +442,81 @@ class APIAdminSite():
         urlpatterns += [url for urls in self.admin_urls.values()
                         for url in urls]
 
+        self.wrap_views(urlpatterns)
+        self.build_url_map(urlpatterns, valid_app_labels)
         return urlpatterns
 
+    def build_url_map(self, urlpatterns, app_labels):
+        """
+        Precompute the routes of every named url without converters so that
+        responses listing admin urls don't resolve them on every request.
+        """
+        self._url_routes = {
+            url.name: str(url.pattern) for url in urlpatterns
+            if isinstance(url, URLPattern) and url.name
+            and isinstance(url.pattern, RoutePattern) and not url.pattern.converters
+        }
+        for app_label in app_labels:
+            self._url_routes[f'app_list:{app_label}'] = f'{app_label}/'
+        self._app_names = {
+            app_label: apps.get_app_config(app_label).verbose_name for app_label in app_labels
+        }
+        self._root_paths = {}
+        self._schema_tags = None
+        self._schemas = {}
+
+    def get_schema_tags(self):
+        """
+        Return a dict mapping the openapi paths of this site to the tag grouping
+        them in the schema, it's built once after the urls are.
+        """
+        if self._schema_tags is None:
+            from drf_spectacular.generators import EndpointEnumerator
+
+            enumerator = EndpointEnumerator(patterns=[])
+
+            def get_path(url):
+                return self.url_prefix + enumerator.get_path_from_regex(str(url.pattern))
+
+            tags = {
+                get_path(url): self.name for url in self.site_urls
+                if isinstance(url, URLPattern) and url.name != self.swagger_url_name
+            }
+            for model in self._registry.keys():
+                for url in self.admin_urls.get(model, None) or []:
+                    if isinstance(url, URLPattern):
+                        tags[get_path(url)] = model._meta.verbose_name
+            self._schema_tags = tags
+        return self._schema_tags
+
+    def get_root_path(self):
+        """
+        Return the path this site is mounted at, it's resolved once per url
+        configuration and script prefix.
+        """
+        key = (get_urlconf() or settings.ROOT_URLCONF, get_script_prefix())
+        try:
+            return self._root_paths[key]
+        except KeyError:
+            index_path = reverse(f'{self.name}:index', current_app=self.name)
+            root_path = index_path[:len(index_path) -
+                                   len(self._url_routes['index'])]
+            self._root_paths[key] = root_path
+            return root_path
+
+    def get_url_path(self, url_name, **kwargs):
+        """
+        Return the path of the site url named ``url_name`` using the precomputed
+        url map and falling back to reverse().
+        """
+        if url_name == 'app_list' and kwargs.keys() == {'app_label'}:
+            route = self._url_routes.get(f'app_list:{kwargs["app_label"]}')
+        else:
+            route = None if kwargs else self._url_routes.get(url_name)
+        if route is None or 'index' not in self._url_routes:
+            return reverse(f'{self.name}:{url_name}', kwargs=kwargs or None, current_app=self.name)
+        return self.get_root_path() + route
+
     @property
     def urls(self):
         return self.get_urls(), self.name, self.name
@@ -277,7 +550,7 @@ class APIAdminSite():
             if True not in perms.values():
                 continue
 
-            info = (self.name, app_label, model._meta.model_name)
+            info = (app_label, model._meta.model_name)
             model_dict = {
                 'name': capfirst(model._meta.verbose_name_plural),
                 'object_name': model._meta.object_name,
@@ -292,18 +565,18 @@ class APIAdminSite():
                 model_dict['view_only'] = not perms.get('change')
                 try:
                     model_dict['list_url'] = request.build_absolute_uri(
-                        reverse('%s:%s_%s_list' % info, current_app=self.name))
+                        self.get_url_path('%s_%s_list' % info))
                     model_dict['changelist_url'] = request.build_absolute_uri(
-                        reverse('%s:%s_%s_changelist' % info, current_app=self.name))
+                        self.get_url_path('%s_%s_changelist' % info))
                     model_dict['perform_action_url'] = request.build_absolute_uri(
-                        reverse('%s:%s_%s_perform_action' % info, current_app=self.name))
+                        self.get_url_path('%s_%s_perform_action' % info))
                 except NoReverseMatch:
                     pass
 
             if perms.get('add'):
                 try:
                     model_dict['add_url'] = request.build_absolute_uri(
-                        reverse('%s:%s_%s_add' % info, current_app=self.name))
+                        self.get_url_path('%s_%s_add' % info))
                 except NoReverseMatch:
                     pass
 
@@ -311,13 +584,9 @@ class APIAdminSite():
                 app_dict[app_label]['models'].append(model_dict)
             else:
                 app_dict[app_label] = {
-                    'name': apps.get_app_config(app_label).verbose_name,
+                    'name': self._app_names.get(app_label) or apps.get_app_config(app_label).verbose_name,
                     'app_label': app_label,
-                    'app_url': reverse(
-                        f'{self.name}:app_list',
-                        kwargs={'app_label': app_label},
-                        current_app=self.name,
-                    ),
+                    'app_url': self.get_url_path('app_list', app_label=app_label),
                     'has_module_perms': has_module_perms,
                     'models': [model_dict],
                 }
@@ -363,9 +632,9 @@ class APIAdminSite():
             "is_nav_sidebar_enabled": self.enable_nav_sidebar,
         }
 
-    def paginate_queryset(self, queryset, request, view=None):
+    def paginate_queryset(self, queryset, request, view=None, lazy=False):
         paginator = self.default_pagination_class()
-        return paginator.paginate_queryset(queryset.order_by('pk'), request, view=view)
+        return paginator.paginate_queryset(queryset.order_by('pk'), request, view=view, lazy=lazy)
 
     def get_log_entry_serializer(self):
         return type('LogEntrySerializer', (self.log_entry_serializer,), {
@@ -466,6 +735,47 @@ class APIAdminSite():
         }
         return AdminLogView.as_view(**defaults)
 
+    def get_events_view(self):
+        from django_api_admin.admin_views.admin_site_views.events import EventsView
+
+        defaults = {
+            'permission_classes': self.default_permission_classes,
+            'authentication_classes': self.authentication_classes,
+            'admin_site': self
+        }
+        return EventsView.as_view(**defaults)
+
+    def get_metrics_view(self):
+        from django_api_admin.admin_views.admin_site_views.metrics import MetricsView
+
+        defaults = {
+            'permission_classes': self.default_permission_classes
+            if self.metrics_permission_classes is None else self.metrics_permission_classes,
+            'authentication_classes': self.authentication_classes,
+            'admin_site': self
+        }
+        return MetricsView.as_view(**defaults)
+
+    def get_profiles_view(self):
+        from django_api_admin.admin_views.admin_site_views.profiles import ProfilesView
+
+        defaults = {
+            'permission_classes': self.default_permission_classes,
+            'authentication_classes': self.authentication_classes,
+            'admin_site': self
+        }
+        return ProfilesView.as_view(**defaults)
+
+    def get_profile_detail_view(self):
+        from django_api_admin.admin_views.admin_site_views.profiles import ProfileDetailView
+
+        defaults = {
+            'permission_classes': self.default_permission_classes,
+            'authentication_classes': self.authentication_classes,
+            'admin_site': self
+        }
+        return ProfileDetailView.as_view(**defaults)
+
     def get_user_info_view(self):
         from django_api_admin.admin_views.admin_site_views.user_information import UserInformation
 
@@ -488,9 +798,9 @@ class APIAdminSite():
         return ViewOnSiteView.as_view(**defaults)
 
     def get_schema_view(self):
-        from drf_spectacular.views import SpectacularAPIView
+        from django_api_admin.admin_views.admin_site_views.schema import SchemaView
 
-        return SpectacularAPIView.as_view()
+        return SchemaView.as_view(admin_site=self)
 
     def get_docs_view(self):
         from drf_spectacular.views import SpectacularSwaggerView
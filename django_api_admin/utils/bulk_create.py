@@ -0,0 +1,58 @@
+from django.db import connections
+
+from rest_framework.serializers import ModelSerializer
+
+from django_api_admin.events import notify_model_changed
+from django_api_admin.search import update_search_index
+
+
+def can_bulk_create(serializer):
+    """
+    Return True if the serializer saves new objects the way ModelSerializer does,
+    so its validated data can be inserted with bulk_create.
+    """
+    return isinstance(serializer, ModelSerializer) and type(serializer).create is ModelSerializer.create
+
+
+def bulk_create(model, rows, using, batch_size=None, search_backend=None):
+    """
+    Insert objects built from the validated data rows of a model serializer and
+    their many to many relations, return the created objects. the objects are
+    indexed by the ``search_backend`` of the model admin since bulk_create
+    doesn't send post_save.
+    """
+    opts = model._meta
+    m2m_fields = {field.name: field for field in opts.many_to_many}
+    objs, relations = [], []
+    for data in rows:
+        data = dict(data)
+        relations.append({name: data.pop(name)
+                         for name in list(data) if name in m2m_fields})
+        objs.append(model(**data))
+
+    manager = model._base_manager.using(using)
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        # the primary keys of the created objects are needed by the callers
+        # and the related rows, bulk_create leaves them unset on these backends.
+        for obj in objs:
+            obj.save(using=using, force_insert=True)
+    else:
+        manager.bulk_create(objs, batch_size=batch_size)
+
+    for name, field in m2m_fields.items():
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(
+            field.m2m_reverse_field_name()).attname
+        through_objs = [
+            through(**{source: getattr(obj, field.m2m_target_field_name()),
+                       target: getattr(related, field.m2m_reverse_target_field_name())})
+            for obj, related_objs in zip(objs, relations)
+            for related in related_objs.get(name, ())
+        ]
+        if through_objs:
+            through._base_manager.using(using).bulk_create(
+                through_objs, batch_size=batch_size, ignore_conflicts=True)
+    update_search_index(search_backend, [obj.pk for obj in objs], using)
+    notify_model_changed(model, using=using)
+    return objs
@@ -0,0 +1,50 @@
+from rest_framework.serializers import ModelSerializer
+
+from django_api_admin.events import notify_model_changed
+from django_api_admin.search import update_search_index
+
+
+def can_bulk_update(serializer):
+    """
+    Return True if the serializer saves changes the way ModelSerializer does, so
+    its validated data can be written with bulk_update.
+    """
+    return isinstance(serializer, ModelSerializer) and type(serializer).update is ModelSerializer.update
+
+
+def bulk_update(model, updates, using, batch_size=None, search_backend=None):
+    """
+    Apply the validated data of the (instance, validated_data) updates and save
+    them with one bulk_update per set of changed fields, return the instances.
+    the changed objects are reindexed by the ``search_backend`` of the model
+    admin since bulk_update doesn't send post_save.
+    """
+    opts = model._meta
+    m2m_fields = {field.name for field in opts.many_to_many}
+    auto_now_fields = [field for field in opts.concrete_fields
+                       if getattr(field, 'auto_now', False)]
+    groups, relations = {}, []
+    for obj, data in updates:
+        fields = set()
+        for attr, value in data.items():
+            if attr in m2m_fields:
+                relations.append((obj, attr, value))
+            else:
+                setattr(obj, attr, value)
+                fields.add(attr)
+        if fields:
+            for field in auto_now_fields:
+                field.pre_save(obj, add=False)
+                fields.add(field.name)
+            groups.setdefault(frozenset(fields), []).append(obj)
+
+    manager = model._base_manager.using(using)
+    for fields, objs in groups.items():
+        manager.bulk_update(objs, sorted(fields), batch_size=batch_size)
+    for obj, attr, value in relations:
+        getattr(obj, attr).set(value)
+    if groups:
+        update_search_index(
+            search_backend, [obj.pk for objs in groups.values() for obj in objs], using)
+        notify_model_changed(model, using=using)
+    return [obj for obj, _ in updates]
@@ -0,0 +1,80 @@
+import json
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import translation
+from django.utils.crypto import md5
+from django.utils.translation.trans_real import DjangoTranslation
+from django.views.i18n import JSONCatalog
+
+# (language, packages, domain) -> CompiledCatalog
+_catalogs = {}
+
+
+class CompiledCatalog:
+    """
+    the json rendered translation catalog of a language and its etag.
+    """
+
+    def __init__(self, content, signature=None):
+        self.content = content
+        self.etag = '"%s"' % md5(content, usedforsecurity=False).hexdigest()
+        self.signature = signature
+
+
+def get_locale_signature(language, domain):
+    """
+    Return the modification times of the message files of ``language``, used to
+    rebuild catalogs when the locale files change during development.
+    """
+    import django
+
+    locales = {translation.to_locale(language), language.split('-')[0]}
+    locale_dirs = [
+        *settings.LOCALE_PATHS,
+        *(os.path.join(app_config.path, 'locale')
+          for app_config in apps.get_app_configs()),
+        os.path.join(os.path.dirname(django.__file__), 'conf', 'locale'),
+    ]
+    signature = []
+    for locale_dir in locale_dirs:
+        for locale in locales:
+            path = os.path.join(locale_dir, locale,
+                                'LC_MESSAGES', f'{domain}.mo')
+            try:
+                signature.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                continue
+    return tuple(signature)
+
+
+def build_catalog(language, packages, domain='django'):
+    """
+    Return the catalog, formats and plural expression of ``language`` rendered
+    as json, the same content the JSONCatalog view renders.
+    """
+    catalog_view = JSONCatalog(packages=list(packages), domain=domain)
+    paths = catalog_view.get_paths(packages) if packages else None
+    with translation.override(language):
+        # the formats are read for the active language.
+        catalog_view.translation = DjangoTranslation(
+            language, domain=domain, localedirs=paths)
+        context = catalog_view.get_context_data()
+    return json.dumps(context, cls=DjangoJSONEncoder)
+
+
+def get_language_catalog(language, packages, domain='django'):
+    """
+    Return the CompiledCatalog of ``language`` for the given packages, it's built
+    once per process and rebuilt in debug mode when the locale files change.
+    """
+    key = (language, tuple(packages), domain)
+    signature = get_locale_signature(
+        language, domain) if settings.DEBUG else None
+    catalog = _catalogs.get(key)
+    if catalog is None or catalog.signature != signature:
+        catalog = _catalogs[key] = CompiledCatalog(
+            build_catalog(language, packages, domain).encode(), signature)
+    return catalog
@@ -0,0 +1,56 @@
+import time
+from contextlib import contextmanager
+
+from django.db import OperationalError, connections, transaction
+
+from django_api_admin.exceptions import QueryBudgetExceeded
+
+# the number of sqlite virtual machine instructions between two deadline checks.
+SQLITE_PROGRESS_STEPS = 1000
+
+
+@contextmanager
+def query_budget(using, seconds):
+    """
+    Interrupt the queries run on the database ``using`` within the block that
+    exceed a budget of ``seconds`` and raise QueryBudgetExceeded. on sqlite a
+    progress handler interrupts the block once it ran for ``seconds``, on
+    postgresql the statement_timeout setting cancels every statement running
+    longer. other backends and a None budget run unbounded.
+    """
+    connection = connections[using]
+    if not seconds or connection.vendor not in ('sqlite', 'postgresql'):
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    try:
+        if connection.vendor == 'sqlite':
+            connection.ensure_connection()
+            connection.connection.set_progress_handler(
+                lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS)
+            try:
+                yield
+            finally:
+                connection.connection.set_progress_handler(None, 0)
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT current_setting('statement_timeout'), "
+                               "set_config('statement_timeout', %s, false)",
+                               [str(max(int(seconds * 1000), 1))])
+                previous = cursor.fetchone()[0]
+            try:
+                # a canceled statement breaks the surrounding transaction, roll
+                # back to a savepoint instead.
+                if connection.in_atomic_block:
+                    with transaction.atomic(using=using):
+                        yield
+                else:
+                    yield
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT set_config('statement_timeout', %s, false)", [previous])
+    except OperationalError as e:
+        if time.monotonic() < deadline:
+            raise
+        raise QueryBudgetExceeded(str(e)) from e
@@ -0,0 +1,103 @@
+import json
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver
+
+
+def get_endpoint_names(admin_site, models=None):
+    """
+    Return the names of the urls returned by the get_urls() of the admin site,
+    which include the urls of its model admins and their inlines, only the
+    model admins of ``models`` are included if given.
+    """
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                yield pattern.name
+
+    excluded = set()
+    if models is not None:
+        for model, model_admin in admin_site._registry.items():
+            if model not in models:
+                excluded.update(walk(model_admin.urls))
+    return [name for name in dict.fromkeys(walk(admin_site.get_urls()))
+            if name not in excluded]
+
+
+def count_queries(func, using=DEFAULT_DB_ALIAS):
+    """
+    Call ``func`` and return its result and the number of queries it ran on
+    the database ``using``.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        result = func()
+    return result, len(context)
+
+
+def load_query_counts(path):
+    """
+    Return the query counts of a snapshot file, an empty dict if it doesn't
+    exist yet.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def dump_query_counts(path, counts):
+    """
+    Write the query counts to a snapshot file, keys are sorted to keep the
+    diffs of updates small.
+    """
+    with open(path, 'w') as f:
+        json.dump(counts, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_query_counts(expected, actual):
+    """
+    Return the regressions of the ``actual`` query counts against the
+    ``expected`` snapshot, both mapping the endpoint names to their response
+    status and the number of queries for every dataset size.
+
+    an endpoint regresses when it runs more queries than recorded for any
+    dataset size, when the number of its queries starts growing with the size
+    of the dataset or when it responds with another status. the endpoints
+    recorded as growing with the size of the dataset are only compared on the
+    number of queries of every size. the endpoints skipped in both are
+    ignored, an endpoint that is skipped in only one of them regresses.
+    """
+    regressions = []
+    for name, result in actual.items():
+        recorded = expected.get(name)
+        if recorded is not None and 'skipped' in recorded and 'skipped' in result:
+            continue
+        if 'skipped' in result:
+            regressions.append(f'{name} is skipped: {result["skipped"]}')
+            continue
+        queries = {int(size): count for size, count in result['queries'].items()}
+        if recorded is None or 'skipped' in recorded:
+            regressions.append(f'{name} has no recorded query counts')
+            continue
+        recorded_queries = {int(size): count for size, count in recorded['queries'].items()}
+
+        if recorded['status'] != result['status']:
+            regressions.append(
+                f'{name} responded with {result["status"]}, expected {recorded["status"]}')
+        sizes = sorted(queries)
+        if len(sizes) > 1 and queries[sizes[-1]] > queries[sizes[0]] and \
+                recorded_queries.get(sizes[-1]) == recorded_queries.get(sizes[0]):
+            regressions.append(
+                f'{name} runs more queries with more rows: ' +
+                ', '.join(f'{queries[size]} with {size}' for size in sizes))
+        for size in sizes:
+            if size in recorded_queries and queries[size] > recorded_queries[size]:
+                regressions.append(
+                    f'{name} runs {queries[size]} queries with {size} rows, '
+                    f'{recorded_queries[size]} expected')
+    return regressions
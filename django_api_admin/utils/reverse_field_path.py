@@ -1,4 +1,4 @@
-from django_api_admin.utils import get_model_from_relation
+from django_api_admin.utils.get_model_from_relation import get_model_from_relation
 from django_api_admin.exceptions import NotRelationField
 from django_api_admin.constants.vars import LOOKUP_SEP
 
@@ -0,0 +1,25 @@
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+def serialize_rows(serializer, instances):
+    """
+    Return the representations of the readable serializer fields of every
+    instance as lists in the order of the fields, like to_representation
+    without building a dict for every instance.
+    """
+    fields = list(serializer._readable_fields)
+    rows = []
+    for instance in instances:
+        row = []
+        for field in fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                row.append(None)
+                continue
+            check_for_none = attribute.pk if isinstance(
+                attribute, PKOnlyObject) else attribute
+            row.append(None if check_for_none is None else field.to_representation(attribute))
+        rows.append(row)
+    return [field.field_name for field in fields], rows
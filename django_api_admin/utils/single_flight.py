@@ -0,0 +1,83 @@
+import threading
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+
+class _Call:
+    """
+    an in-flight computation shared by every caller waiting on the same key.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    coalesces concurrent identical computations within a process, the first caller
+    runs the computation and every other caller asking for the same key while it is
+    in flight waits for it and shares the result. the result is the same object
+    for every caller, callers copy the mutable results before changing them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """
+        Return the result of ``fn()`` computing it at most once for concurrent callers
+        using the same ``key``. waiting callers give up after ``timeout`` seconds (or when
+        the leading computation fails) and fall back to computing the value themselves.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+            return call.result
+
+        if call.event.wait(timeout) and call.error is None:
+            return call.result
+        return fn()
+
+    def in_flight(self):
+        """
+        Return the number of computations currently running.
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+def queryset_flight_key(kind, queryset):
+    """
+    Return a key identifying the sql ``kind`` (e.g. count, page) runs for ``queryset``
+    or None if the queryset can't be coalesced safely.
+    """
+    # uncommitted changes made inside a transaction must not leak to other requests.
+    if connections[queryset.db].in_atomic_block:
+        return None
+    try:
+        sql, params = queryset.query.sql_with_params()
+        key = (kind, queryset.db, sql, tuple(params))
+        hash(key)
+    except (EmptyResultSet, TypeError, ValueError):
+        return None
+    return key
+
+
+changelist_flights = SingleFlight()
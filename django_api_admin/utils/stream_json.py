@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+
+from django.http import StreamingHttpResponse
+
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+
+def stream_json(data, chunk_size=65536):
+    """
+    Yield the json encoding of data in chunks of about chunk_size characters.
+    iterators found in data, at the top level or as values of dicts, are encoded
+    as arrays one item at a time so their items are never all in memory.
+    """
+    encoder = encoders.JSONEncoder(
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(',', ':') if api_settings.COMPACT_JSON else (', ', ': '),
+    )
+    item_separator, key_separator = encoder.item_separator, encoder.key_separator
+
+    def encode(value):
+        if isinstance(value, Iterator):
+            yield '['
+            for index, item in enumerate(value):
+                if index:
+                    yield item_separator
+                yield from encode(item)
+            yield ']'
+        elif isinstance(value, dict) and any(isinstance(item, Iterator) for item in value.values()):
+            yield '{'
+            for index, (key, item) in enumerate(value.items()):
+                if index:
+                    yield item_separator
+                yield encoder.encode(str(key)) + key_separator
+                yield from encode(item)
+            yield '}'
+        else:
+            # escape the line separators like the DRF JSONRenderer does.
+            yield encoder.encode(value).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+    chunk, size = [], 0
+    for part in encode(data):
+        chunk.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    A streaming response writing data encoded by stream_json.
+    """
+
+    def __init__(self, data, status=None, chunk_size=65536):
+        super().__init__(stream_json(data, chunk_size=chunk_size), status=status,
+                         content_type='application/json')
@@ -0,0 +1,13 @@
+def trim_serializer_class(serializer_class, fields, name):
+    """
+    Return a subclass of the model serializer class serializing only the given
+    fields, the declared fields that aren't included are dropped.
+    """
+    Meta = type('Meta', (serializer_class.Meta,), {
+        'fields': list(fields),
+        'exclude': None,
+    })
+    attrs = {field_name: None for field_name in serializer_class._declared_fields
+             if field_name not in fields}
+    attrs['Meta'] = Meta
+    return type(serializer_class)(name, (serializer_class,), attrs)
@@ -0,0 +1,24 @@
+from django.urls import reverse
+
+from django_api_admin.utils.quote import quote
+
+URL_PLACEHOLDER = '__object_id__'
+
+
+def get_url_template(viewname, request=None, kwargs=None, kwarg='object_id'):
+    """
+    Reverse an object url once with a placeholder object id and return it as a
+    %-format template, used to build the urls of many objects without calling
+    reverse for each of them.
+    """
+    url = reverse(viewname, kwargs={**(kwargs or {}), kwarg: URL_PLACEHOLDER})
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    return url.replace('%', '%%').replace(URL_PLACEHOLDER, '%s')
+
+
+def format_url(template, object_id):
+    """
+    Return the url of an object from a template of get_url_template.
+    """
+    return template % quote(str(object_id))
@@ -0,0 +1,142 @@
+import random
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from django_api_admin.models import ADDITION, CHANGE, DELETION, LogEntry
+from test_django_api_admin.models import Author, Book, GuestEntry, Publisher
+
+WORDS = (
+    'things', 'fall', 'apart', 'arrow', 'of', 'god', 'half', 'yellow', 'sun',
+    'purple', 'hibiscus', 'season', 'migration', 'north', 'petals', 'blood',
+    'river', 'between', 'wizard', 'crow', 'devil', 'on', 'the', 'cross',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with generated publishers, authors, books, guest entries "
+        "and admin log entries for the benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', type=int, default=10000,
+                            help='Number of authors (default: 10000).')
+        parser.add_argument('--books-per-author', type=int, default=2,
+                            help='Number of books of every author (default: 2).')
+        parser.add_argument('--publishers', type=int, default=100,
+                            help='Number of publishers (default: 100).')
+        parser.add_argument('--publishers-per-author', type=int, default=2,
+                            help='Number of publishers of every author (default: 2).')
+        parser.add_argument('--log-entries', type=int, default=None,
+                            help='Number of admin log entries (default: the number of authors).')
+        parser.add_argument('--guest-entries', type=int, default=None,
+                            help='Number of guest entries (default: the number of authors).')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows inserted per query (default: 5000).')
+        parser.add_argument('--username', default='admin',
+                            help='Superuser owning the authors and log entries, created if missing.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random generator.')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete the existing rows of the models first.')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Nominates the database to fill. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args, **options):
+        if options['authors'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--authors must be positive and --batch-size at least 1')
+        using = options['database']
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            with transaction.atomic(using=using):
+                for model in (LogEntry, Book, Author, Publisher, GuestEntry):
+                    model._base_manager.using(using).all().delete()
+
+        user = get_user_model()._default_manager.db_manager(using).filter(
+            username=options['username']).first()
+        if user is None:
+            user = get_user_model()._default_manager.db_manager(using).create_superuser(
+                username=options['username'])
+
+        publisher_pks = [publisher.pk for publisher in Publisher._base_manager.using(
+            using).bulk_create([Publisher(name=self.title(i)) for i in range(options['publishers'])],
+                               batch_size=self.batch_size)]
+
+        # the log entries reference authors between the first and last pk.
+        author_count, first_pk, last_pk = 0, None, None
+        authors = (Author(name=self.title(i), age=self.random.choice((1, 2, 60)),
+                          is_vip=not i % 7, user_id=user.pk, gender=self.random.choice(('f', 'm')),
+                          title=self.random.choice((None, 'dr', 'prof')))
+                   for i in range(options['authors']))
+        through = Author.publisher.through
+        while True:
+            # insert the books and publishers of every batch of authors.
+            batch = Author._base_manager.using(using).bulk_create(
+                list(islice(authors, self.batch_size)))
+            if not batch:
+                break
+            author_count += len(batch)
+            first_pk = batch[0].pk if first_pk is None else first_pk
+            last_pk = batch[-1].pk
+            self.insert(using, Book, (
+                Book(title=self.title(author.pk * 31 + i), author_id=author.pk)
+                for author in batch for i in range(options['books_per_author'])))
+            if publisher_pks:
+                self.insert(using, through, (
+                    through(author_id=author.pk, publisher_id=publisher_pk)
+                    for author in batch for publisher_pk in self.random.sample(
+                        publisher_pks, min(options['publishers_per_author'], len(publisher_pks)))))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'inserted {author_count} authors')
+
+        guest_entries = options['guest_entries']
+        guest_entries = options['authors'] if guest_entries is None else guest_entries
+        self.insert(using, GuestEntry, (
+            GuestEntry(date_entered=f'20{i % 25:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}')
+            for i in range(guest_entries)))
+
+        log_entries = options['log_entries']
+        log_entries = options['authors'] if log_entries is None else log_entries
+        if author_count:
+            content_type = ContentType.objects.db_manager(using).get_for_model(Author)
+            self.insert(using, LogEntry, (
+                self.log_entry(user, content_type, self.random.randint(first_pk, last_pk))
+                for _ in range(log_entries)))
+
+        if options['verbosity']:
+            self.stdout.write(
+                f'inserted {len(publisher_pks)} publishers, {author_count} authors, '
+                f'{author_count * options["books_per_author"]} books, {guest_entries} guest entries '
+                f'and {log_entries if author_count else 0} log entries')
+
+    def insert(self, using, model, objs):
+        """
+        Bulk create the objects of the iterable in batches, only one batch is
+        in memory at a time.
+        """
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                return
+            model._base_manager.using(using).bulk_create(batch)
+
+    def title(self, i):
+        words = [WORDS[(i >> shift) % len(WORDS)] for shift in (0, 3, 7)]
+        return f'{" ".join(words)} {i}'
+
+    def log_entry(self, user, content_type, object_id):
+        action_flag = self.random.choice((ADDITION, CHANGE, CHANGE, DELETION))
+        return LogEntry(
+            user_id=user.pk, content_type_id=content_type.pk, object_id=str(object_id),
+            object_repr=self.title(object_id), action_flag=action_flag,
+            change_message='[{"changed": {"fields": ["title"]}}]' if action_flag == CHANGE else '',
+        )
@@ -0,0 +1,49 @@
+import logging
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from django_api_admin.utils.query_counts import (compare_query_counts, dump_query_counts,
+                                                 load_query_counts)
+from test_django_api_admin.query_counts import SNAPSHOT_PATH, record_query_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the number of sql queries of every admin endpoint in a test database "
+        "and write them to the snapshot checked by the query count tests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--snapshot', default=SNAPSHOT_PATH,
+                            help='Snapshot file to write (default: the one of the tests).')
+        parser.add_argument('--check', action='store_true',
+                            help='Exit with a non-zero status if the query counts regressed '
+                                 'instead of writing them.')
+
+    def handle(self, *args, **options):
+        # the failing endpoints are recorded with their status.
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0)
+        try:
+            counts = record_query_counts()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['check']:
+            regressions = compare_query_counts(load_query_counts(options['snapshot']), counts)
+            for regression in regressions:
+                self.stdout.write(regression)
+            if regressions:
+                sys.exit(1)
+            return
+
+        dump_query_counts(options['snapshot'], counts)
+        if options['verbosity']:
+            self.stdout.write(f'recorded the query counts of {len(counts)} endpoints '
+                              f'in {options["snapshot"]}')
@@ -0,0 +1,238 @@
+"""
+Records the number of sql queries of every endpoint of the test admin site on
+datasets of different sizes, used by the query count tests and the
+update_query_counts command that refreshes their snapshot.
+"""
+import json
+import os
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from django_api_admin.utils.force_login import force_login
+from django_api_admin.utils.query_counts import count_queries, get_endpoint_names
+from test_django_api_admin.admin import site
+from test_django_api_admin.models import Author, Book, Publisher
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'tests', 'query_counts.json')
+
+# every model of the admin has this many rows in the measured datasets.
+DATASET_SIZES = (1, 100)
+
+PASSWORD = 'password'
+
+UserModel = get_user_model()
+
+# the models of the measured model admins and inlines.
+MODELS = (UserModel, Group, Publisher, Author, Book)
+
+
+class Dataset:
+    """
+    The rows every endpoint is measured on, ``size`` rows of every model with
+    the books, publishers and admin log entries of the authors.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        call_command('seed_benchmark_data', authors=size, publishers=size,
+                     log_entries=size, guest_entries=size, verbosity=0)
+        self.user = UserModel.objects.get(username='admin')
+        self.user.set_password(PASSWORD)
+        self.user.save()
+        UserModel.objects.bulk_create([UserModel(username=f'user {i}') for i in range(size)])
+        Group.objects.bulk_create([Group(name=f'group {i}') for i in range(size)])
+
+        self.objects = {
+            model: model.objects.exclude(pk=self.user.pk).order_by('pk').first()
+            if model is UserModel else model.objects.order_by('pk').first()
+            for model in MODELS
+        }
+
+    def get_create_data(self, model):
+        publisher = self.objects[Publisher]
+        return {
+            UserModel: {'username': 'created', 'password': PASSWORD},
+            Group: {'name': 'created'},
+            Publisher: {'name': 'created'},
+            Author: {'name': 'created', 'age': 60, 'user': self.user.pk, 'is_vip': False,
+                     'publisher': [publisher.pk]},
+            Book: {'title': 'created', 'author': self.objects[Author].pk,
+                   'credits': [self.objects[Author].pk]},
+        }[model]
+
+    def get_change_data(self, model):
+        return {
+            UserModel: {'first_name': 'changed'},
+            Group: {'name': 'changed'},
+            Publisher: {'name': 'changed'},
+            Author: {'title': 'changed'},
+            Book: {'title': 'changed'},
+        }[model]
+
+
+def get_site_requests(dataset):
+    """
+    Return a dict of the names of the admin site urls and the (method, url
+    kwargs, data) of their measured requests, urls that aren't in the dict are
+    requested with a plain get.
+    """
+    author = dataset.objects[Author]
+    tokens = force_login(APIClient(), dataset.user)
+    return {
+        'token_obtain_pair': ('post', {}, {'username': dataset.user.username,
+                                           'password': PASSWORD}),
+        'token_refresh': ('post', {}, {'refresh': tokens['refresh']}),
+        'password_change': ('post', {}, {'old_password': PASSWORD, 'new_password1': 'changed',
+                                         'new_password2': 'changed'}),
+        'autocomplete': ('get', {}, {'term': 'a', 'app_label': Book._meta.app_label,
+                                     'model_name': Book._meta.model_name,
+                                     'field_name': Author._meta.model_name}),
+        'app_list': ('get', {'app_label': Author._meta.app_label}, None),
+        'view_on_site': ('get', {'content_type_id': ContentType.objects.get_for_model(Author).pk,
+                                 'object_id': author.pk}, None),
+        'profile_detail': ('get', {'profile_id': 'missing'}, None),
+    }
+
+
+def get_model_requests(dataset, model, info):
+    """
+    Return a dict of the names of the urls of a model admin or inline and the
+    (method, url kwargs, data) of their measured requests.
+    """
+    obj = dataset.objects[model]
+    create_data, change_data = dataset.get_create_data(model), dataset.get_change_data(model)
+    object_kwargs = {'object_id': obj.pk}
+    return {
+        info % 'list': ('get', {}, None),
+        info % 'changelist': ('get', {}, None),
+        info % 'changelist_edit': ('post', {}, {obj.pk: change_data}),
+        info % 'changelist_sync': ('get', {}, None),
+        info % 'perform_action': ('post', {}, {
+            'action': 'delete_selected', 'selected_ids': [obj.pk], 'select_across': False}),
+        info % 'export': ('get', {'export_format': 'csv'}, None),
+        info % 'import': ('post', {'import_format': 'ndjson'}, create_data),
+        info % 'batch': ('post', {}, {'operations': [
+            {'action': 'create', 'data': create_data},
+            {'action': 'partial_update', 'id': obj.pk, 'data': change_data},
+        ]}),
+        info % 'multi_detail': ('get', {}, {'ids': obj.pk}),
+        info % 'add': ('post', {}, {'data': create_data}),
+        info % 'detail': ('get', object_kwargs, None),
+        info % 'delete': ('delete', object_kwargs, None),
+        info % 'history': ('get', object_kwargs, None),
+        info % 'change': ('patch', object_kwargs, {'data': change_data}),
+    }
+
+
+def get_skipped_endpoints():
+    """
+    Return a dict of the names of the endpoints that fail with the measured
+    requests and the reason they fail, their query counts aren't recorded
+    until they are fixed.
+    """
+    skipped = {}
+    for model, model_admin in site._registry.items():
+        if model not in MODELS:
+            continue
+        info = '%s_%s_%%s' % (model._meta.app_label, model._meta.model_name)
+        if not model_admin.list_editable:
+            skipped[info % 'changelist_edit'] = 'the model admin has no list_editable fields'
+        for inline in model_admin.inlines:
+            inline_info = info % '%s_%s_%%s' % (
+                inline.model._meta.app_label, inline.model._meta.model_name)
+            for name in ('list', 'detail'):
+                skipped[inline_info % name] = 'the detail url of the inline model can\'t be ' \
+                    'reversed unless the model is registered'
+            for name, method in (('add', 'log_addition'), ('change', 'log_change'),
+                                 ('delete', 'log_deletion')):
+                skipped[inline_info % name] = f'the inline admins have no {method}'
+    return skipped
+
+
+def get_requests(dataset):
+    requests = get_site_requests(dataset)
+    for model, model_admin in site._registry.items():
+        if model not in dataset.objects:
+            continue
+        info = '%s_%s' % (model._meta.app_label, model._meta.model_name)
+        requests.update(get_model_requests(dataset, model, info + '_%s'))
+        for inline in model_admin.inlines:
+            inline_info = '%s_%s_%%s' % (info, '%s_%s' % (
+                inline.model._meta.app_label, inline.model._meta.model_name))
+            requests.update(get_model_requests(dataset, inline.model, inline_info))
+    return requests
+
+
+def send(client, method, url, data):
+    """
+    Send the request and return its status code, the changes are rolled back
+    and the streamed responses are consumed.
+    """
+    with transaction.atomic():
+        if method == 'post' and url.endswith('/import/ndjson/'):
+            response = client.post(url, data=json.dumps(data) + '\n',
+                                   content_type='application/x-ndjson')
+        else:
+            response = getattr(client, method)(
+                url, data, **({} if method == 'get' else {'format': 'json'}))
+        if response.streaming:
+            b''.join(response.streaming_content)
+        transaction.set_rollback(True)
+    return response.status_code
+
+
+def measure(client, url, method, data):
+    """
+    Return the status and the number of queries of a request, it is sent once
+    before to warm up the in process caches like the content types and the
+    shared caches are cleared before the measured request.
+    """
+    # the action serializers are cached with the choices of the first request,
+    # e.g. the one generating the schema, build them for this request.
+    for model_admin in site._registry.values():
+        model_admin.action_serializer = None
+    send(client, method, url, data)
+    for cache in caches.all():
+        cache.clear()
+    return count_queries(lambda: send(client, method, url, data))
+
+
+def record_query_counts(sizes=DATASET_SIZES):
+    """
+    Return a dict of the names of the endpoints of the admin site and their
+    response status and number of queries for every dataset size, every
+    dataset is rolled back after it is measured. the skipped endpoints that
+    still fail are recorded with the reason they are skipped, the ones that
+    succeed are recorded like the others.
+    """
+    # only measure the model admins of the models filled by the datasets.
+    names = get_endpoint_names(site, models=MODELS)
+    skipped = get_skipped_endpoints()
+    results = {}
+    for size in sizes:
+        ContentType.objects.clear_cache()
+        with transaction.atomic():
+            dataset = Dataset(size)
+            # record the status of failing endpoints instead of raising.
+            client = APIClient(raise_request_exception=False)
+            force_login(client, dataset.user)
+            requests = get_requests(dataset)
+            for name in names:
+                method, kwargs, data = requests.get(name, ('get', {}, None))
+                url = reverse('%s:%s' % (site.name, name), kwargs=kwargs)
+                status, queries = measure(client, url, method, data)
+                if name in skipped and status >= 400:
+                    results[name] = {'skipped': skipped[name]}
+                    continue
+                result = results.setdefault(name, {'status': status, 'queries': {}})
+                result['queries'][str(size)] = queries
+            transaction.set_rollback(True)
+    return results
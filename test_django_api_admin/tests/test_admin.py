@@ -1,9 +1,14 @@
 """
 model admin tests.
 """
-from datetime import datetime
+import json
+from unittest import mock
+from datetime import datetime, timedelta
 
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import path, reverse
 
 from rest_framework.test import (APIRequestFactory, APITestCase,
@@ -14,6 +19,8 @@ from test_django_api_admin.admin import site
 
 from django_api_admin.utils.force_login import force_login
 from django_api_admin.constants.vars import TO_FIELD_VAR
+from django_api_admin.models import EXPORT, LogEntry
+from django_api_admin.admin_views.model_admin_views.changelist_edit import ChangeListEditView
 
 
 UserModel = get_user_model()
@@ -62,6 +69,179 @@ class ModelAdminTestCase(APITestCase, URLPatternsTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['name'], 'muhammad')
 
+    def test_multi_detail_view(self):
+        url = reverse('api_admin:%s_%s_multi_detail' % self.author_info)
+        muhammad, omar = Author.objects.get(name='muhammad'), Author.objects.get(name='Omar')
+        # the user and the objects.
+        ContentType.objects.get_for_model(Author)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                url, {'ids': f'{omar.pk},{muhammad.pk},999,{omar.pk}', 'fields': 'name,age'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['name'] for item in response.data['results']],
+                         ['Omar', 'muhammad'])
+        self.assertEqual(set(response.data['results'][0]),
+                         {'pk', 'name', 'age', 'detail_url', 'change_url',
+                          'delete_url', 'history_url', 'view_on_site'})
+        self.assertEqual(response.data['results'][0]['change_url'], 'http://testserver' + reverse(
+            'api_admin:%s_%s_change' % self.author_info, kwargs={'object_id': omar.pk}))
+        self.assertEqual(response.data['missing'], [999])
+
+        response = self.client.get(url, {'ids': muhammad.pk, TO_FIELD_VAR: 'id'})
+        self.assertIn('publisher', response.data['results'][0])
+        self.assertEqual(self.client.get(
+            url, {'ids': muhammad.pk, 'fields': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(
+            url, {'ids': 'muhammad', TO_FIELD_VAR: 'name'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'ids': 'one'}).status_code, 400)
+
+        # the referenced field is loaded with the requested fields.
+        user_url = reverse('api_admin:%s_%s_multi_detail' % (
+            UserModel._meta.app_label, UserModel._meta.model_name))
+        UserModel.objects.bulk_create([UserModel(username=f'user {i}') for i in range(3)])
+        ContentType.objects.get_for_model(UserModel)
+        with mock.patch.object(site._registry[UserModel], 'to_field_allowed', return_value=True), \
+                self.assertNumQueries(2):
+            response = self.client.get(user_url, {
+                'ids': 'user 0,user 1,user 2', TO_FIELD_VAR: 'username', 'fields': 'email'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_sparse_fields(self):
+        url = reverse('api_admin:%s_%s_list' % self.author_info)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'name'})
+        self.assertEqual(set(response.data[0]), {'pk', 'name', 'detail_url'})
+        self.assertNotIn('"age"', queries[-1]['sql'])
+        self.assertEqual(self.client.get(url, {'fields': 'name,nope'}).status_code, 400)
+
+        url = reverse('api_admin:%s_%s_detail' % self.author_info,
+                      kwargs={'object_id': Author.objects.get(name='muhammad').pk})
+        response = self.client.get(url, {'fields': 'age,publisher'})
+        self.assertEqual(response.data['age'], 60)
+        self.assertNotIn('name', response.data)
+        self.assertIn('change_url', response.data)
+
+        url = reverse('api_admin:%s_%s_changelist' % self.author_info)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'columns': 'age,name', 'is_vip__exact': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([column['field'] for column in response.data['columns']],
+                         ['age', 'name'])
+        self.assertEqual(set(response.data['rows'][0]['cells']), {'age', 'name'})
+        self.assertEqual(response.data['config']['result_count'], 2)
+        self.assertNotIn('"title"', queries[-1]['sql'])
+        self.assertEqual(self.client.get(url, {'columns': 'gender'}).status_code, 400)
+
+    def test_columnar_format(self):
+        url = reverse('api_admin:%s_%s_changelist' % self.author_info)
+        expected = self.client.get(url, {'columns': 'name,age'}).data
+        response = self.client.get(url, {'columns': 'name,age', 'format': 'columnar'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'],
+                         'application/vnd.django-api-admin.columnar+json')
+        data = json.loads(response.content)
+        self.assertEqual(data['columns'], expected['columns'])
+        self.assertEqual(data['rows'], [[row['id'], *row['cells'].values()]
+                                        for row in expected['rows']])
+        row = expected['rows'][0]
+        self.assertEqual(data['url_templates']['change_url'].replace(
+            data['url_placeholder'], str(row['id'])), row['change_url'])
+
+        url = reverse('api_admin:%s_%s_list' % self.author_info)
+        expected = self.client.get(url).data
+        response = self.client.get(
+            url, HTTP_ACCEPT='application/vnd.django-api-admin.columnar+json')
+        data = json.loads(response.content)
+        self.assertEqual([dict(zip(data['columns'], row)) for row in data['rows']],
+                         json.loads(json.dumps([{key: value for key, value in item.items()
+                                                 if key != 'detail_url'} for item in expected])))
+        self.assertEqual(data['url_templates']['detail_url'].replace(
+            data['url_placeholder'], str(expected[0]['pk'])), expected[0]['detail_url'])
+
+    def test_streaming_responses(self):
+        model_admin = site._registry[Author]
+        self.client.post(reverse('api_admin:%s_%s_changelist_edit' % self.author_info),
+                         data={1: {'title': 'prophet'}}, format='json')
+        urls = [
+            (model_admin, reverse('api_admin:%s_%s_changelist' % self.author_info) + '?all=1'),
+            (model_admin, reverse('api_admin:%s_%s_list' % self.author_info) + '?page_size=400'),
+            (site, reverse('api_admin:admin_log') + '?page_size=400'),
+        ]
+        for admin, url in urls:
+            expected = json.loads(self.client.get(url).content)
+            with mock.patch.object(admin, 'stream_threshold', 1), \
+                    mock.patch.object(admin, 'stream_chunk_size', 2):
+                response = self.client.get(url)
+            self.assertTrue(response.streaming)
+            self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+    def test_changelist_sync_view(self):
+        url = reverse('api_admin:%s_%s_changelist_sync' % self.author_info)
+        batch_url = reverse('api_admin:%s_%s_batch' % self.author_info)
+        muhammad, ali, omar = (Author.objects.get(name=name)
+                               for name in ('muhammad', 'Ali', 'Omar'))
+        response = self.client.get(url, {'is_vip__exact': 1})
+        self.assertTrue(response.data['reset'])
+        token = response.data['token']
+
+        self.client.post(batch_url, data={'operations': [
+            {'action': 'partial_update', 'id': muhammad.pk, 'data': {'title': 'prophet'}},
+            {'action': 'partial_update', 'id': ali.pk, 'data': {'title': 'imam'}},
+            {'action': 'delete', 'id': omar.pk},
+        ]}, format='json')
+        response = self.client.get(url, {'is_vip__exact': 1, 'since': token})
+        self.assertFalse(response.data['reset'])
+        self.assertEqual([row['id'] for row in response.data['rows']], [muhammad.pk])
+        self.assertEqual(response.data['rows'][0]['cells']['title'], 'prophet')
+        self.assertEqual(response.data['removed'], [ali.pk])
+        self.assertEqual(response.data['deleted'], [omar.pk])
+
+        token = response.data['token']
+        response = self.client.get(url, {'is_vip__exact': 1, 'since': token})
+        self.assertEqual((response.data['rows'], response.data['deleted']), ([], []))
+        self.assertEqual(self.client.get(url, {'since': 'bad'}).status_code, 400)
+
+        # changes found with a timestamp field.
+        model_admin = site._registry[Author]
+        with mock.patch.object(model_admin, 'sync_field', 'date_joined'):
+            token = self.client.get(url).data['token']
+            khalid = Author.objects.create(name='Khalid', age=60, user=self.user)
+            response = self.client.get(url, {'since': token})
+            self.assertEqual([row['id'] for row in response.data['rows']], [khalid.pk])
+            response = self.client.get(url, {'since': response.data['token']})
+            self.assertEqual(response.data['rows'], [])
+
+            # a change committed after a later one was synced is caught once.
+            token = response.data['token']
+            Author.objects.filter(pk=ali.pk).update(
+                date_joined=khalid.date_joined - timedelta(seconds=1))
+            response = self.client.get(url, {'since': token})
+            self.assertEqual([row['id'] for row in response.data['rows']], [ali.pk])
+            response = self.client.get(url, {'since': response.data['token']})
+            self.assertEqual(response.data['rows'], [])
+
+        # the same for the admin log entries.
+        token = self.client.get(url).data['token']
+        self.client.post(batch_url, data={'operations': [
+            {'action': 'partial_update', 'id': muhammad.pk, 'data': {'title': 'imam'}},
+        ]}, format='json')
+        self.client.post(batch_url, data={'operations': [
+            {'action': 'partial_update', 'id': ali.pk, 'data': {'title': 'caliph'}},
+        ]}, format='json')
+        # the entry of the first change commits late.
+        late_entry = LogEntry.objects.filter(object_id=str(muhammad.pk)).latest('pk')
+        late_pk = late_entry.pk
+        late_entry.delete()
+        response = self.client.get(url, {'since': token})
+        self.assertEqual([row['id'] for row in response.data['rows']], [ali.pk])
+        late_entry.pk = late_pk
+        late_entry.save()
+        response = self.client.get(url, {'since': response.data['token']})
+        self.assertEqual([row['id'] for row in response.data['rows']], [muhammad.pk])
+        response = self.client.get(url, {'since': response.data['token']})
+        self.assertEqual(response.data['rows'], [])
+
     def test_performing_custom_actions(self):
         action_dict = {
             'action': 'make_old',
@@ -229,3 +409,259 @@ class ModelAdminTestCase(APITestCase, URLPatternsTestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['rows'][0]['cells']['name'], 'muhammad')
+
+    def test_changelist_time_budgets(self):
+        model_admin = site._registry[Author]
+        url = reverse('api_admin:%s_%s_changelist' % self.author_info)
+        # check the sqlite deadline on every instruction, every query overruns.
+        with mock.patch('django_api_admin.utils.query_budget.SQLITE_PROGRESS_STEPS', 1):
+            with mock.patch.object(model_admin, 'count_time_budget', 1e-9):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['config']['degraded'], ['count', 'full_count'])
+            self.assertIsNone(response.data['config']['result_count'])
+            self.assertFalse(response.data['config']['multi_page'])
+            self.assertEqual(len(response.data['rows']), 3)
+
+            # the next page is known without the count.
+            with mock.patch.object(model_admin, 'count_time_budget', 1e-9), \
+                    mock.patch.object(model_admin, 'list_per_page', 2):
+                response = self.client.get(url)
+            self.assertIsNone(response.data['config']['result_count'])
+            self.assertTrue(response.data['config']['multi_page'])
+            self.assertEqual(len(response.data['rows']), 2)
+
+            # the choices of the name filter are queried.
+            with mock.patch.object(model_admin, 'page_time_budget', 1e-9), \
+                    mock.patch.object(model_admin, 'filter_choices_time_budget', 1e-9), \
+                    mock.patch.object(model_admin, 'list_filter', ('is_vip', 'name')):
+                response = self.client.get(url, {'q': 'muhammad'})
+            self.assertEqual(response.data['rows'], [])
+            self.assertEqual(response.data['config']['result_count'], 1)
+            self.assertEqual(response.data['config']['degraded'], ['page', 'filter_choices'])
+            self.assertEqual(response.data['config']['filters'], [])
+            self.assertTrue(response.data['config']['refine_search'])
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['config']['degraded'], [])
+        self.assertFalse(response.data['config']['refine_search'])
+
+    def test_export_view(self):
+        url = reverse('api_admin:%s_%s_export' % self.author_info,
+                      kwargs={'export_format': 'csv'})
+        response = self.client.get(url, {'is_vip__exact': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines, [
+            'name,age,user,is_old_enough,title',
+            f'Omar,60,{self.user.pk},True,',
+            f'muhammad,60,{self.user.pk},True,',
+        ])
+
+        # text that would run as a spreadsheet formula is quoted.
+        Author.objects.filter(name='Omar').update(title='=HYPERLINK("http://example.com")')
+        response = self.client.get(url, {'is_vip__exact': 1})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[1], f'Omar,60,{self.user.pk},True,"\'=HYPERLINK(""http://example.com"")"')
+
+        url = reverse('api_admin:%s_%s_export' % self.author_info,
+                      kwargs={'export_format': 'ndjson'})
+        response = self.client.get(url, {'q': 'ali'})
+        self.assertEqual(
+            [json.loads(line)
+             for line in b''.join(response.streaming_content).splitlines()],
+            [{'name': 'Ali', 'age': 20, 'user': self.user.pk, 'is_old_enough': True, 'title': None}])
+
+        log_entry = LogEntry.objects.filter(action_flag=EXPORT).first()
+        self.assertEqual(log_entry.user, self.user)
+        self.assertEqual(log_entry.object_repr, 'authors')
+        self.assertEqual(log_entry.get_change_message(), 'Exported as ndjson.')
+
+        url = reverse('api_admin:%s_%s_export' % self.author_info,
+                      kwargs={'export_format': 'xml'})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        staff_user = UserModel.objects.create_user(
+            username='staff', is_staff=True)
+        force_login(self.client, staff_user)
+        url = reverse('api_admin:%s_%s_export' % self.author_info,
+                      kwargs={'export_format': 'csv'})
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_import_view(self):
+        url = reverse('api_admin:%s_%s_import' % self.author_info,
+                      kwargs={'import_format': 'csv'})
+        publishers = list(Publisher.objects.values_list('pk', flat=True)[:2])
+        content = (
+            'name,age,user,title,publisher\n'
+            f'Khalid,60,{self.user.pk},,{publishers[0]}\n'
+            f'Hamza,old,{self.user.pk},,{publishers[0]}\n'
+            f'"Zaid\nibn Thabit",1,{self.user.pk},scribe,"{publishers[0]},{publishers[1]}"\n'
+        )
+        response = self.client.post(
+            url + '?dry_run=1', data=content, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rows'], 3)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual([error['line']
+                         for error in response.data['errors']], [3])
+        self.assertIn('age', response.data['errors'][0]['errors'])
+        self.assertFalse(Author.objects.filter(name='Khalid').exists())
+
+        response = self.client.post(url, data=content, content_type='text/csv')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['error_count'], 1)
+        self.assertIsNone(Author.objects.get(name='Khalid').title)
+        zaid = Author.objects.get(name='Zaid\nibn Thabit')
+        self.assertEqual(zaid.title, 'scribe')
+        self.assertEqual(zaid.publisher.count(), 2)
+
+        url = reverse('api_admin:%s_%s_import' % self.author_info,
+                      kwargs={'import_format': 'ndjson'})
+        content = '\n'.join([
+            json.dumps({'name': 'Bilal', 'age': 2,
+                       'user': self.user.pk, 'publisher': publishers}),
+            '',
+            'not json',
+        ])
+        response = self.client.post(
+            url, data=content, content_type='application/x-ndjson')
+        self.assertEqual(response.data['rows'], 2)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertEqual(
+            list(Author.objects.get(name='Bilal').publisher.values_list('pk', flat=True)), publishers)
+
+        log_entries = LogEntry.objects.filter(object_repr='authors')
+        self.assertEqual([entry.get_change_message() for entry in log_entries], [
+            'Imported 1 of 2 rows from ndjson.', 'Imported 2 of 3 rows from csv.'])
+
+        # the rows before a line that isn't utf-8 are imported and logged.
+        url = reverse('api_admin:%s_%s_import' % self.author_info,
+                      kwargs={'import_format': 'csv'})
+        content = (
+            'name,age,user,title,publisher\n'
+            f'Sumayya,60,{self.user.pk},,{publishers[0]}\n'
+            f'Ammar,1,{self.user.pk},,{publishers[0]}\n'
+        ).encode() + f'Yasir,60,{self.user.pk},,{publishers[0]}\n'.encode('utf-16')
+        response = self.client.post(url, data=content, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rows'], 2)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['error_count'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 4)
+        self.assertEqual(LogEntry.objects.filter(object_repr='authors').first()
+                         .get_change_message(), 'Imported 2 of 2 rows from csv.')
+
+    def test_changelist_edit_view(self):
+        url = reverse('api_admin:%s_%s_changelist_edit' % self.author_info)
+        muhammad, ali, omar = (Author.objects.get(name=name)
+                               for name in ('muhammad', 'Ali', 'Omar'))
+        omar.title = 'caliph'
+        omar.save()
+
+        # only list_editable fields can be edited.
+        response = self.client.post(url, data={
+            muhammad.pk: {'title': 'prophet'}, ali.pk: {'name': 'Zaid'}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data['errors']), [str(ali.pk)])
+        self.assertIsNone(Author.objects.get(pk=muhammad.pk).title)
+
+        # the user, the rows, the update and the log entries in a savepoint.
+        ContentType.objects.get_for_model(Author)
+        with self.assertNumQueries(6):
+            response = self.client.post(url, data={
+                muhammad.pk: {'title': 'prophet'}, ali.pk: {'title': 'imam'},
+                omar.pk: {'title': 'caliph'}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data['changed']), [muhammad.pk, ali.pk])
+        self.assertEqual(Author.objects.get(pk=ali.pk).title, 'imam')
+        self.assertEqual([entry.get_change_message() for entry in LogEntry.objects.all()],
+                         ['Changed title.', 'Changed title.'])
+
+        response = self.client.post(
+            url, data={999: {'title': 'none'}}, format='json')
+        self.assertIn('999', response.data['errors'])
+
+        # foreign keys are compared without loading the related objects.
+        other_user = UserModel.objects.create_user(username='other')
+        view = ChangeListEditView(model_admin=site._registry[Author])
+        serializers = [mock.Mock(instance=obj, validated_data={
+            'user': other_user if obj.pk == ali.pk else self.user})
+            for obj in Author.objects.in_bulk([muhammad.pk, ali.pk]).values()]
+        with self.assertNumQueries(0):
+            changes = view.get_changes(serializers)
+        self.assertEqual([serializer.instance.pk for serializer, data in changes], [ali.pk])
+
+    def test_batch_view(self):
+        url = reverse('api_admin:%s_%s_batch' % self.author_info)
+        muhammad, ali, omar = (Author.objects.get(name=name)
+                               for name in ('muhammad', 'Ali', 'Omar'))
+        publisher = Publisher.objects.first().pk
+        operations = [
+            {'action': 'create', 'data': {'name': 'Khalid', 'age': 60,
+                                          'user': self.user.pk, 'publisher': [publisher]}},
+            {'action': 'partial_update', 'id': muhammad.pk, 'data': {'title': 'prophet'}},
+            {'action': 'delete', 'id': omar.pk},
+            {'action': 'partial_update', 'id': ali.pk, 'data': {'age': 'old'}},
+            {'action': 'delete', 'id': 999},
+        ]
+
+        # atomic batches are not saved when any operation fails.
+        response = self.client.post(
+            url, data={'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         [424, 424, 424, 400, 404])
+        self.assertIn('age', response.data['results'][3]['errors'])
+        self.assertFalse(Author.objects.filter(name='Khalid').exists())
+        self.assertTrue(Author.objects.filter(pk=omar.pk).exists())
+
+        response = self.client.post(
+            url, data={'atomic': False, 'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         [201, 200, 204, 400, 404])
+        khalid = Author.objects.get(name='Khalid')
+        self.assertEqual(response.data['results'][0]['id'], khalid.pk)
+        self.assertEqual(list(khalid.publisher.values_list('pk', flat=True)), [publisher])
+        self.assertEqual(Author.objects.get(pk=muhammad.pk).title, 'prophet')
+        self.assertFalse(Author.objects.filter(pk=omar.pk).exists())
+
+        log_entries = LogEntry.objects.order_by('action_flag')
+        self.assertEqual([(entry.action_flag, entry.object_repr) for entry in log_entries],
+                         [(1, 'Khalid'), (2, 'muhammad'), (3, 'Omar')])
+        self.assertEqual(log_entries[1].get_change_message(),
+                         'Changed title for author “muhammad”.')
+
+        response = self.client.post(url, data={'operations': [
+            {'action': 'delete', 'id': ali.pk}, {'action': 'delete', 'id': ali.pk},
+            {'action': 'merge'}]}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']],
+                         [424, 400, 400])
+
+        # failed saves are retried one by one, from the objects as they were
+        # loaded, and deletions go through the model admin.
+        LogEntry.objects.all().delete()
+        with mock.patch.object(site._registry[Author], 'delete_queryset',
+                               side_effect=IntegrityError('protected')) as delete_queryset:
+            response = self.client.post(url, data={'atomic': False, 'operations': [
+                {'action': 'partial_update', 'id': ali.pk, 'data': {'title': 'imam'}},
+                {'action': 'delete', 'id': muhammad.pk}]}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 400])
+        self.assertEqual(delete_queryset.call_count, 2)
+        self.assertEqual(Author.objects.get(pk=ali.pk).title, 'imam')
+        self.assertEqual([entry.get_change_message() for entry in LogEntry.objects.all()],
+                         ['Changed title for author “Ali”.'])
+
+        # the created objects have primary keys on backends that can't return
+        # them from bulk inserts.
+        publisher_url = reverse('api_admin:%s_%s_batch' % (
+            Publisher._meta.app_label, Publisher._meta.model_name))
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            response = self.client.post(publisher_url, data={'operations': [
+                {'action': 'create', 'data': {'name': 'stone'}}]}, format='json')
+        self.assertEqual(response.data['results'][0]['id'], Publisher.objects.get(name='stone').pk)
+        self.assertEqual(LogEntry.objects.get(object_repr='stone').object_id,
+                         str(response.data['results'][0]['id']))
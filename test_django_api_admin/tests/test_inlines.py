@@ -4,7 +4,8 @@ inline admins views.
 from django.contrib.auth import get_user_model
 from django.urls import path, reverse
 
-from rest_framework.test import (APITestCase,
+from rest_framework.request import Request
+from rest_framework.test import (APIRequestFactory, APITestCase,
                                  URLPatternsTestCase)
 
 from test_django_api_admin.models import Author, Book, Publisher
@@ -164,3 +165,12 @@ class InlineModelAdminTestCase(APITestCase, URLPatternsTestCase):
         }
         response = self.client.put(url, data=data, format="json")
         self.assertEqual(response.status_code, 400)
+
+    def test_inline_sparse_fields(self):
+        inline = site._registry[Author].inlines[0](Author, site)
+        request = Request(APIRequestFactory().get('/', {'fields': 'title'}))
+        fields = inline.get_sparse_fields(request)
+        self.assertEqual(fields, ('title',))
+        self.assertEqual(set(inline.get_sparse_serializer_class(fields)().fields), {'pk', 'title'})
+        book = inline.get_object(request, str(self.a1_b1.pk), fields=fields)
+        self.assertEqual(book.get_deferred_fields(), {'author_id'})
@@ -0,0 +1,62 @@
+"""
+query count regression tests, refresh the snapshot after an intended change with
+``python manage.py update_query_counts``.
+
+the endpoints whose queries are recorded as growing with the number of rows,
+e.g. list, autocomplete and admin_log, are only checked against their recorded
+number of queries for every dataset size, a new n+1 query on them is caught
+only when it adds to the recorded counts. the endpoints that fail with the
+measured requests are skipped, see get_skipped_endpoints.
+"""
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from django_api_admin.utils.query_counts import compare_query_counts
+
+
+class QueryCountTestCase(SimpleTestCase):
+
+    def test_query_counts(self):
+        # measure in a new process, the models and signal receivers registered
+        # by the other tests add queries.
+        result = subprocess.run(
+            [sys.executable, 'manage.py', 'update_query_counts', '--check'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, 'query counts regressed, run "python manage.py '
+                         'update_query_counts" if intended:\n' + result.stdout + result.stderr)
+
+    def test_compare_query_counts(self):
+        expected = {
+            'index': {'status': 200, 'queries': {'1': 4, '100': 4}},
+            'list': {'status': 200, 'queries': {'1': 4, '100': 4}},
+            'admin_log': {'status': 200, 'queries': {'1': 10, '100': 30}},
+            'inline': {'skipped': 'broken'},
+            'edit': {'skipped': 'broken'},
+        }
+        self.assertEqual(compare_query_counts(expected, {
+            'index': {'status': 200, 'queries': {'1': 3, '100': 3}},
+            'admin_log': {'status': 200, 'queries': {'1': 10, '100': 30}},
+            'inline': {'skipped': 'broken'},
+        }), [])
+        self.assertEqual(compare_query_counts(expected, {
+            'index': {'status': 200, 'queries': {'1': 5, '100': 5}},
+            'list': {'status': 400, 'queries': {'1': 4, '100': 104}},
+            'admin_log': {'status': 200, 'queries': {'1': 10, '100': 31}},
+            'new': {'status': 200, 'queries': {'1': 1, '100': 1}},
+            'inline': {'skipped': 'broken'},
+            'edit': {'status': 200, 'queries': {'1': 4, '100': 4}},
+            'index_skipped': {'skipped': 'broken'},
+        }), [
+            'index runs 5 queries with 1 rows, 4 expected',
+            'index runs 5 queries with 100 rows, 4 expected',
+            'list responded with 400, expected 200',
+            'list runs more queries with more rows: 4 with 1, 104 with 100',
+            'list runs 104 queries with 100 rows, 4 expected',
+            'admin_log runs 31 queries with 100 rows, 30 expected',
+            'new has no recorded query counts',
+            'edit has no recorded query counts',
+            'index_skipped is skipped: broken',
+        ])
@@ -0,0 +1,85 @@
+"""
+read replica routing tests.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from test_django_api_admin.models import Author
+from test_django_api_admin.admin import site
+from django_api_admin.models import LogEntry
+from django_api_admin.sites import READ_AFTER_WRITE_KEY
+from django_api_admin.utils.force_login import force_login
+
+UserModel = get_user_model()
+
+
+class ReadReplicaTestCase(APITestCase, URLPatternsTestCase):
+    databases = {'default', 'replica'}
+    urlpatterns = [
+        path('api_admin/', site.urls),
+    ]
+
+    def setUp(self) -> None:
+        self.user = UserModel.objects.create_superuser(username='admin')
+        force_login(self.client, self.user)
+        # the objects only exist on the primary, the replica is empty.
+        self.author = Author.objects.create(name='muhammad', age=60, user=self.user)
+        self.author_info = (Author._meta.app_label, Author._meta.model_name)
+
+        patcher = mock.patch.object(site, 'read_db_alias', 'replica')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(caches[site.read_after_write_cache_alias].clear)
+
+    def test_read_views(self):
+        urls = [
+            reverse('api_admin:%s_%s_list' % self.author_info),
+            reverse('api_admin:%s_%s_changelist' % self.author_info),
+            reverse('api_admin:%s_%s_export' % self.author_info,
+                    kwargs={'export_format': 'ndjson'}),
+            reverse('api_admin:admin_log'),
+        ]
+        for url in urls:
+            with CaptureQueriesContext(connections['replica']) as queries:
+                response = self.client.get(url)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertTrue(queries.captured_queries, url)
+
+        response = self.client.get(reverse('api_admin:%s_%s_list' % self.author_info))
+        self.assertEqual(response.data, [])
+        response = self.client.get(reverse(
+            'api_admin:%s_%s_detail' % self.author_info, kwargs={'object_id': self.author.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_read_your_writes(self):
+        list_url = reverse('api_admin:%s_%s_list' % self.author_info)
+        # write views keep using the primary.
+        response = self.client.patch(reverse('api_admin:%s_%s_change' % self.author_info, kwargs={
+            'object_id': self.author.pk}), {'data': {'name': 'ali'}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(LogEntry.objects.using('default').exists())
+
+        # the reads of the user stick to the primary after their write.
+        with CaptureQueriesContext(connections['replica']) as queries:
+            response = self.client.get(list_url)
+        self.assertEqual([author['name'] for author in response.data], ['ali'])
+        self.assertEqual(queries.captured_queries, [])
+
+        caches[site.read_after_write_cache_alias].clear()
+        cache = caches[site.read_after_write_cache_alias]
+        with mock.patch.object(cache, 'get', wraps=cache.get) as get:
+            response = self.client.get(reverse('api_admin:%s_%s_changelist' % self.author_info))
+        self.assertEqual(response.data['rows'], [])
+        # the recent writes are looked up once for all the queries of the request.
+        self.assertEqual([call for call in get.call_args_list
+                          if call.args[0].startswith('django_api_admin:read_after_write')], [
+            mock.call(READ_AFTER_WRITE_KEY % self.user.pk)])
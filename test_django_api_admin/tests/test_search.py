@@ -0,0 +1,241 @@
+"""
+search backend tests.
+"""
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import path, reverse
+
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from test_django_api_admin.models import Author, Publisher
+from django_api_admin.admins.model_admin import APIModelAdmin
+from django_api_admin.search import SQLiteFTSSearchBackend, TrigramSearchBackend
+from django_api_admin.sites import APIAdminSite
+from django_api_admin.utils.force_login import force_login
+
+UserModel = get_user_model()
+
+search_site = APIAdminSite(name='search_admin', include_auth=False)
+
+
+class FTSAuthorAPIAdmin(APIModelAdmin):
+    list_display = ('name', 'title')
+    list_editable = ('title',)
+    search_fields = ('name', 'title', 'publisher__name')
+    search_backend = SQLiteFTSSearchBackend
+
+
+search_site.register(Author, FTSAuthorAPIAdmin)
+
+
+class SQLiteFTSSearchBackendTestCase(APITestCase, URLPatternsTestCase):
+    urlpatterns = [
+        path('search_admin/', search_site.urls),
+    ]
+
+    def setUp(self) -> None:
+        self.user = UserModel.objects.create_superuser(username='admin')
+        force_login(self.client, self.user)
+        self.model_admin = search_site._registry[Author]
+        self.publisher = Publisher.objects.create(name='penguin books')
+        self.author = Author.objects.create(
+            name='chinua achebe', age=60, user=self.user)
+        self.other_author = Author.objects.create(
+            name='achebe achebe', age=1, user=self.user)
+
+    def search(self, term):
+        queryset, may_have_duplicates = self.model_admin.get_search_results(
+            Author.objects.all(), term)
+        self.assertFalse(may_have_duplicates)
+        return set(queryset.values_list('name', flat=True))
+
+    def test_search(self):
+        self.assertEqual(self.search('chin'), {'chinua achebe'})
+        self.assertEqual(self.search('ACHE'), {
+                         'chinua achebe', 'achebe achebe'})
+        self.assertEqual(self.search('"chinua achebe"'), {'chinua achebe'})
+        self.assertEqual(self.search('achebe chinua'), {'chinua achebe'})
+        self.assertEqual(self.search('-'), set())
+
+    def test_index_follows_changes(self):
+        self.author.publisher.add(self.publisher)
+        self.assertEqual(self.search('penguin'), {'chinua achebe'})
+
+        self.publisher.name = 'heinemann'
+        self.publisher.save()
+        self.assertEqual(self.search('penguin'), set())
+        self.assertEqual(self.search('heinemann'), {'chinua achebe'})
+
+        self.publisher.delete()
+        self.assertEqual(self.search('heinemann'), set())
+
+        self.author.name = 'wole soyinka'
+        self.author.save()
+        self.assertEqual(self.search('chinua'), set())
+        self.assertEqual(self.search('wole'), {'wole soyinka'})
+
+        self.author.delete()
+        self.assertEqual(self.search('wole'), set())
+
+    def test_import_is_indexed(self):
+        url = reverse('search_admin:test_django_api_admin_author_import',
+                      kwargs={'import_format': 'ndjson'})
+        content = json.dumps({'name': 'ngugi', 'age': 60, 'gender': 'male', 'user': self.user.pk,
+                              'publisher': [self.publisher.pk]})
+        response = self.client.post(url, data=content, content_type='application/x-ndjson')
+        self.assertEqual(response.data['created'], 1)
+        # bulk_create doesn't send post_save.
+        self.assertEqual(self.search('ngugi'), {'ngugi'})
+        self.assertEqual(self.search('penguin'), {'ngugi'})
+
+    def test_batch_is_indexed(self):
+        url = reverse('search_admin:test_django_api_admin_author_batch')
+        response = self.client.post(url, data={'operations': [
+            {'action': 'create', 'data': {'name': 'ngugi', 'age': 60, 'gender': 'male',
+                                          'user': self.user.pk, 'publisher': [self.publisher.pk]}},
+            {'action': 'partial_update', 'id': self.author.pk, 'data': {'name': 'soyinka'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # bulk_create and bulk_update don't send post_save.
+        self.assertEqual(self.search('ngugi'), {'ngugi'})
+        self.assertEqual(self.search('soyinka'), {'soyinka'})
+        self.assertEqual(self.search('chinua'), set())
+
+    def test_changelist_edit_is_indexed(self):
+        url = reverse('search_admin:test_django_api_admin_author_changelist_edit')
+        response = self.client.post(url, data={self.author.pk: {'title': 'elder'}}, format='json')
+        self.assertEqual(response.data['changed'], [self.author.pk])
+        # bulk_update doesn't send post_save.
+        self.assertEqual(self.search('elder'), {'chinua achebe'})
+
+    def test_rebuild_command(self):
+        # bulk updates don't send signals.
+        Author.objects.filter(pk=self.author.pk).update(name='ngugi')
+        self.assertEqual(self.search('ngugi'), set())
+        out = StringIO()
+        call_command('rebuild_search_index', 'test_django_api_admin.author',
+                     site='search_admin', stdout=out)
+        self.assertIn('indexed 2 authors', out.getvalue())
+        self.assertEqual(self.search('ngugi'), {'ngugi'})
+
+    def test_changelist_ranking(self):
+        url = reverse('search_admin:test_django_api_admin_author_changelist')
+        response = self.client.get(url, {'q': 'achebe'})
+        self.assertEqual(response.status_code, 200)
+        # the author matching the term twice ranks first.
+        self.assertEqual([row['cells']['name'] for row in response.data['rows']],
+                         ['achebe achebe', 'chinua achebe'])
+
+        response = self.client.get(url, {'q': 'achebe', 'o': '1'})
+        self.assertEqual([row['cells']['name'] for row in response.data['rows']],
+                         ['achebe achebe', 'chinua achebe'])
+        response = self.client.get(url, {'q': 'achebe', 'o': '-1'})
+        self.assertEqual([row['cells']['name'] for row in response.data['rows']],
+                         ['chinua achebe', 'achebe achebe'])
+
+    def test_empty_index_falls_back(self):
+        search_backend = self.model_admin.get_search_backend()
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM %s' % connection.ops.quote_name(search_backend.table))
+        search_backend.populated.clear()
+        self.addCleanup(search_backend.populated.clear)
+        # the default search is used until the objects are indexed.
+        queryset, _ = self.model_admin.get_search_results(Author.objects.all(), 'chinua')
+        self.assertEqual(set(queryset.values_list('name', flat=True)), {'chinua achebe'})
+        self.assertEqual(search_backend.populated, set())
+        search_backend.rebuild()
+        self.assertEqual(self.search('chin'), {'chinua achebe'})
+        self.assertEqual(search_backend.populated, {'default'})
+
+    def test_shadow_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT rowid FROM %s ORDER BY rowid' %
+                           connection.ops.quote_name(self.model_admin.get_search_backend().table))
+            self.assertEqual([row[0] for row in cursor.fetchall()],
+                             [self.author.pk, self.other_author.pk])
+
+
+class TrigramAuthorAPIAdmin(APIModelAdmin):
+    search_fields = ('name', '^publisher__name')
+    search_backend = TrigramSearchBackend
+
+
+class TrigramSearchBackendTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModel.objects.create_superuser(username='admin')
+        self.model_admin = TrigramAuthorAPIAdmin(Author, search_site)
+        self.backend = self.model_admin.get_search_backend()
+        self.publisher = Publisher.objects.create(name='penguin books')
+        self.author = Author.objects.create(
+            name='chinua achebe', age=60, user=self.user)
+        self.other_author = Author.objects.create(
+            name='achebe achebe', age=1, user=self.user)
+
+    def search(self, term):
+        # the default search the backend falls back to may have duplicates.
+        queryset, may_have_duplicates = self.model_admin.get_search_results(
+            Author.objects.all(), term)
+        return set(queryset.values_list('name', flat=True))
+
+    def test_search(self):
+        self.assertEqual(self.search('ch'), {'chinua achebe', 'achebe achebe'})
+        self.assertEqual(self.search('HINU'), {'chinua achebe'})
+        self.assertEqual(self.search('x achebe'), set())
+        self.assertEqual(self.search('"a ache"'), {'chinua achebe'})
+        self.assertEqual(self.search('achebe chinua'), {'chinua achebe'})
+
+    def test_successive_terms_narrow_cached_results(self):
+        index = self.backend.get_index('default')
+        self.search('a')
+        # the next keystrokes only recheck the objects matching the previous term.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.search('ach'), {
+                             'chinua achebe', 'achebe achebe'})
+            self.assertEqual(list(index.results), ['a', 'ach'])
+            self.backend.get_candidates = lambda index, term: set()
+            self.assertEqual(self.search('ach'), {
+                             'chinua achebe', 'achebe achebe'})
+
+    def test_index_follows_changes(self):
+        self.assertEqual(self.search('pen'), set())
+        self.author.publisher.add(self.publisher)
+        self.assertEqual(self.search('pen'), {'chinua achebe'})
+        # publisher names are matched as prefixes.
+        self.assertEqual(self.search('books'), set())
+
+        self.author.name = 'wole soyinka'
+        self.author.save()
+        self.assertEqual(self.search('chinua'), set())
+        self.assertEqual(self.search('wole'), {'wole soyinka'})
+
+        self.publisher.delete()
+        self.assertEqual(self.search('pen'), set())
+        self.author.delete()
+        self.assertEqual(self.search('wole'), set())
+        self.assertNotIn(self.author.pk, self.backend.get_index('default').documents)
+
+    def test_eviction(self):
+        self.backend.max_cached_terms = 2
+        for term in ('a', 'b', 'c'):
+            self.search(term)
+        self.assertEqual(
+            list(self.backend.get_index('default').results), ['b', 'c'])
+
+        self.backend.max_cached_pks = 1
+        self.search('ache')
+        self.assertEqual(list(self.backend.get_index('default').results), [])
+
+    def test_fallback(self):
+        self.backend.max_results = 1
+        self.assertEqual(self.search('ache'), {
+                         'chinua achebe', 'achebe achebe'})
+
+        self.backend.max_objects = 1
+        self.backend.rebuild()
+        self.assertIsNone(self.backend.get_index('default'))
+        self.assertEqual(self.search('chinua'), {'chinua achebe'})
@@ -0,0 +1,160 @@
+"""
+request coalescing tests.
+"""
+import threading
+import time
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+
+from rest_framework.test import APITransactionTestCase, URLPatternsTestCase
+
+from django_api_admin.changelist import ChangeList
+from django_api_admin.utils.force_login import force_login
+from django_api_admin.utils.single_flight import SingleFlight, _Call, changelist_flights
+from test_django_api_admin.admin import site
+from test_django_api_admin.models import Author
+
+UserModel = get_user_model()
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.flights = SingleFlight()
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def compute(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return 42
+
+    def run_in_threads(self, count, fn):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fn()))
+                   for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_calls_share_one_computation(self):
+        leader, results = self.run_in_threads(
+            1, lambda: self.flights.do('key', self.compute, timeout=5))
+        self.started.wait(5)
+        followers, follower_results = self.run_in_threads(
+            4, lambda: self.flights.do('key', self.compute, timeout=5))
+        # give the followers the time to join the in-flight call.
+        time.sleep(0.1)
+        self.release.set()
+        for thread in leader + followers:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results + follower_results, [42] * 5)
+        self.assertEqual(self.flights.in_flight(), 0)
+
+    def test_waiting_is_bounded(self):
+        leader, _ = self.run_in_threads(
+            1, lambda: self.flights.do('key', self.compute, timeout=5))
+        self.started.wait(5)
+        # the follower stops waiting and computes the value itself.
+        self.assertEqual(self.flights.do('key', lambda: 7, timeout=0.01), 7)
+        self.release.set()
+        leader[0].join()
+        self.assertEqual(self.calls, 1)
+
+    def test_failed_computation_is_not_shared(self):
+        def fail():
+            self.started.set()
+            self.release.wait(5)
+            raise ValueError
+
+        errors = []
+
+        def lead():
+            try:
+                self.flights.do('key', fail, timeout=5)
+            except ValueError as e:
+                errors.append(e)
+
+        leader, _ = self.run_in_threads(1, lead)
+        self.started.wait(5)
+        followers, results = self.run_in_threads(
+            1, lambda: self.flights.do('key', lambda: 'fallback', timeout=5))
+        time.sleep(0.1)
+        self.release.set()
+        for thread in leader + followers:
+            thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results, ['fallback'])
+
+
+class ChangeListCoalescingTestCase(APITransactionTestCase, URLPatternsTestCase):
+    """
+    the queries are only coalesced outside of transactions, so the changelist
+    requests aren't wrapped in one.
+    """
+    urlpatterns = [
+        path('api_admin/', site.urls),
+    ]
+
+    def setUp(self) -> None:
+        self.user = UserModel.objects.create_superuser(username='admin')
+        force_login(self.client, self.user)
+        self.authors = [Author.objects.create(name='author %s' % i, age=i, user=self.user)
+                        for i in range(3)]
+        self.url = reverse('api_admin:%s_%s_changelist' % (
+            Author._meta.app_label, Author._meta.model_name))
+
+    def test_changelist_shares_in_flight_queries(self):
+        keys = []
+        do = changelist_flights.do
+
+        def record(key, fn, timeout=None):
+            keys.append(key)
+            return do(key, fn, timeout)
+
+        with mock.patch.object(changelist_flights, 'do', record), \
+                CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['config']['result_count'], 3)
+        self.assertEqual({key[0] for key in keys}, {'count', 'page'})
+        # the page is fetched once.
+        table = Author._meta.db_table
+        self.assertEqual(len([query for query in context.captured_queries
+                              if query['sql'].startswith('SELECT "%s"."id"' % table)]), 1)
+
+        # a request joining identical in-flight queries shares their results
+        # without running them.
+        calls = {}
+        for key in keys:
+            call = calls[key] = _Call()
+            call.result = 3 if key[0] == 'count' else self.authors[:1]
+            call.event.set()
+        pages = []
+        coalesce_page = ChangeList.coalesce_page
+
+        def record_page(cl, queryset):
+            pages.append(coalesce_page(cl, queryset))
+            return pages[-1]
+
+        with mock.patch.dict(changelist_flights._calls, calls), \
+                mock.patch.object(ChangeList, 'coalesce_page', record_page), \
+                CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['config']['result_count'], 3)
+        self.assertEqual([row['id'] for row in response.data['rows']], [self.authors[0].pk])
+        self.assertFalse([query for query in context.captured_queries
+                          if '"%s"' % table in query['sql']])
+        # the request gets copies of the shared instances.
+        self.assertEqual(pages[0], self.authors[:1])
+        self.assertIsNot(pages[0][0], self.authors[0])
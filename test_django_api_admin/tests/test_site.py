@@ -2,10 +2,17 @@
 admin site tests
 """
 import json
+import os
+import tempfile
+import threading
+from collections import deque
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
 from django.http import JsonResponse
+from django.test.utils import CaptureQueriesContext
 from django.urls import path, reverse
 
 from rest_framework.renderers import JSONRenderer
@@ -14,6 +21,8 @@ from rest_framework.test import (APIRequestFactory, APITestCase,
 
 from test_django_api_admin.models import Author, Book, Publisher
 from django_api_admin.admins.model_admin import APIModelAdmin
+from django_api_admin.admin_views.admin_site_views.schema import SchemaView
+from django_api_admin.metrics import REQUESTS, MetricsRegistry, _reset_registries
 from test_django_api_admin.admin import site
 from django_api_admin.utils.force_login import force_login
 
@@ -76,6 +85,52 @@ class APIAdminSiteTestCase(APITestCase, URLPatternsTestCase):
         data = renderer.render(site.get_app_list(request))
         self.assertIsNotNone(data)
 
+    def test_permission_snapshot(self):
+        from django.contrib.auth.models import Permission
+
+        # create a staff user that can only view authors
+        user = UserModel.objects.create(username='viewer', is_staff=True)
+        user.user_permissions.add(Permission.objects.get(
+            codename='view_author', content_type__app_label=Author._meta.app_label))
+        request = self.factory.get('index/')
+        request.user = UserModel.objects.get(pk=user.pk)
+
+        app_list = site.get_app_list(request)
+        self.assertEqual([model['object_name'] for app in app_list for model in app['models']],
+                         ['Author'])
+        self.assertEqual(app_list[0]['models'][0]['perms'], {
+                         'add': False, 'change': False, 'delete': False, 'view': True})
+
+        # the permissions are loaded once per request.
+        with self.assertNumQueries(0):
+            site.get_app_list(request)
+
+    def test_cached_permission_snapshot(self):
+        from django.contrib.auth.models import Group, Permission
+        from django_api_admin.permissions import CachedPermissionSnapshot
+
+        site.permission_snapshot_class = CachedPermissionSnapshot
+        self.addCleanup(delattr, site, 'permission_snapshot_class')
+        user = UserModel.objects.create(username='viewer', is_staff=True)
+        group = Group.objects.create(name='viewers')
+        user.groups.add(group)
+        view_author = Permission.objects.get(
+            codename='view_author', content_type__app_label=Author._meta.app_label)
+
+        self.assertFalse(CachedPermissionSnapshot(
+            UserModel.objects.get(pk=user.pk)).has_perm('test_django_api_admin.view_author'))
+        # a fresh user object is answered from the cache.
+        with self.assertNumQueries(0):
+            snapshot = CachedPermissionSnapshot(user)
+        self.assertFalse(snapshot.has_perm('test_django_api_admin.view_author'))
+
+        # changing group permissions invalidates the cached permission sets.
+        group.permissions.add(view_author)
+        snapshot = CachedPermissionSnapshot(UserModel.objects.get(pk=user.pk))
+        self.assertTrue(snapshot.has_perm('test_django_api_admin.view_author'))
+        self.assertTrue(snapshot.has_module_perms(
+            'test_django_api_admin'))
+
     def test_each_context_serializable(self):
         # force superuser authentication
         request = self.factory.get('index/')
@@ -91,6 +146,20 @@ class APIAdminSiteTestCase(APITestCase, URLPatternsTestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_index_view_urls(self):
+        url = reverse('api_admin:index')
+        response = self.client.get(url)
+        app = next(app for app in response.data['app_list']
+                   if app['app_label'] == Author._meta.app_label)
+        author = next(model for model in app['models']
+                      if model['object_name'] == 'Author')
+
+        # the precomputed urls match the resolved ones.
+        self.assertEqual(app['url'], 'http://testserver' + reverse(
+            'api_admin:app_list', kwargs={'app_label': Author._meta.app_label}))
+        self.assertEqual(author['changelist_url'], 'http://testserver' + reverse(
+            'api_admin:%s_%s_changelist' % (Author._meta.app_label, Author._meta.model_name)))
+
     def test_app_index_view(self):
         # test if the app_index view works
         app_label = Author._meta.app_label
@@ -102,9 +171,67 @@ class APIAdminSiteTestCase(APITestCase, URLPatternsTestCase):
 
         # test if the i18n_javascript view works
         url = reverse('api_admin:language_catalog')
-        response = self.client.get(url, Accept_Language="ar")
+        response = self.client.get(url, HTTP_ACCEPT_LANGUAGE="ar")
         self.assertEqual(response.status_code, 200)
-        self.assertIsNotNone(response.data['catalog'])
+        self.assertIsNotNone(json.loads(response.content)['catalog'])
+
+        # the pre-rendered catalog is revalidated with its etag
+        etag = response['ETag']
+        response = self.client.get(
+            url, HTTP_ACCEPT_LANGUAGE="ar", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            url, HTTP_ACCEPT_LANGUAGE="en", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_schema_view(self):
+        url = reverse('api_admin:schema')
+        response = self.client.get(url, {'format': 'json'})
+        self.assertEqual(response.status_code, 200)
+        author_list = '/api_admin/%s/%s/list/' % (
+            Author._meta.app_label, Author._meta.model_name)
+        self.assertEqual(
+            response.data['paths'][author_list]['get']['tags'], ['author'])
+        # the detail and multi detail paths only differ by the object id.
+        author_detail = author_list.replace('/list/', '/{object_id}/detail/')
+        author_multi_detail = author_list.replace('/list/', '/detail/')
+        self.assertNotEqual(response.data['paths'][author_detail]['get']['operationId'],
+                            response.data['paths'][author_multi_detail]['get']['operationId'])
+        operation_ids = [operation['operationId'] for path_item in response.data['paths'].values()
+                         for operation in path_item.values()]
+        self.assertEqual(len(operation_ids), len(set(operation_ids)))
+
+        # the generated schema is cached
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'format': 'json'})
+        self.assertEqual(response.status_code, 200)
+
+        # the schemas filtered for the user aren't shared.
+        site._schemas.clear()
+        with mock.patch.object(SchemaView, 'serve_public', False):
+            self.assertEqual(self.client.get(url, {'format': 'json'}).status_code, 200)
+        self.assertEqual(site._schemas, {})
+
+    def test_schema_file(self):
+        import io
+        import os
+        import tempfile
+
+        from django.core.management import call_command
+
+        schema_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(schema_dir.cleanup)
+        schema_path = os.path.join(schema_dir.name, 'schema.json')
+        call_command('generate_admin_schema',
+                     file=schema_path, stdout=io.StringIO())
+        site.schema_path = schema_path
+        self.addCleanup(delattr, site, 'schema_path')
+
+        response = self.client.get(reverse('api_admin:schema'))
+        self.assertEqual(response.status_code, 200)
+        with open(schema_path, 'rb') as f:
+            self.assertEqual(response.content, f.read())
+        self.assertIn('paths', json.loads(response.content))
 
     def test_permission_denied(self):
         # create a non-staff user
@@ -190,3 +317,196 @@ class APIAdminSiteTestCase(APITestCase, URLPatternsTestCase):
         })
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data[0]['name'], 'Muhammad')
+
+    def test_light_autocomplete_view(self):
+        model_admin = site._registry[Author]
+        for i in range(3):
+            Author.objects.create(name=f'author {i}', age=i, user=self.user)
+        params = {
+            'term': 'author',
+            'app_label': Book._meta.app_label,
+            'model_name': Book._meta.model_name,
+            'field_name': 'author',
+            'light': 'true',
+        }
+        url = reverse('api_admin:autocomplete')
+        with mock.patch.object(model_admin, 'autocomplete_limit', 2), \
+                mock.patch.object(model_admin, 'autocomplete_display', 'name'):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [result['text'] for result in response.data['results']], ['author 2', 'author 1'])
+            self.assertTrue(response.data['pagination']['more'])
+
+            response = self.client.get(url, {**params, 'p': 2})
+            self.assertEqual(response.data['results'], [
+                {'id': str(Author.objects.get(name='author 0').pk), 'text': 'author 0'}])
+            self.assertFalse(response.data['pagination']['more'])
+        self.assertIn(('test_django_api_admin', 'book', 'author'),
+                      site._autocomplete_targets)
+
+        # relations are displayed without a query per result.
+        with mock.patch.object(model_admin, 'autocomplete_limit', 2):
+            with mock.patch.object(model_admin, 'autocomplete_display', 'name'), \
+                    CaptureQueriesContext(connection) as name_queries:
+                self.client.get(url, params)
+            with mock.patch.object(model_admin, 'autocomplete_display', 'user'), \
+                    CaptureQueriesContext(connection) as user_queries:
+                response = self.client.get(url, params)
+        self.assertEqual(
+            [result['text'] for result in response.data['results']], [str(self.user)] * 2)
+        self.assertEqual(len(user_queries), len(name_queries))
+
+    def test_events_view(self):
+        url = reverse('api_admin:events')
+        label = Author._meta.label_lower
+        response = self.client.get(url, {'models': label})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['changed'], [])
+        token = response.data['token']
+
+        # the polls and streams don't wait for changes by default.
+        with mock.patch.object(site, 'events_poll_interval', 0):
+            # nothing changed within the poll timeout.
+            response = self.client.get(url, {'models': label, 'since': token})
+            self.assertEqual(response.data['changed'], [])
+            self.assertEqual(response.data['token'], token)
+
+            # rolled back changes aren't notified.
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    Author.objects.create(name='author', age=1, user=self.user)
+                    transaction.set_rollback(True)
+            response = self.client.get(url, {'models': label, 'since': token})
+            self.assertEqual(response.data['changed'], [])
+
+            # the versions are bumped once the change is committed.
+            with self.captureOnCommitCallbacks(execute=True):
+                Author.objects.create(name='author', age=1, user=self.user)
+                response = self.client.get(url, {'models': label, 'since': token})
+                self.assertEqual(response.data['changed'], [])
+            response = self.client.get(url, {'since': token})
+            self.assertIn(label, response.data['changed'])
+            self.assertIn('django_api_admin.logentry', response.data['changed'])
+
+            # server-sent events resume from the last event id.
+            response = self.client.get(url, {'models': label}, HTTP_ACCEPT='text/event-stream',
+                                       HTTP_LAST_EVENT_ID=token)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            events = b''.join(response.streaming_content).decode()
+            self.assertIn('event: change\ndata: {"changed": ["%s"]}' % label, events)
+
+        response = self.client.get(url, {'models': 'auth.unknown'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_profiling(self):
+        url = reverse('api_admin:%s_%s_changelist' % (
+            Author._meta.app_label, Author._meta.model_name))
+        Author.objects.create(name='author', age=1, user=self.user)
+
+        # profiling is disabled by default.
+        response = self.client.get(url, {'_profile': 'cprofile'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Admin-Profile-Id', response)
+
+        with mock.patch.object(site, 'enable_profiling', True), \
+                mock.patch.object(site, '_profiles', deque(maxlen=2)):
+            response = self.client.get(url, {'_profile': 'cprofile'})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('_profile', response.data['config']['filters'][0]['choices'][1][
+                'query_string'])
+            profile_id = response['X-Admin-Profile-Id']
+
+            response = self.client.get(reverse('api_admin:profiles'))
+            self.assertEqual([report['id'] for report in response.data], [profile_id])
+            self.assertEqual(response.data[0]['url_name'], '%s_%s_changelist' % (
+                Author._meta.app_label, Author._meta.model_name))
+            self.assertNotIn('collapsed', response.data[0])
+
+            detail_url = reverse('api_admin:profile_detail', kwargs={'profile_id': profile_id})
+            response = self.client.get(detail_url)
+            self.assertEqual(response.data['query_count'], len(response.data['queries']))
+            self.assertTrue(any('test_django_api_admin_author' in query['sql']
+                                for query in response.data['queries']))
+            self.assertTrue(response.data['functions'])
+
+            # the collapsed call stacks feed flamegraph tools.
+            response = self.client.get(detail_url, {'format': 'collapsed'})
+            self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+            stack, microseconds = response.content.decode().splitlines()[0].rsplit(' ', 1)
+            self.assertTrue(stack and int(microseconds) > 0)
+
+            response = self.client.get(reverse('api_admin:index'), HTTP_X_ADMIN_PROFILE='collapsed')
+            self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+            self.assertIn(';', response.content.decode())
+
+            # the oldest reports are dropped.
+            self.client.get(reverse('api_admin:index'), {'_profile': 'cprofile'})
+            self.assertEqual(len(site.get_profiles()), 2)
+            self.assertIsNone(site.get_profile(profile_id))
+            self.assertEqual(self.client.get(detail_url).status_code, 404)
+
+            # only staff users are profiled.
+            user = UserModel.objects.create_user(username='user')
+            force_login(self.client, user)
+            response = self.client.get(url, {'_profile': 'cprofile'})
+            self.assertEqual(response.status_code, 403)
+            self.assertNotIn('X-Admin-Profile-Id', response)
+
+    def test_metrics(self):
+        url_name = '%s_%s_changelist' % (Author._meta.app_label, Author._meta.model_name)
+        labels = 'site="api_admin",url_name="%s",model="%s"' % (url_name, Author._meta.label_lower)
+        requests_line = 'django_api_admin_requests_total{%s,method="GET",status="200"}' % labels
+
+        # the metrics aren't recorded by default.
+        self.assertFalse(site.enable_metrics)
+        with mock.patch.object(site, 'metrics', MetricsRegistry(site.name)), \
+                mock.patch.object(site, 'enable_metrics', True):
+            self.client.get(reverse('api_admin:%s' % url_name))
+            self.client.get(reverse('api_admin:%s' % url_name))
+            self.client.get(reverse('api_admin:schema'))
+
+            response = self.client.get(reverse('api_admin:metrics'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+            lines = response.content.decode().splitlines()
+            self.assertIn('# TYPE django_api_admin_request_duration_seconds histogram', lines)
+            self.assertIn('%s 2' % requests_line, lines)
+            self.assertIn('django_api_admin_request_duration_seconds_bucket{%s,le="+Inf"} 2'
+                          % labels, lines)
+            self.assertIn('django_api_admin_request_queries_count{%s} 2' % labels, lines)
+            self.assertTrue(any(line.startswith('django_api_admin_response_size_bytes_sum{%s} '
+                                                % labels) for line in lines))
+            self.assertIn('django_api_admin_cache_lookups_total{site="api_admin",'
+                          'url_name="schema",model="",cache="schema",result="miss"} 1', lines)
+
+            # with a directory the metrics of every process are summed.
+            with tempfile.TemporaryDirectory() as directory:
+                with open(os.path.join(directory, 'django_api_admin-api_admin-0.json'), 'w') as f:
+                    json.dump([[REQUESTS, [['site', 'api_admin'], ['url_name', url_name],
+                                           ['model', Author._meta.label_lower],
+                                           ['method', 'GET'], ['status', '200']], 3]], f)
+                with mock.patch.object(site.metrics, 'directory', directory):
+                    response = self.client.get(reverse('api_admin:metrics'))
+                    self.assertIn('%s 5' % requests_line, response.content.decode().splitlines())
+                    self.assertTrue(os.path.exists(site.metrics.get_path()))
+
+        # the shards of the exited threads are folded into the totals.
+        registry = MetricsRegistry(site.name)
+        registry.inc(REQUESTS, ())
+        threads = [threading.Thread(target=registry.inc, args=(REQUESTS, ())) for i in range(20)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertEqual(len(registry._shards), 1)
+        self.assertEqual(registry.snapshot(), {(REQUESTS, ()): 21})
+
+        # forked processes start without the metrics of their parent.
+        registry = MetricsRegistry(site.name)
+        registry.inc(REQUESTS, ())
+        _reset_registries()
+        self.assertEqual(registry.snapshot(), {})
+
+        # the metrics are protected like the rest of the admin.
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse('api_admin:metrics')).status_code, 401)